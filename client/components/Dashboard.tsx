@@ -1,20 +1,22 @@
 "use client";
 
-import { useEffect, useState } from "react";
+import { useEffect, useRef, useState } from "react";
 import { TimeRangeSelector, type TimeRange } from "./TimeRangeSelector";
 import { KPICards } from "./KPICards";
 import { ForecastChart } from "./ForecastChart";
 import { FeatureImportance } from "./FeatureImportance";
 import {
-  fetchForecastData,
-  fetchMetrics,
-  fetchFeatureImportance,
+  fetchDashboard,
+  subscribeForecastStream,
   type ForecastDataPoint,
   type Metrics,
   type FeatureImportance as FeatureImportanceType,
 } from "@/lib/api";
 import { Loader2, AlertCircle } from "lucide-react";
 
+// Upper bound on chart points; the server downsamples longer histories
+const MAX_CHART_POINTS = 500;
+
 export function Dashboard() {
   const [timeRange, setTimeRange] = useState<TimeRange>("all");
   const [forecastData, setForecastData] = useState<ForecastDataPoint[]>([]);
@@ -22,45 +24,65 @@ export function Dashboard() {
   const [featureImportance, setFeatureImportance] = useState<FeatureImportanceType[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
+  // Bumped when the stream reports a newer snapshot, to refetch the chart window
+  const [revision, setRevision] = useState(0);
+  const generation = useRef<number | null>(null);
+  // Generation of the first /dashboard response; the stream opens from it
+  const [streamSince, setStreamSince] = useState<number | null>(null);
 
+  // Live updates, from the snapshot the first load returned so the stream
+  // sends nothing until it changes: metrics come with each event; the chart
+  // refetches its (server-sliced) window rather than applying deltas, since
+  // it may be downsampled
   useEffect(() => {
-    const loadData = async () => {
-      setLoading(true);
-      setError(null);
-      try {
-        const [forecast, metricsData, importance] = await Promise.all([
-          fetchForecastData(),
-          fetchMetrics(),
-          fetchFeatureImportance(),
-        ]);
-        setForecastData(forecast);
-        setMetrics(metricsData);
-        setFeatureImportance(importance);
-      } catch (err) {
-        console.error("Error loading dashboard data:", err);
-        setError(
-          "Failed to load data. Make sure the FastAPI backend is running at http://localhost:8000"
-        );
-      } finally {
-        setLoading(false);
+    if (streamSince === null) return;
+    const onUpdate = (update: { generation: number; metrics: Metrics }) => {
+      setMetrics(update.metrics);
+      if (generation.current === null || update.generation > generation.current) {
+        generation.current = update.generation;
+        setRevision((r) => r + 1);
       }
     };
+    return subscribeForecastStream({ since: streamSince, onResync: onUpdate, onDelta: onUpdate });
+  }, [streamSince]);
 
-    loadData();
-  }, []);
-
-  // Filter data based on time range
-  const filteredData = forecastData.filter((point) => {
-    if (timeRange === "all") return true;
-    if (timeRange === "forecast") return point.actual === null;
-    if (timeRange === "last-year") {
-      const pointDate = new Date(point.date);
-      const oneYearAgo = new Date();
-      oneYearAgo.setFullYear(oneYearAgo.getFullYear() - 1);
-      return pointDate >= oneYearAgo;
-    }
-    return true;
-  });
+  // One /dashboard request per load: everything on the first, then only the
+  // chart window (metrics arrive with stream events, importance is per model).
+  // The server slices (and if needed downsamples) the series for the selected range
+  const loaded = useRef(false);
+  useEffect(() => {
+    let cancelled = false;
+    fetchDashboard({
+      fields: loaded.current ? ["forecast"] : ["forecast", "metrics", "importance"],
+      range: timeRange,
+      maxPoints: MAX_CHART_POINTS,
+    })
+      .then((data) => {
+        if (cancelled) return;
+        if (!loaded.current) setStreamSince(data.generation);
+        loaded.current = true;
+        if (generation.current === null || data.generation > generation.current) {
+          generation.current = data.generation;
+        }
+        if (data.forecast) setForecastData(data.forecast);
+        if (data.metrics) setMetrics(data.metrics);
+        if (data.importance) setFeatureImportance(data.importance);
+      })
+      .catch((err) => {
+        console.error("Error loading dashboard data:", err);
+        if (!cancelled) {
+          setError(
+            "Failed to load data. Make sure the FastAPI backend is running at http://localhost:8000"
+          );
+        }
+      })
+      .finally(() => {
+        if (!cancelled) setLoading(false);
+      });
+    return () => {
+      cancelled = true;
+    };
+  }, [timeRange, revision]);
 
   // Get predicted price (first future data point with XGBoost value)
   const predictedPrice = forecastData.find(
@@ -94,7 +116,7 @@ export function Dashboard() {
     <div className="space-y-6">
       <TimeRangeSelector value={timeRange} onChange={setTimeRange} />
       <KPICards metrics={metrics} predictedPrice={predictedPrice} />
-      <ForecastChart data={filteredData} />
+      <ForecastChart data={forecastData} />
       <FeatureImportance data={featureImportance} />
     </div>
   );
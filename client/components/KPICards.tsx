@@ -19,7 +19,7 @@ export function KPICards({ metrics, predictedPrice }: KPICardsProps) {
         </div>
         <p className="text-sm text-muted-foreground mb-1">Current Gasoline Price</p>
         <p className="text-3xl font-bold">
-          {metrics ? formatCurrency(metrics.current_price) : "—"}
+          {metrics?.current_price != null ? formatCurrency(metrics.current_price) : "—"}
         </p>
         <p className="text-xs text-muted-foreground mt-2">Per gallon</p>
       </div>
@@ -47,7 +47,7 @@ export function KPICards({ metrics, predictedPrice }: KPICardsProps) {
         </div>
         <p className="text-sm text-muted-foreground mb-1">SARIMA Accuracy</p>
         <p className="text-3xl font-bold">
-          {metrics ? metrics.sarima_rmse.toFixed(3) : "—"}
+          {metrics?.sarima_rmse != null ? metrics.sarima_rmse.toFixed(3) : "—"}
         </p>
         <p className="text-xs text-muted-foreground mt-2">RMSE</p>
       </div>
@@ -61,7 +61,7 @@ export function KPICards({ metrics, predictedPrice }: KPICardsProps) {
         </div>
         <p className="text-sm text-muted-foreground mb-1">XGBoost Accuracy</p>
         <p className="text-3xl font-bold">
-          {metrics ? metrics.xgboost_rmse.toFixed(3) : "—"}
+          {metrics?.xgboost_rmse != null ? metrics.xgboost_rmse.toFixed(3) : "—"}
         </p>
         <p className="text-xs text-muted-foreground mt-2">RMSE</p>
       </div>
@@ -7,10 +7,18 @@ export interface ForecastDataPoint {
   xgboost: number | null;
 }
 
+export interface ForecastColumns {
+  date: string[];
+  actual: (number | null)[];
+  sarima: (number | null)[];
+  xgboost: (number | null)[];
+}
+
+// Scores are null for a model with no predictions (e.g. no model trained for the series)
 export interface Metrics {
-  sarima_rmse: number;
-  xgboost_rmse: number;
-  current_price: number;
+  sarima_rmse: number | null;
+  xgboost_rmse: number | null;
+  current_price: number | null;
 }
 
 export interface FeatureImportance {
@@ -18,12 +26,81 @@ export interface FeatureImportance {
   score: number;
 }
 
-export async function fetchForecastData(): Promise<ForecastDataPoint[]> {
+export type ImportanceType = "weight" | "gain" | "cover" | "total_gain" | "total_cover";
+
+export interface ForecastExplanation {
+  date: string[];
+  xgboost: (number | null)[];
+  base_value: number[];
+  contributions: Record<string, number[]>;
+}
+
+export interface CrudeScenarioForecast {
+  date: string[];
+  crude: number[];
+  sarima: number[] | null;
+  xgboost: number[] | null;
+  model_version: string;
+  cached: boolean;
+}
+
+// Events of the /stream server-sent events feed. A resync carries no
+// forecast: the client refetches the window it shows
+export interface StreamResync {
+  generation: number;
+  product: string;
+  area: string;
+  metrics: Metrics;
+}
+
+export interface StreamDelta {
+  generation: number;
+  base_generation: number;
+  product: string;
+  area: string;
+  start: string | null;
+  end: string | null;
+  upserts: ForecastColumns;
+  metrics: Metrics;
+}
+
+export function columnsToForecastData(columns: ForecastColumns): ForecastDataPoint[] {
+  return columns.date.map((date, i) => ({
+    date,
+    actual: columns.actual[i],
+    sarima: columns.sarima[i],
+    xgboost: columns.xgboost[i],
+  }));
+}
+
+export type ForecastRange = "all" | "last-year" | "forecast";
+
+export interface ForecastQuery {
+  columnar?: boolean;
+  range?: ForecastRange;
+  start?: string;
+  end?: string;
+  maxPoints?: number;
+}
+
+export async function fetchForecastData(
+  options: ForecastQuery = {}
+): Promise<ForecastDataPoint[]> {
   try {
-    const response = await fetch(`${API_BASE_URL}/forecast`);
+    const params = new URLSearchParams();
+    if (options.columnar) params.set("shape", "columnar");
+    if (options.range) params.set("range", options.range);
+    if (options.start) params.set("start", options.start);
+    if (options.end) params.set("end", options.end);
+    if (options.maxPoints) params.set("max_points", String(options.maxPoints));
+    const query = params.toString() ? `?${params}` : "";
+    const response = await fetch(`${API_BASE_URL}/forecast${query}`);
     if (!response.ok) {
       throw new Error(`Failed to fetch forecast data: ${response.statusText}`);
     }
+    if (options.columnar) {
+      return columnsToForecastData(await response.json());
+    }
     return await response.json();
   } catch (error) {
     console.error("Error fetching forecast data:", error);
@@ -44,9 +121,11 @@ export async function fetchMetrics(): Promise<Metrics> {
   }
 }
 
-export async function fetchFeatureImportance(): Promise<FeatureImportance[]> {
+export async function fetchFeatureImportance(
+  type: ImportanceType = "weight"
+): Promise<FeatureImportance[]> {
   try {
-    const response = await fetch(`${API_BASE_URL}/importance`);
+    const response = await fetch(`${API_BASE_URL}/importance?type=${type}`);
     if (!response.ok) {
       throw new Error(`Failed to fetch feature importance: ${response.statusText}`);
     }
@@ -56,3 +135,103 @@ export async function fetchFeatureImportance(): Promise<FeatureImportance[]> {
     throw error;
   }
 }
+
+export type DashboardField = "forecast" | "metrics" | "importance";
+
+export interface DashboardQuery extends Omit<ForecastQuery, "columnar"> {
+  fields?: DashboardField[];
+  importanceType?: ImportanceType;
+}
+
+export interface DashboardData {
+  generation: number;
+  forecast?: ForecastDataPoint[];
+  metrics?: Metrics;
+  importance?: FeatureImportance[];
+}
+
+// Forecast, metrics and feature importance in one cached round trip
+export async function fetchDashboard(options: DashboardQuery = {}): Promise<DashboardData> {
+  try {
+    const params = new URLSearchParams();
+    if (options.fields) params.set("fields", options.fields.join(","));
+    if (options.range) params.set("range", options.range);
+    if (options.start) params.set("start", options.start);
+    if (options.end) params.set("end", options.end);
+    if (options.maxPoints) params.set("max_points", String(options.maxPoints));
+    if (options.importanceType) params.set("type", options.importanceType);
+    const query = params.toString() ? `?${params}` : "";
+    const response = await fetch(`${API_BASE_URL}/dashboard${query}`);
+    if (!response.ok) {
+      throw new Error(`Failed to fetch dashboard: ${response.statusText}`);
+    }
+    const { generation, forecast, metrics, importance } = await response.json();
+    return {
+      generation,
+      forecast: forecast ? columnsToForecastData(forecast) : undefined,
+      metrics: metrics ?? undefined,
+      importance: importance ?? undefined,
+    };
+  } catch (error) {
+    console.error("Error fetching dashboard:", error);
+    throw error;
+  }
+}
+
+export async function fetchForecastExplanation(): Promise<ForecastExplanation> {
+  try {
+    const response = await fetch(`${API_BASE_URL}/forecast/explain`);
+    if (!response.ok) {
+      throw new Error(`Failed to fetch forecast explanation: ${response.statusText}`);
+    }
+    return await response.json();
+  } catch (error) {
+    console.error("Error fetching forecast explanation:", error);
+    throw error;
+  }
+}
+
+export async function fetchCrudeScenario(
+  horizon: number,
+  crude: number[]
+): Promise<CrudeScenarioForecast> {
+  try {
+    const response = await fetch(`${API_BASE_URL}/forecast/scenario`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ horizon, crude }),
+    });
+    if (!response.ok) {
+      throw new Error(`Failed to fetch crude scenario: ${response.statusText}`);
+    }
+    return await response.json();
+  } catch (error) {
+    console.error("Error fetching crude scenario:", error);
+    throw error;
+  }
+}
+
+// Merge a delta's added/changed rows and drop rows outside its date range
+export interface ForecastStreamHandlers {
+  // Generation the caller already holds (e.g. from /dashboard): the stream
+  // then starts with what changed since, not with a resync
+  since?: number;
+  onResync?: (resync: StreamResync) => void;
+  onDelta?: (delta: StreamDelta) => void;
+  onError?: (event: Event) => void;
+}
+
+// EventSource reconnects by itself, resuming from the last event id it saw.
+// Returns a function that closes the stream.
+export function subscribeForecastStream(handlers: ForecastStreamHandlers): () => void {
+  const query = handlers.since !== undefined ? `?since=${handlers.since}` : "";
+  const source = new EventSource(`${API_BASE_URL}/stream${query}`);
+  source.addEventListener("resync", (event) => {
+    handlers.onResync?.(JSON.parse((event as MessageEvent).data));
+  });
+  source.addEventListener("delta", (event) => {
+    handlers.onDelta?.(JSON.parse((event as MessageEvent).data));
+  });
+  source.onerror = (event) => handlers.onError?.(event);
+  return () => source.close();
+}
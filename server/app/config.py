@@ -1,4 +1,6 @@
 """Configuration settings"""
+import os
+import tempfile
 import dotenv
 dotenv.load_dotenv()
 
@@ -8,11 +10,86 @@ API_VERSION = "1.0.0"
 
 CORS_ORIGINS = ["http://localhost:3000"]
 
+# Directory containing main.py; relative paths below resolve against it
+SERVER_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 MODEL_PATH = "xgboost_gas_model.joblib"
 SARIMAX_MODEL_PATH = "sarimax_gas_model.pkl"
+# Fast-loading artifacts written by `python -m app.services.model_export`;
+# preferred over the joblib/pickle files when present
+XGBOOST_NATIVE_PATH = "xgboost_gas_model.ubj"
+SARIMAX_EXPORT_DIR = "sarimax_gas_model"
+
+# EIA facet codes for the retail price series we can forecast
+PRODUCTS = {
+    "regular": "EPM0",
+    "midgrade": "EPMM",
+    "premium": "EPMP",
+    "diesel": "EPD2D",
+}
+AREAS = {
+    "US": "NUS",
+    "PADD1": "R10",  # East Coast
+    "PADD2": "R20",  # Midwest
+    "PADD3": "R30",  # Gulf Coast
+    "PADD4": "R40",  # Rocky Mountain
+    "PADD5": "R50",  # West Coast
+}
+DEFAULT_SERIES = ("regular", "US")
+
+
+
+def _parse_series(value: str) -> list:
+    """Parse "product:area,..." into keys, rejecting unknown products and areas"""
+    series = []
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        product, sep, area = item.partition(":")
+        if not sep or product not in PRODUCTS or area not in AREAS:
+            raise ValueError(
+                f"Invalid FORECAST_SERIES entry {item!r}: expected product:area with product in "
+                f"{', '.join(PRODUCTS)} and area in {', '.join(AREAS)}"
+            )
+        series.append((product, area))
+    return series
+
+
+# Series (product:area, comma separated) built on every refresh
+FORECAST_SERIES = _parse_series(os.getenv("FORECAST_SERIES", "regular:US"))
+
+# Models for non-default series live in MODEL_DIR/<product>_<area>/ using
+# the MODEL_PATH and SARIMAX_MODEL_PATH file names (relative to the server root)
+MODEL_DIR = "models"
+MODEL_REGISTRY_SIZE = 8  # loaded model pairs kept per process (LRU)
+SERIES_WORKERS = int(os.getenv("SERIES_WORKERS", "0"))  # threads for multi-series generation; 0 runs serially
+
+# On-disk EIA history (relative to the server root; empty string disables)
+EIA_CACHE_PATH = os.getenv("EIA_CACHE_PATH", "eia_cache.sqlite3")
+EIA_CACHE_TTL_HOURS = float(os.getenv("EIA_CACHE_TTL_HOURS", "6"))
+EIA_OFFLINE = os.getenv("EIA_OFFLINE", "").lower() in ("1", "true", "yes")
+
+# EIA HTTP client
+EIA_API_URL = os.getenv("EIA_API_URL", "https://api.eia.gov/v2")  # overridden to point at a local fake in benchmarks
+EIA_TIMEOUT = 10
+EIA_MAX_CONNECTIONS = 8
+EIA_PAGE_SIZE = 5000  # API maximum rows per response
+EIA_MAX_RETRIES = 3
+EIA_RETRY_BACKOFF = 0.5  # seconds, doubled after each failed attempt
+
+# Hours between scheduled data refreshes (EIA publishes weekly); 0 disables
+REFRESH_INTERVAL_HOURS = float(os.getenv("REFRESH_INTERVAL_HOURS", "24"))
+# Failed refreshes are retried after this many seconds, doubled after each failure
+REFRESH_RETRY_BACKOFF = 5
+REFRESH_RETRY_MAX = 300
 
 HISTORICAL_WEEKS = 52
 FORECAST_WEEKS = 12
+
+# Trailing windows (weeks) for rolling RMSE in /metrics
+METRICS_WINDOWS = (4, 13, 52)
+
 BASE_PRICE = 3.20
 RANDOM_SEED = 42
 
@@ -23,3 +100,67 @@ SARIMA_NOISE_STD = 0.03
 XGBOOST_NOISE_STD = 0.02
 FORECAST_NOISE_STD_SARIMA = 0.04
 FORECAST_NOISE_STD_XGBOOST = 0.03
+
+# Seconds clients may reuse a cached response before revalidating with its ETag
+RESPONSE_CACHE_MAX_AGE = 60
+RESPONSE_CACHE_MAX_ENTRIES = 1024  # serialized payloads held per process
+
+# Response compression (cached payloads are compressed once per coding and generation)
+COMPRESSION_MIN_BYTES = 512  # smaller bodies are sent uncompressed
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 9
+
+# Seconds clients should wait before retrying while the server warms up
+WARMUP_RETRY_AFTER = 5
+
+# Monte Carlo scenario engine
+SCENARIO_COUNT = 2000
+SCENARIO_MAX_COUNT = 50000
+SCENARIO_CHUNK_SIZE = 1000
+SCENARIO_PERCENTILES = (5, 50, 95)
+SCENARIO_WORKERS = 0  # process-pool size (capped at the CPU count); 0 runs in the request's worker thread
+SCENARIO_MAX_CONCURRENT = 2  # scenario runs computing at once; further cache misses queue
+SCENARIO_QUEUE_TIMEOUT = 30  # seconds a cache miss waits for a run slot before a 503
+
+# Server-sent events feed (GET /stream)
+STREAM_BACKLOG = 8  # snapshot deltas kept for clients that fall behind; older ones get a full resync
+STREAM_HEARTBEAT = 15  # seconds between keep-alive comments on idle streams
+STREAM_RETRY_MS = 5000  # reconnect delay suggested to EventSource clients
+
+# What-if forecasts for a caller-supplied crude path (POST /forecast/scenario)
+CRUDE_SCENARIO_MAX_HORIZON = 104  # weeks
+CRUDE_SCENARIO_CACHE_SIZE = 512  # results held per process (least recently used dropped)
+CRUDE_SCENARIO_CACHE_TTL = 3600  # seconds
+
+# Walk-forward backtesting
+BACKTEST_WEEKS = 520  # weeks of EIA history to evaluate over
+BACKTEST_MIN_TRAIN_WEEKS = 104  # trailing history each forecast origin sees
+BACKTEST_STEP_WEEKS = 1  # weeks between forecast origins
+BACKTEST_FOLD_SIZE = 52  # origins per pool task
+BACKTEST_WORKERS = int(os.getenv("BACKTEST_WORKERS", "0"))  # process-pool size; 0 runs in-process
+# Per-origin forecasts (relative to the server root; empty string disables)
+BACKTEST_CACHE_PATH = os.getenv("BACKTEST_CACHE_PATH", "backtest_cache.sqlite3")
+
+# Every published snapshot's predictions, for /forecast/history and scoring past
+# forecasts against realized prices (relative to the server root; empty string disables)
+FORECAST_HISTORY_PATH = os.getenv("FORECAST_HISTORY_PATH", "forecast_history.sqlite3")
+
+# Multi-worker serving (python serve.py): a leader process builds each snapshot
+# and writes it to SNAPSHOT_SHM_DIR; uvicorn workers run as followers and
+# memory-map it. "standalone" builds snapshots in-process (single worker).
+SERVE_WORKERS = int(os.getenv("SERVE_WORKERS", "4"))
+SNAPSHOT_ROLE = os.getenv("SNAPSHOT_ROLE", "standalone")
+SNAPSHOT_SHM_DIR = os.getenv(
+    "SNAPSHOT_SHM_DIR",
+    "/dev/shm/fuelcast" if os.path.isdir("/dev/shm") else os.path.join(tempfile.gettempdir(), "fuelcast")
+)
+SNAPSHOT_POLL_SECONDS = float(os.getenv("SNAPSHOT_POLL_SECONDS", "1"))
+SNAPSHOT_KEEP = 2  # snapshot files kept on disk (older ones are unlinked)
+# Port on which the serve.py leader exposes its Prometheus metrics (refresh
+# stage timings, model loads); 0 disables. Workers serve theirs at /metrics/prom.
+LEADER_METRICS_PORT = int(os.getenv("LEADER_METRICS_PORT", "0"))
+
+# Per-request profiling: requests whose PROFILE_HEADER equals PROFILE_TOKEN
+# are answered with a pyinstrument profile. Disabled while the token is empty.
+PROFILE_HEADER = "X-Profile"
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
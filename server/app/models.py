@@ -1,6 +1,7 @@
 """Data models"""
-from typing import Optional
-from pydantic import BaseModel
+from typing import Dict, List, Optional
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from app.config import CRUDE_SCENARIO_MAX_HORIZON
 
 
 class ForecastDataPoint(BaseModel):
@@ -10,12 +11,130 @@ class ForecastDataPoint(BaseModel):
     xgboost: Optional[float] = None
 
 
+class ForecastColumns(BaseModel):
+    date: List[str]
+    actual: List[Optional[float]]
+    sarima: List[Optional[float]]
+    xgboost: List[Optional[float]]
+
+
+class ErrorSummary(BaseModel):
+    rmse: Optional[float] = None
+    mae: Optional[float] = None
+    mape: Optional[float] = None
+    weeks: int = 0
+
+
 class MetricsResponse(BaseModel):
-    sarima_rmse: float
-    xgboost_rmse: float
-    current_price: float
+    sarima_rmse: Optional[float] = None
+    xgboost_rmse: Optional[float] = None
+    current_price: Optional[float] = None
+    sarima_mae: Optional[float] = None
+    xgboost_mae: Optional[float] = None
+    sarima_mape: Optional[float] = None
+    xgboost_mape: Optional[float] = None
+    rolling_rmse: Dict[str, Dict[str, Optional[float]]] = {}
+    cumulative: Dict[str, ErrorSummary] = {}
 
 
 class FeatureImportance(BaseModel):
     feature: str
     score: float
+
+
+class ForecastExplanation(BaseModel):
+    date: List[str]
+    xgboost: List[Optional[float]]
+    base_value: List[float]
+    contributions: Dict[str, List[float]]
+
+
+class CrudeScenarioRequest(BaseModel):
+    horizon: int = Field(..., ge=1, le=CRUDE_SCENARIO_MAX_HORIZON, description="Weeks to forecast")
+    crude: List[float] = Field(
+        ..., min_length=1, max_length=CRUDE_SCENARIO_MAX_HORIZON,
+        description="Weekly WTI prices: one per forecast week, or a single price held flat"
+    )
+
+    @model_validator(mode='after')
+    def _expand_crude(self) -> 'CrudeScenarioRequest':
+        if len(self.crude) == 1:
+            self.crude = self.crude * self.horizon
+        elif len(self.crude) != self.horizon:
+            raise ValueError(f"crude must have 1 or horizon ({self.horizon}) prices, got {len(self.crude)}")
+        return self
+
+
+class CrudeScenarioForecast(BaseModel):
+    model_config = ConfigDict(protected_namespaces=())
+
+    date: List[str]
+    crude: List[float]
+    sarima: Optional[List[float]] = None
+    xgboost: Optional[List[float]] = None
+    model_version: str
+    cached: bool
+
+
+class ScenarioForecastResponse(BaseModel):
+    date: List[str]
+    n_scenarios: int
+    seed: Optional[int] = None
+    sarima: Optional[Dict[str, List[float]]] = None
+    xgboost: Optional[Dict[str, List[float]]] = None
+
+
+class BacktestScores(BaseModel):
+    n: List[int]
+    mae: List[Optional[float]]
+    rmse: List[Optional[float]]
+    mape: List[Optional[float]]
+
+
+class BacktestResponse(BaseModel):
+    model_config = ConfigDict(protected_namespaces=())
+
+    product: str
+    area: str
+    model_version: str
+    origins: int
+    first_origin: str
+    last_origin: str
+    cached_origins: int
+    computed_origins: int
+    horizons: List[int]
+    metrics: Dict[str, BacktestScores]
+
+
+class HistorySnapshot(BaseModel):
+    model_config = ConfigDict(protected_namespaces=())
+
+    snapshot_id: int
+    created_at: str
+    generation: int
+    model_version: str
+    inputs: str
+    last_observed: str
+
+
+class ForecastHistoryResponse(HistorySnapshot):
+    product: str
+    area: str
+    data: ForecastColumns
+
+
+class ForecastErrorsResponse(BaseModel):
+    product: str
+    area: str
+    snapshots: int
+    first_snapshot: str
+    last_snapshot: str
+    horizons: List[int]
+    metrics: Dict[str, BacktestScores]
+
+
+class DashboardResponse(BaseModel):
+    generation: int
+    forecast: Optional[ForecastColumns] = None
+    metrics: Optional[MetricsResponse] = None
+    importance: Optional[List[FeatureImportance]] = None
@@ -0,0 +1,339 @@
+"""
+Walk-forward (rolling-origin) backtesting of the SARIMAX and XGBoost models
+
+At every forecast origin the models see only the trailing `min_train`
+weeks up to that week and forecast the next `horizon` weeks, with future crude taken from the same
+trend projection the live forecast uses. Forecasts are scored against the
+realized prices per horizon, alongside a naive last-price baseline.
+
+Usage (from the server directory):
+    python -m app.services.backtest [--product regular] [--area US] [--weeks 520] [--workers 4]
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from fastapi.concurrency import run_in_threadpool
+from typing import Dict, List, Optional, Sequence, Tuple
+from app.config import (
+    AREAS, BACKTEST_CACHE_PATH, BACKTEST_FOLD_SIZE, BACKTEST_MIN_TRAIN_WEEKS, BACKTEST_STEP_WEEKS,
+    BACKTEST_WEEKS, BACKTEST_WORKERS, DEFAULT_SERIES, FORECAST_WEEKS, PRODUCTS, SERVER_ROOT
+)
+from app.services.eia_data_loader import eia_loader
+from app.services.model_registry import SeriesKey, model_registry
+from app.services.scenario_engine import project_crude_trend
+
+BACKTEST_MODELS = ('sarima', 'xgboost')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS forecasts (
+    series TEXT NOT NULL,
+    model_version TEXT NOT NULL,
+    origin TEXT NOT NULL,
+    horizon INTEGER NOT NULL,
+    inputs TEXT NOT NULL,
+    result TEXT NOT NULL,
+    PRIMARY KEY (series, model_version, origin, horizon)
+) WITHOUT ROWID;
+"""
+
+
+class BacktestCache:
+    """
+    SQLite store of per-origin forecasts keyed by (series, model version, origin)
+
+    Each entry also records a digest of the inputs the forecast saw, so an
+    EIA revision of earlier weeks invalidates the affected origins.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._schema_ready = False  # created on first use, keeping import free of disk I/O
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        if not self._schema_ready:
+            conn.executescript(_SCHEMA)  # idempotent, so racing first connections are harmless
+            self._schema_ready = True
+        return conn
+
+    def load(self, series: str, model_version: str, horizon: int) -> Dict[str, Tuple[str, Dict]]:
+        """Cached forecasts as origin -> (inputs digest, {model: [forecast...]})"""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT origin, inputs, result FROM forecasts"
+                " WHERE series = ? AND model_version = ? AND horizon = ?",
+                (series, model_version, horizon),
+            ).fetchall()
+        return {origin: (inputs, json.loads(result)) for origin, inputs, result in rows}
+
+    def store(self, series: str, model_version: str, horizon: int, entries: Sequence[Tuple[str, str, Dict]]) -> None:
+        """Upsert (origin, inputs digest, forecasts) entries"""
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO forecasts VALUES (?, ?, ?, ?, ?, ?)",
+                [(series, model_version, origin, horizon, inputs, json.dumps(result))
+                 for origin, inputs, result in entries],
+            )
+
+
+def _forecast_origins(dates: pd.DatetimeIndex, lookback: int, step: int) -> List[int]:
+    """
+    Positions of the forecast origins: every week with `lookback` weeks of
+    history and at least one realized week after it, on a grid of `step`
+    weeks counted from the epoch (not from the window start), so a window
+    sliding forward keeps the origins it shares with the previous one
+    """
+    weeks = (dates.values.astype('datetime64[D]').astype(np.int64) // 7) % step
+    return [t for t in range(lookback - 1, len(dates) - 1) if weeks[t] == 0]
+
+
+def _input_digests(gas: np.ndarray, crude: np.ndarray, origins: Sequence[int], lookback: int) -> List[str]:
+    """Digest of the history (gas and crude, the `lookback` weeks up to and including t) behind each origin"""
+    digests = []
+    for t in origins:
+        digest = hashlib.sha1()
+        digest.update(gas[t + 1 - lookback:t + 1].tobytes())
+        digest.update(crude[t + 1 - lookback:t + 1].tobytes())
+        digests.append(digest.hexdigest()[:16])
+    return digests
+
+
+def _run_fold(args) -> List[Dict[str, List[float]]]:
+    """
+    Forecast from a block of origins
+
+    Each origin's forecast depends only on the `lookback` weeks up to it:
+    SARIMAX filters that window with the fitted parameters (`apply`, no
+    refit), and XGBoost and the crude projection read its tail. The result
+    is therefore the same whichever window the origin was computed in,
+    which is what makes the per-origin cache reusable as the window slides.
+    """
+    key, gas, crude, dates, origins, horizon, lookback = args
+    models = model_registry.get(key)
+    dates = pd.DatetimeIndex(dates)
+
+    results = []
+    for t in origins:
+        history = slice(t + 1 - lookback, t + 1)
+        future_crude = project_crude_trend(crude[history], horizon)
+        forecast_dates = dates[t] + pd.to_timedelta(7 * np.arange(1, horizon + 1), unit='D')
+        result = {}
+
+        if models.sarimax_model is not None:
+            state = models.sarimax_model.apply(gas[history], exog=crude[history, None])
+            result['sarima'] = np.asarray(state.forecast(steps=horizon, exog=future_crude[:, None])).tolist()
+
+        xgboost = models.forecast_xgboost(
+            last_gas_price=gas[t],
+            crude_history=crude[history],
+            future_crude=future_crude,
+            forecast_dates=forecast_dates,
+        )
+        if xgboost is not None:
+            result['xgboost'] = xgboost.tolist()
+        results.append(result)
+    return results
+
+
+class BacktestEngine:
+    """Rolling-origin evaluation with per-origin forecast caching"""
+
+    def __init__(self, cache: Optional[BacktestCache] = None):
+        self.cache = cache
+        self._lock = threading.Lock()
+
+    def run(
+        self,
+        key: SeriesKey,
+        gas_df: pd.DataFrame,
+        crude_df: pd.DataFrame,
+        horizon: int = FORECAST_WEEKS,
+        min_train: int = BACKTEST_MIN_TRAIN_WEEKS,
+        step: int = BACKTEST_STEP_WEEKS,
+        workers: int = BACKTEST_WORKERS,
+    ) -> Dict:
+        """
+        Backtest one series over aligned weekly history
+
+        Each origin forecasts from the `min_train` weeks up to it, and
+        origins sit on a fixed weekly grid, so a window that slides forward
+        reuses every origin it shares with earlier runs: those cached for
+        the current model version (with unchanged inputs, e.g. no EIA
+        revision) are not recomputed. The rest are split into blocks of
+        BACKTEST_FOLD_SIZE origins, run in-process or across a process pool.
+
+        Args:
+            key: (product, area)
+            gas_df: Weekly gas prices (date, gas_price)
+            crude_df: Weekly crude prices aligned with gas_df (date, close)
+            horizon: Weeks forecast from each origin
+            min_train: Weeks of history each origin's forecast sees
+            step: Weeks between origins (on a grid counted from the epoch)
+            workers: Process-pool size; 0 runs in the current thread
+
+        Returns:
+            Summary dict from `summarize`, plus the run's cache statistics
+        """
+        gas = gas_df['gas_price'].to_numpy(dtype=np.float64)
+        crude = crude_df['close'].to_numpy(dtype=np.float64)
+        dates = pd.DatetimeIndex(gas_df['date']).normalize()
+        origins = _forecast_origins(dates, min_train, step)
+        if not origins:
+            raise ValueError(f"Need more than {min_train} weeks of history (plus up to {step - 1} for the origin grid), got {len(gas)}")
+
+        models = model_registry.get(key)
+        series = f"{key[0]}:{key[1]}"
+        origin_dates = [d.strftime('%Y-%m-%d') for d in dates[origins]]
+        digests = _input_digests(gas, crude, origins, min_train)
+
+        cached = {}
+        if self.cache:
+            with self._lock:
+                cached = self.cache.load(series, models.version, horizon)
+        forecasts: Dict[int, Dict] = {}
+        missing = []
+        for t, origin, digest in zip(origins, origin_dates, digests):
+            entry = cached.get(origin)
+            if entry is not None and entry[0] == digest:
+                forecasts[t] = entry[1]
+            else:
+                missing.append(t)
+
+        # Computed outside the lock, so backtests of different series (or
+        # windows) run concurrently; racing runs of the same origins store
+        # identical results
+        blocks = [missing[i:i + BACKTEST_FOLD_SIZE] for i in range(0, len(missing), BACKTEST_FOLD_SIZE)]
+        tasks = [(key, gas, crude, dates.values, block, horizon, min_train) for block in blocks]
+        if workers and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+                computed = list(pool.map(_run_fold, tasks))
+        else:
+            computed = [_run_fold(task) for task in tasks]
+
+        for block, results in zip(blocks, computed):
+            forecasts.update(zip(block, results))
+
+        if self.cache and missing:
+            index = {t: i for i, t in enumerate(origins)}
+            with self._lock:
+                self.cache.store(series, models.version, horizon, [
+                    (origin_dates[index[t]], digests[index[t]], forecasts[t]) for t in missing
+                ])
+
+        summary = self.summarize(gas, origins, [forecasts[t] for t in origins], horizon)
+        summary.update({
+            'product': key[0],
+            'area': key[1],
+            'model_version': models.version,
+            'first_origin': origin_dates[0],
+            'last_origin': origin_dates[-1],
+            'cached_origins': len(origins) - len(missing),
+            'computed_origins': len(missing),
+        })
+        return summary
+
+    @staticmethod
+    def summarize(gas: np.ndarray, origins: Sequence[int], forecasts: Sequence[Dict], horizon: int) -> Dict:
+        """
+        Score per-origin forecasts against realized prices, per horizon
+
+        Forecasts whose target week is past the end of the data are left
+        out of the scores for that horizon.
+
+        Returns:
+            {"origins", "horizons", "metrics": {model: {"n", "mae", "rmse", "mape"}}}
+            with one list entry per horizon
+        """
+        origins = np.asarray(origins)
+        steps = np.arange(1, horizon + 1)
+        target = origins[:, None] + steps
+        in_range = target < len(gas)
+        actual = np.where(in_range, gas[np.minimum(target, len(gas) - 1)], np.nan)
+
+        predictions = {'naive': np.repeat(gas[origins][:, None], horizon, axis=1)}
+        for name in BACKTEST_MODELS:
+            if all(name in f for f in forecasts):
+                predictions[name] = np.array([f[name] for f in forecasts], dtype=np.float64)
+
+        metrics = {}
+        for name, predicted in predictions.items():
+            err = predicted - actual
+            valid = ~np.isnan(err)
+            n = valid.sum(axis=0)
+            abs_err = np.where(valid, np.abs(err), 0.0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                mae = abs_err.sum(axis=0) / n
+                rmse = np.sqrt((abs_err ** 2).sum(axis=0) / n)
+                mape = 100 * np.where(valid, abs_err / np.abs(actual), 0.0).sum(axis=0) / n
+            metrics[name] = {
+                'n': n.tolist(),
+                'mae': [None if np.isnan(v) else round(float(v), 4) for v in mae],
+                'rmse': [None if np.isnan(v) else round(float(v), 4) for v in rmse],
+                'mape': [None if np.isnan(v) else round(float(v), 3) for v in mape],
+            }
+
+        return {'origins': len(origins), 'horizons': steps.tolist(), 'metrics': metrics}
+
+    async def run_async(self, key: SeriesKey, weeks: int = BACKTEST_WEEKS, **kwargs) -> Dict:
+        """Backtest over the last `weeks` weeks of EIA history, in a worker thread"""
+        aligned = await eia_loader.get_aligned_series_async([key], weeks=weeks)
+        gas_df, crude_df = aligned[tuple(key)]
+        # The loader fetches extra records to be sure of coverage; keep the window asked for
+        gas_df = gas_df.iloc[-weeks:].reset_index(drop=True)
+        crude_df = crude_df.iloc[-weeks:].reset_index(drop=True)
+        return await run_in_threadpool(self.run, key, gas_df, crude_df, **kwargs)
+
+
+def _default_cache() -> Optional[BacktestCache]:
+    if not BACKTEST_CACHE_PATH:
+        return None
+    return BacktestCache(os.path.join(SERVER_ROOT, BACKTEST_CACHE_PATH))
+
+
+backtest_engine = BacktestEngine(cache=_default_cache())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--product", default=DEFAULT_SERIES[0], choices=sorted(PRODUCTS))
+    parser.add_argument("--area", default=DEFAULT_SERIES[1], choices=sorted(AREAS))
+    parser.add_argument("--weeks", type=int, default=BACKTEST_WEEKS, help="weeks of history to fetch")
+    parser.add_argument("--horizon", type=int, default=FORECAST_WEEKS)
+    parser.add_argument("--min-train", type=int, default=BACKTEST_MIN_TRAIN_WEEKS)
+    parser.add_argument("--step", type=int, default=BACKTEST_STEP_WEEKS)
+    parser.add_argument("--workers", type=int, default=BACKTEST_WORKERS)
+    parser.add_argument("--json", action="store_true", help="print the full summary as JSON")
+    args = parser.parse_args()
+
+    key = (args.product, args.area)
+    summary = asyncio.run(backtest_engine.run_async(
+        key, weeks=args.weeks, horizon=args.horizon, min_train=args.min_train,
+        step=args.step, workers=args.workers,
+    ))
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+
+    print(f"✓ Backtested {summary['origins']} origins {summary['first_origin']}..{summary['last_origin']}"
+          f" ({summary['computed_origins']} computed, {summary['cached_origins']} cached)")
+    print(f"{'horizon':>8}" + "".join(f"{name + ' MAE':>14}{name + ' RMSE':>14}" for name in summary['metrics']))
+    for i, h in enumerate(summary['horizons']):
+        row = f"{h:>8}"
+        for m in summary['metrics'].values():
+            mae, rmse = m['mae'][i], m['rmse'][i]
+            row += f"{'-' if mae is None else f'{mae:.4f}':>14}{'-' if rmse is None else f'{rmse:.4f}':>14}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
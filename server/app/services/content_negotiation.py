@@ -0,0 +1,164 @@
+"""Media type and content-coding negotiation for cached responses"""
+import gzip
+import json
+from typing import Any, Callable, Dict, Iterable, Optional
+
+import brotli
+import msgpack
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import BROTLI_QUALITY, COMPRESSION_MIN_BYTES, GZIP_LEVEL
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+# Accept values that select MessagePack (x-msgpack is the older, still common name)
+_MSGPACK_ALIASES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+# Preferred first when the client rates several codings equally
+_CODINGS = ("br", "gzip")
+
+
+def _serialize_json(payload: Any) -> bytes:
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+def _serialize_msgpack(payload: Any) -> bytes:
+    # Floats are packed as float32: prices are rounded to cents, so the
+    # extra precision of float64 only costs bytes
+    return msgpack.packb(payload, use_bin_type=True, use_single_float=True)
+
+
+SERIALIZERS: Dict[str, Callable[[Any], bytes]] = {
+    JSON_MEDIA_TYPE: _serialize_json,
+    MSGPACK_MEDIA_TYPE: _serialize_msgpack,
+}
+
+
+def _qualities(header: Optional[str]) -> Dict[str, float]:
+    """Parse an Accept or Accept-Encoding header into {value: q}"""
+    qualities = {}
+    for item in (header or "").split(","):
+        value, *params = [part.strip() for part in item.split(";")]
+        if not value:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, number = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(number)
+                except ValueError:
+                    q = 0.0
+        qualities[value.lower()] = q
+    return qualities
+
+
+def negotiate_media_type(accept: Optional[str]) -> str:
+    """
+    Pick the response media type from an Accept header
+
+    JSON is the default; MessagePack is served only when the client asks
+    for it explicitly and rates it at least as high as JSON.
+
+    Args:
+        accept: Raw Accept header value
+
+    Returns:
+        JSON_MEDIA_TYPE or MSGPACK_MEDIA_TYPE
+    """
+    qualities = _qualities(accept)
+    msgpack_q = max((qualities.get(alias, 0.0) for alias in _MSGPACK_ALIASES), default=0.0)
+    json_q = qualities.get(JSON_MEDIA_TYPE, qualities.get("application/*", qualities.get("*/*", 0.0)))
+    if msgpack_q > 0 and msgpack_q >= json_q:
+        return MSGPACK_MEDIA_TYPE
+    return JSON_MEDIA_TYPE
+
+
+def negotiate_encoding(accept_encoding: Optional[str], size: int) -> Optional[str]:
+    """
+    Pick the content-coding for a body of `size` bytes
+
+    Args:
+        accept_encoding: Raw Accept-Encoding header value
+        size: Uncompressed body size
+
+    Returns:
+        "br", "gzip", or None to send the body as is
+    """
+    if size < COMPRESSION_MIN_BYTES:
+        return None
+    qualities = _qualities(accept_encoding)
+    wildcard = qualities.get("*", 0.0)
+    best, best_q = None, 0.0
+    for coding in _CODINGS:
+        q = qualities.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def accepts_coding(accept_encoding: Optional[str], coding: str) -> bool:
+    """Whether an Accept-Encoding header allows a content-coding (q > 0, directly or via *)"""
+    qualities = _qualities(accept_encoding)
+    return qualities.get(coding, qualities.get("*", 0.0)) > 0
+
+
+def compress(body: bytes, coding: str) -> bytes:
+    """Compress a body with the given content-coding ("br" or "gzip")"""
+    if coding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    if coding == "gzip":
+        # mtime=0 keeps the output (and so its ETag) identical across processes
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    raise ValueError(f"Unsupported content-coding: {coding}")
+
+
+class _GZipResponder(GZipResponder):
+    """GZipResponder that gives a body it compresses its own ETag, as CachedResponse.encoded does"""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        async def send_tagged(message: Message) -> None:
+            if message["type"] == "http.response.start" and not self.content_encoding_set:
+                headers = MutableHeaders(raw=message["headers"])
+                etag = headers.get("etag")
+                if etag and headers.get("content-encoding") == "gzip":
+                    headers["ETag"] = f'{etag[:-1]}-gzip"'
+            await send(message)
+
+        await super().__call__(scope, receive, send_tagged)
+
+
+class NegotiatedGZipMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware for responses not encoded by cached_response
+
+    Starlette's version gzips whenever "gzip" appears anywhere in
+    Accept-Encoding (so also for "gzip;q=0"), which could compress a body
+    negotiate_encoding had deliberately left uncompressed. This one reads
+    the header with the same q-value rules, leaves `exclude_paths` alone
+    (e.g. event streams, whose events must not sit in a compression
+    buffer) and re-tags the ETag of anything it compresses.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = COMPRESSION_MIN_BYTES,
+        compresslevel: int = GZIP_LEVEL,
+        exclude_paths: Iterable[str] = (),
+    ) -> None:
+        super().__init__(app, minimum_size=minimum_size, compresslevel=compresslevel)
+        self.exclude_paths = frozenset(exclude_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] == "http"
+            and scope["path"] not in self.exclude_paths
+            and accepts_coding(Headers(scope=scope).get("accept-encoding"), "gzip")
+        ):
+            responder = _GZipResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+            await responder(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
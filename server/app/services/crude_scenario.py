@@ -0,0 +1,97 @@
+"""On-demand forecasts for a caller-supplied crude price path"""
+import hashlib
+import json
+from datetime import timedelta
+from typing import Dict, Sequence
+
+import numpy as np
+import pandas as pd
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import CRUDE_SCENARIO_CACHE_SIZE, CRUDE_SCENARIO_CACHE_TTL
+from app.services.memo_cache import MemoCache
+from app.services.model_registry import SeriesKey, model_registry
+from app.services.model_service import ModelService
+
+
+def forecast_crude_path(models: ModelService, historical: pd.DataFrame, crude_path: Sequence[float]) -> Dict:
+    """
+    Forecast gas prices for the weeks after `historical` given future crude prices
+
+    SARIMAX takes the path as its exogenous input, forecasting from its
+    state filtered through `historical` (so follower workers, which never
+    run a refresh, start from the same week as the dates); the XGBoost
+    recursion reads it as `close` (and its lags) step by step. No noise is
+    added, so the result is a deterministic function of the inputs.
+
+    Args:
+        models: Models for the series
+        historical: Snapshot history with date, actual and crude columns
+        crude_path: Weekly WTI prices, one per forecast week
+
+    Returns:
+        {"date", "crude", "sarima", "xgboost"}; a model's list is None if
+        it is not loaded
+    """
+    path = np.asarray(crude_path, dtype=np.float64)
+    last_date = pd.to_datetime(historical['date'].iloc[-1])
+    dates = [last_date + timedelta(weeks=i + 1) for i in range(len(path))]
+
+    state = models.sarimax_state(historical['date'], historical['actual'].values, historical['crude'].values)
+    sarima = models.predict_sarimax(exog_future=pd.DataFrame({'close': path}), steps=len(path), state=state)
+    xgboost = models.forecast_xgboost(
+        last_gas_price=historical['actual'].iloc[-1],
+        crude_history=historical['crude'].values,
+        future_crude=path,
+        forecast_dates=dates,
+    )
+    return {
+        'date': [d.strftime('%Y-%m-%d') for d in dates],
+        'crude': path.tolist(),
+        'sarima': None if sarima is None else np.round(np.asarray(sarima, dtype=np.float64), 2).tolist(),
+        'xgboost': None if xgboost is None else np.round(xgboost, 2).tolist(),
+    }
+
+
+class CrudeScenarioForecaster:
+    """
+    Memoized what-if forecasts ("what if WTI is $90 for 26 weeks")
+
+    Results are keyed by a digest of the series, the snapshot generation
+    (which fixes the history the forecast starts from), the model version
+    and the crude path, and held in a bounded LRU/TTL cache. Identical
+    concurrent requests share one computation, which runs in a worker
+    thread so the event loop keeps serving.
+    """
+
+    def __init__(self, cache: MemoCache):
+        self.cache = cache
+
+    @staticmethod
+    def cache_key(key: SeriesKey, generation: int, model_version: str, crude_path: Sequence[float]) -> str:
+        payload = json.dumps([list(key), generation, model_version, [round(float(p), 4) for p in crude_path]])
+        return hashlib.sha1(payload.encode()).hexdigest()
+
+    async def forecast(self, key: SeriesKey, historical: pd.DataFrame, generation: int, crude_path: Sequence[float]) -> Dict:
+        """
+        Forecast for a crude path, from cache when possible
+
+        Args:
+            key: (product, area)
+            historical: History of the snapshot the request reads
+            generation: That snapshot's generation
+            crude_path: Weekly WTI prices, one per forecast week
+
+        Returns:
+            forecast_crude_path's result plus model_version and cached
+        """
+        models = await run_in_threadpool(model_registry.get, key)
+        version = models.version
+        result, cached = await self.cache.get(
+            self.cache_key(key, generation, version, crude_path),
+            lambda: run_in_threadpool(forecast_crude_path, models, historical, crude_path)
+        )
+        return {**result, 'model_version': version, 'cached': cached}
+
+
+crude_scenarios = CrudeScenarioForecaster(MemoCache(CRUDE_SCENARIO_CACHE_SIZE, CRUDE_SCENARIO_CACHE_TTL))
@@ -2,23 +2,43 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Tuple
-from app.config import HISTORICAL_WEEKS, FORECAST_WEEKS
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+from app.config import HISTORICAL_WEEKS, FORECAST_WEEKS, SERIES_WORKERS
 from app.services.eia_data_loader import eia_loader
-from app.services.model_service import model_service
+from app.services.instrumentation import observe_stages, timed_stage
+from app.services.model_registry import SeriesKey, model_registry
+from app.services.model_service import ModelService, model_service
+from app.services.scenario_engine import project_crude_trend
+from app.utils import SHAP_PREFIX
 
 
-def generate_data() -> Tuple[pd.DataFrame, pd.DataFrame]:
+def generate_data(
+    gas_df: Optional[pd.DataFrame] = None,
+    crude_df: Optional[pd.DataFrame] = None,
+    models: Optional[ModelService] = None,
+    timings: Optional[Dict[str, float]] = None
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
     Generate historical and forecast data using real EIA data and trained models
     
+    Args:
+        gas_df: Aligned gas prices, if already fetched (e.g. via get_aligned_data_async)
+        crude_df: Aligned crude prices, if already fetched
+        models: Models for this series (default: the national regular-gasoline models)
+        timings: Collects stage durations instead of observing them directly
+            (see instrumentation.timed_stage)
+    
     Returns:
         Tuple of (historical_df, forecast_df)
     """
+    models = model_service if models is None else models
     try:
-        # Fetch real gas and crude oil prices from EIA
-        print("Fetching data from EIA API...")
-        gas_df, crude_df = eia_loader.get_aligned_data(weeks=HISTORICAL_WEEKS)
+        if gas_df is None or crude_df is None:
+            # Fetch real gas and crude oil prices from EIA
+            print("Fetching data from EIA API...")
+            gas_df, crude_df = eia_loader.get_aligned_data(weeks=HISTORICAL_WEEKS)
         
         if len(gas_df) == 0 or len(crude_df) == 0:
             print("Warning: No data from EIA, using fallback")
@@ -26,44 +46,45 @@ def generate_data() -> Tuple[pd.DataFrame, pd.DataFrame]:
         
         print(f"✓ Fetched {len(gas_df)} weeks of data from EIA")
         
-        # Prepare historical dataframe
+        # Prepare historical dataframe; predictions stay NaN (served as null,
+        # scored as no data) where a model is missing or cannot predict
         historical_df = pd.DataFrame({
             'date': gas_df['date'].dt.strftime('%Y-%m-%d'),
             'actual': gas_df['gas_price'].values,
-            'sarima': gas_df['gas_price'].values,  # Will add predictions
-            'xgboost': gas_df['gas_price'].values
+            'sarima': np.nan,
+            'xgboost': np.nan,
+            'crude': crude_df['close'].values  # exogenous input, kept for scenario runs
         })
         
-        # Generate historical SARIMAX predictions
-        if model_service.sarimax_model is not None:
+        # Generate historical SARIMAX predictions; the forecast below starts
+        # from this filtered state (explicitly, as scenario requests in other
+        # threads may filter other histories in between)
+        sarimax_state = None
+        if models.sarimax_model is not None:
             try:
-                pred = model_service.sarimax_model.get_prediction(
-                    start=0, 
-                    end=len(gas_df)-1, 
-                    exog=crude_df[['close']]
-                )
-                historical_df['sarima'] = pred.predicted_mean.values
+                with timed_stage("sarimax_history", timings):
+                    preds = models.sarimax_history(
+                        gas_df['date'], gas_df['gas_price'].values, crude_df['close'].values
+                    )
+                    sarimax_state = models.sarimax_state(
+                        gas_df['date'], gas_df['gas_price'].values, crude_df['close'].values
+                    )
+                historical_df['sarima'] = preds
                 print(f"✓ Generated {len(historical_df)} historical SARIMAX predictions")
             except Exception as e:
                 print(f"Error generating historical SARIMAX predictions: {e}")
 
         # Generate historical XGBoost predictions
-        if model_service.xgboost_model is not None:
+        if models.xgboost_model is not None:
             try:
-                xgb_hist_features = pd.DataFrame({
-                    'close': crude_df['close'],
-                    'dayofyear': gas_df['date'].dt.dayofyear,
-                    'month': gas_df['date'].dt.month,
-                    'year': gas_df['date'].dt.year,
-                    'gas_price_lag1': gas_df['gas_price'].shift(1),
-                    'crude_price_lag4': crude_df['close'].shift(4)
-                })
-                valid_indices = xgb_hist_features.dropna().index
-                if len(valid_indices) > 0:
-                    valid_features = xgb_hist_features.loc[valid_indices]
-                    preds = model_service.xgboost_model.predict(valid_features)
-                    historical_df.loc[valid_indices, 'xgboost'] = preds
-                    print(f"✓ Generated {len(preds)} historical XGBoost predictions")
+                with timed_stage("xgboost_history", timings):
+                    preds = models.predict_xgboost_history(
+                        gas_df['date'], gas_df['gas_price'].values, crude_df['close'].values
+                    )
+                valid = ~np.isnan(preds)
+                if valid.any():
+                    historical_df.loc[valid, 'xgboost'] = preds[valid]
+                    print(f"✓ Generated {int(valid.sum())} historical XGBoost predictions")
             except Exception as e:
                 print(f"Error generating historical XGBoost predictions: {e}")
         
@@ -72,22 +93,21 @@ def generate_data() -> Tuple[pd.DataFrame, pd.DataFrame]:
         forecast_dates = [(last_date + timedelta(weeks=i+1)) for i in range(FORECAST_WEEKS)]
         
         # Project future crude oil prices
-        last_crude = crude_df['close'].iloc[-1]
-        recent_crude_avg = crude_df['close'].tail(12).mean()
-        crude_trend = (last_crude - crude_df['close'].iloc[-13]) / 13 if len(crude_df) >= 13 else 0
-        future_crude = [recent_crude_avg + (crude_trend * i) + np.random.normal(0, 1) for i in range(FORECAST_WEEKS)]
+        future_crude = project_crude_trend(crude_df['close'].values, FORECAST_WEEKS) + np.random.normal(0, 1, FORECAST_WEEKS)
         
         # SARIMAX Forecast
         sarima_forecast = None
-        if model_service.sarimax_model is not None:
+        if models.sarimax_model is not None:
             try:
                 exog_future = pd.DataFrame({'close': future_crude})
-                sarima_predictions = model_service.predict_sarimax(
-                    exog_future=exog_future,
-                    steps=FORECAST_WEEKS
-                )
+                with timed_stage("sarimax_forecast", timings):
+                    sarima_predictions = models.predict_sarimax(
+                        exog_future=exog_future,
+                        steps=FORECAST_WEEKS,
+                        state=sarimax_state
+                    )
                 if sarima_predictions is not None:
-                    sarima_forecast = sarima_predictions.values
+                    sarima_forecast = sarima_predictions
                     print(f"✓ Generated {len(sarima_forecast)} SARIMAX forecasts")
             except Exception as e:
                 print(f"Error generating SARIMAX forecast: {e}")
@@ -96,22 +116,25 @@ def generate_data() -> Tuple[pd.DataFrame, pd.DataFrame]:
             sarima_forecast = [last_price + 0.01 * i + np.random.normal(0, 0.04) for i in range(FORECAST_WEEKS)]
             print("Using fallback SARIMAX forecast")
         
-        # XGBoost Forecast (improved)
-        xgb_forecast_values = list(gas_df['gas_price'].iloc[-4:])  # seed with last 4 historical prices
-        for i, forecast_date in enumerate(forecast_dates):
-            features = {
-                'close': future_crude[i],
-                'dayofyear': forecast_date.dayofyear,
-                'month': forecast_date.month,
-                'year': forecast_date.year,
-                'gas_price_lag1': xgb_forecast_values[-1],
-                'crude_price_lag4': crude_df['close'].iloc[-(4-i)] if i < 4 else future_crude[i-4]
-            }
-            step_df = pd.DataFrame([features])
-            pred = model_service.xgboost_model.predict(step_df)[0]
-            noise = np.random.normal(0, gas_df['gas_price'].pct_change().std())
-            xgb_forecast_values.append(pred + noise)
-        xgb_forecast = np.array(xgb_forecast_values[4:])
+        # XGBoost Forecast (recursive, one batched predict per step)
+        xgb_features = None
+        with timed_stage("xgboost_forecast", timings):
+            xgb_forecast = models.forecast_xgboost(
+                last_gas_price=gas_df['gas_price'].iloc[-1],
+                crude_history=crude_df['close'].values,
+                future_crude=future_crude,
+                forecast_dates=forecast_dates,
+                noise_std=gas_df['gas_price'].pct_change().std(),
+                return_features=True
+            )
+        if xgb_forecast is not None:
+            xgb_forecast, xgb_features = xgb_forecast
+        if xgb_forecast is None:
+            last_price = gas_df['gas_price'].iloc[-1]
+            xgb_forecast = [last_price + 0.01 * i + np.random.normal(0, 0.03) for i in range(FORECAST_WEEKS)]
+            print("Using fallback XGBoost forecast")
+        else:
+            print(f"✓ Generated {len(xgb_forecast)} XGBoost forecasts")
         
         forecast_df = pd.DataFrame({
             'date': [d.strftime('%Y-%m-%d') for d in forecast_dates],
@@ -120,6 +143,18 @@ def generate_data() -> Tuple[pd.DataFrame, pd.DataFrame]:
             'xgboost': xgb_forecast
         })
         
+        # SHAP contributions for every forecast step in one batched call,
+        # stored as shap_<feature> columns (plus shap_bias) of the snapshot
+        if xgb_features is not None:
+            try:
+                with timed_stage("xgboost_shap", timings):
+                    contribs = models.explain_xgboost(xgb_features)
+                for name in contribs.columns:
+                    forecast_df[f'{SHAP_PREFIX}{name}'] = contribs[name].values
+                print(f"✓ Explained {len(contribs)} XGBoost forecasts")
+            except Exception as e:
+                print(f"Error computing XGBoost SHAP contributions: {e}")
+        
         return historical_df, forecast_df
     
     except Exception as e:
@@ -130,6 +165,58 @@ def generate_data() -> Tuple[pd.DataFrame, pd.DataFrame]:
         return _generate_fallback_data()
 
 
+def _generate_for_series(item) -> Tuple[SeriesKey, Tuple[pd.DataFrame, pd.DataFrame], Dict[str, float]]:
+    key, gas_df, crude_df = item
+    print(f"Generating data for {key[0]}/{key[1]}")
+    # Stage timings travel back with the result and are observed by the caller
+    timings: Dict[str, float] = {}
+    return key, generate_data(gas_df, crude_df, models=model_registry.get(key), timings=timings), timings
+
+
+_pools: Dict[int, ThreadPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def _series_pool(workers: int) -> ThreadPoolExecutor:
+    """Thread pool of the given size, created once and reused by every refresh"""
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            pool = _pools[workers] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="series")
+        return pool
+
+
+def generate_series(
+    aligned: Dict[SeriesKey, Tuple[pd.DataFrame, pd.DataFrame]],
+    workers: int = SERIES_WORKERS
+) -> Dict[SeriesKey, Tuple[pd.DataFrame, pd.DataFrame]]:
+    """
+    Run generate_data for several series, in parallel across threads
+    
+    Threads rather than processes, so every series uses the models already
+    loaded in this process's registry and the SARIMAX state kept from the
+    last refresh (see ModelService.sarimax_history); each series has its
+    own ModelService, so they do not contend for it.
+    
+    Args:
+        aligned: (product, area) -> (gas_df, crude_df) from get_aligned_series_async
+        workers: Threads to spread the series over; 0 runs them one after another
+    
+    Returns:
+        (product, area) -> (historical_df, forecast_df)
+    """
+    items = [(key, gas_df, crude_df) for key, (gas_df, crude_df) in aligned.items()]
+    if workers and len(items) > 1:
+        results = list(_series_pool(workers).map(_generate_for_series, items))
+    else:
+        results = list(map(_generate_for_series, items))
+    series = {}
+    for key, frames, timings in results:
+        observe_stages(timings)
+        series[key] = frames
+    return series
+
+
 def _generate_fallback_data() -> Tuple[pd.DataFrame, pd.DataFrame]:
     """Generate synthetic fallback data if EIA API or models fail"""
     np.random.seed(42)
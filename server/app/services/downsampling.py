@@ -0,0 +1,87 @@
+"""Point-budget downsampling for chart series"""
+import numpy as np
+
+
+def _bucket_edges(n: int, buckets: int) -> np.ndarray:
+    """Edges splitting positions 1..n-2 into `buckets` nearly equal buckets"""
+    return np.linspace(1, n - 1, buckets + 1).astype(np.int64)
+
+
+def lttb_indices(y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets selection over evenly spaced points
+
+    Keeps the first and last point and, from each of max_points - 2
+    buckets in between, the point forming the largest triangle with the
+    previously kept point and the mean of the next bucket. This preserves
+    the visual shape (peaks, troughs) far better than striding.
+
+    Args:
+        y: Values at evenly spaced positions (NaN-free)
+        max_points: Number of points to keep (>= 3)
+
+    Returns:
+        Sorted indices into y
+    """
+    n = len(y)
+    if max_points >= n or max_points < 3:
+        return np.arange(n)
+
+    x = np.arange(n, dtype=np.float64)
+    edges = _bucket_edges(n, max_points - 2)
+    # Mean of each bucket, plus the last point as the "next bucket" of the final one
+    sums = np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    counts = np.diff(edges)
+    next_y = np.append(sums / counts, y[-1])
+    next_x = np.append((edges[:-1] + edges[1:] - 1) / 2, n - 1)
+
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(max_points - 2):
+        lo, hi = edges[i], edges[i + 1]
+        cx, cy = next_x[i + 1], next_y[i + 1]
+        # Twice the triangle area for every candidate in the bucket at once
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def minmax_indices(y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Keep the minimum and maximum of each bucket (plus the endpoints)
+
+    Cheaper than LTTB and fully vectorized; short spikes survive because
+    each bucket's extremes are kept.
+
+    Args:
+        y: Values at evenly spaced positions (NaN-free)
+        max_points: Upper bound on the number of points kept
+
+    Returns:
+        Sorted, unique indices into y
+    """
+    n = len(y)
+    buckets = (max_points - 2) // 2
+    if max_points >= n:
+        return np.arange(n)
+    if buckets < 1:
+        return np.array([0, n - 1])
+
+    edges = _bucket_edges(n, buckets)
+    width = int(np.diff(edges).max())
+    # Pad buckets to equal width so argmin/argmax run as one 2-D reduction
+    positions = edges[:-1, None] + np.arange(width)
+    valid = positions < edges[1:, None]
+    positions = np.where(valid, positions, edges[:-1, None])
+    values = y[positions]
+    lows = positions[np.arange(buckets), np.argmin(np.where(valid, values, np.inf), axis=1)]
+    highs = positions[np.arange(buckets), np.argmax(np.where(valid, values, -np.inf), axis=1)]
+    return np.unique(np.concatenate([[0, n - 1], lows, highs]))
+
+
+DOWNSAMPLERS = {
+    'lttb': lttb_indices,
+    'minmax': minmax_indices,
+}
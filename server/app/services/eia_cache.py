@@ -0,0 +1,102 @@
+"""On-disk SQLite store for fetched EIA series"""
+import sqlite3
+import time
+import pandas as pd
+from contextlib import closing
+from typing import Dict, Iterable, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS observations (
+    series TEXT NOT NULL,
+    period TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (series, period)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS series_meta (
+    series TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL
+);
+"""
+
+
+class EIACache:
+    """
+    Append-only history of EIA observations keyed by series
+
+    A series key identifies one endpoint + frequency + facet selection
+    (see series_key). Re-fetched periods overwrite earlier values so EIA
+    revisions are picked up.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._schema_ready = False  # created on first use, keeping import free of disk I/O
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        if not self._schema_ready:
+            conn.executescript(_SCHEMA)  # idempotent, so racing first connections are harmless
+            self._schema_ready = True
+        return conn
+
+    @staticmethod
+    def series_key(url: str, frequency: str, facets: Dict[str, str]) -> str:
+        facet_str = ",".join(f"{k}={v}" for k, v in sorted(facets.items()))
+        return f"{url}|{frequency}|{facet_str}"
+
+    def age(self, series: str) -> Optional[float]:
+        """Seconds since the series was last fetched, or None if never"""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT fetched_at FROM series_meta WHERE series = ?", (series,)
+            ).fetchone()
+        return None if row is None else time.time() - row[0]
+
+    def store(self, series: str, records: Iterable[Dict]) -> int:
+        """
+        Upsert fetched records and mark the series as freshly fetched
+
+        Args:
+            series: Series key
+            records: EIA records with 'period' and 'value'
+
+        Returns:
+            Number of numeric records written
+        """
+        rows = []
+        for record in records:
+            value = pd.to_numeric(record.get('value'), errors='coerce')
+            if record.get('period') and pd.notna(value):
+                rows.append((series, str(record['period']), float(value)))
+
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO observations (series, period, value) VALUES (?, ?, ?)",
+                rows,
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO series_meta (series, fetched_at) VALUES (?, ?)",
+                (series, time.time()),
+            )
+        return len(rows)
+
+    def load(self, series: str, length: Optional[int] = None) -> pd.DataFrame:
+        """
+        Load cached observations in ascending period order
+
+        Args:
+            series: Series key
+            length: Only return the most recent `length` periods
+
+        Returns:
+            DataFrame with columns: period, value
+        """
+        query = "SELECT period, value FROM observations WHERE series = ? ORDER BY period DESC"
+        params = (series,)
+        if length is not None:
+            query += " LIMIT ?"
+            params = (series, int(length))
+        with closing(self._connect()) as conn:
+            rows = conn.execute(query, params).fetchall()
+        return pd.DataFrame(rows[::-1], columns=['period', 'value'])
@@ -1,155 +1,177 @@
 """EIA API data loader for gas and crude oil prices"""
-import requests
+import asyncio
 import pandas as pd
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
-from typing import Tuple, Optional
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Dict, List, Tuple, Optional, Union
 import os
+from app.config import (
+    AREAS, DEFAULT_SERIES, PRODUCTS, SERVER_ROOT, EIA_API_URL, EIA_CACHE_PATH, EIA_CACHE_TTL_HOURS, EIA_OFFLINE,
+    EIA_TIMEOUT, EIA_MAX_CONNECTIONS, EIA_PAGE_SIZE, EIA_MAX_RETRIES, EIA_RETRY_BACKOFF
+)
+from app.services.eia_cache import EIACache
+from app.services.instrumentation import timed_stage
+
+if TYPE_CHECKING:
+    import httpx  # imported on first fetch; follower workers never need it
 
 class EIADataLoader:
     """Loader for Energy Information Administration (EIA) API data"""
     
     # EIA Open Data API endpoints (no API key required for some endpoints)
-    GAS_PRICE_URL = "https://api.eia.gov/v2/petroleum/pri/gnd/data/"
-    CRUDE_PRICE_URL = "https://api.eia.gov/v2/petroleum/pri/spt/data/"
+    GAS_PRICE_URL = f"{EIA_API_URL}/petroleum/pri/gnd/data/"
+    CRUDE_PRICE_URL = f"{EIA_API_URL}/petroleum/pri/spt/data/"
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        cache: Optional[EIACache] = None,
+        cache_ttl_hours: float = 0,
+        offline: bool = False
+    ):
         """
         Initialize EIA data loader
         
         Args:
             api_key: Optional EIA API key for higher rate limits
+            cache: Optional on-disk store for incremental fetching
+            cache_ttl_hours: Serve cached series without a request while younger than this
+            offline: Never call the API; serve only cached data
         """
         self.api_key = api_key
+        self.cache = cache
+        self.cache_ttl = cache_ttl_hours * 3600
+        self.offline = offline
     
-    def fetch_gas_prices(self, start_date: str = None, weeks: int = 156) -> pd.DataFrame:
+    @asynccontextmanager
+    async def session(self, client: Optional["httpx.AsyncClient"] = None) -> AsyncIterator["httpx.AsyncClient"]:
+        """Reuse the given HTTP client, or open a pooled one for the duration"""
+        if client is not None:
+            yield client
+            return
+        import httpx
+        limits = httpx.Limits(max_connections=EIA_MAX_CONNECTIONS, max_keepalive_connections=EIA_MAX_CONNECTIONS)
+        async with httpx.AsyncClient(timeout=EIA_TIMEOUT, limits=limits) as client:
+            yield client
+    
+    async def fetch_gas_prices_async(
+        self,
+        start_date: str = None,
+        weeks: int = 156,
+        client: Optional["httpx.AsyncClient"] = None
+    ) -> pd.DataFrame:
         """
         Fetch US regular gasoline retail prices (weekly)
         
         Args:
             start_date: Start date in YYYY-MM-DD format (default: {weeks} weeks ago)
             weeks: Number of weeks of data to fetch
+            client: Optional shared HTTP client
             
         Returns:
             DataFrame with columns: date, gas_price
         """
-        try:
-            # Calculate date range
-            if start_date is None:
-                end_date = datetime.now()
-                start_date = end_date - timedelta(weeks=weeks)
-                start_date = start_date.strftime('%Y-%m-%d')
-            
-            params = {
-                'frequency': 'weekly',
-                'data[0]': 'value',
-                'facets[product][]': 'EPM0',  # Regular gasoline
-                'facets[duoarea][]': 'NUS',    # US National
-                'sort[0][column]': 'period',
-                'sort[0][direction]': 'desc',
-                'offset': 0,
-                'length': weeks * 2  # Get extra to ensure coverage
-            }
-            
-            if self.api_key:
-                params['api_key'] = self.api_key
-            
-            response = requests.get(self.GAS_PRICE_URL, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
+        prices = await self.fetch_retail_prices_async([DEFAULT_SERIES], weeks=weeks, client=client)
+        return prices[DEFAULT_SERIES]
+    
+    async def fetch_retail_prices_async(
+        self,
+        series: List[Tuple[str, str]],
+        weeks: int = 156,
+        client: Optional["httpx.AsyncClient"] = None
+    ) -> Dict[Tuple[str, str], pd.DataFrame]:
+        """
+        Fetch weekly retail prices for several (product, area) series in one batched query
+        
+        Args:
+            series: (product, area) keys, e.g. ('diesel', 'PADD3'); see config.PRODUCTS/AREAS
+            weeks: Number of weeks of data to fetch
+            client: Optional shared HTTP client
             
-            if 'response' in data and 'data' in data['response']:
-                records = data['response']['data']
-                
-                # Convert to DataFrame
-                df = pd.DataFrame(records)
-                df = df.rename(columns={'period': 'date', 'value': 'gas_price'})
-                df = df[['date', 'gas_price']]
-                
-                # Convert date and sort
-                df['date'] = pd.to_datetime(df['date'])
-                df = df.sort_values('date').reset_index(drop=True)
-                
-                # Ensure numeric
-                df['gas_price'] = pd.to_numeric(df['gas_price'], errors='coerce')
-                df = df.dropna()
-                
-                return df
-            else:
-                raise ValueError("Unexpected API response format")
-                
+        Returns:
+            Dict mapping each key to a DataFrame with columns: date, gas_price
+        """
+        series = [tuple(key) for key in series]
+        try:
+            facet_sets = [
+                {'product': PRODUCTS[product], 'duoarea': AREAS[area]}
+                for product, area in series
+            ]
+            async with self.session(client) as client:
+                frames = await self._fetch_series_many(
+                    client,
+                    self.GAS_PRICE_URL,
+                    frequency='weekly',
+                    facet_sets=facet_sets,
+                    length=weeks * 2  # Get extra to ensure coverage
+                )
         except Exception as e:
             print(f"Error fetching gas prices from EIA: {e}")
-            return self._get_fallback_gas_data(weeks)
+            return {key: self._get_fallback_gas_data(weeks) for key in series}
+        
+        prices = {}
+        for key, df in zip(series, frames):
+            df = df.rename(columns={'period': 'date', 'value': 'gas_price'})
+            
+            # Convert date and sort
+            df['date'] = pd.to_datetime(df['date'])
+            df = df.sort_values('date').reset_index(drop=True)
+            
+            # Ensure numeric
+            df['gas_price'] = pd.to_numeric(df['gas_price'], errors='coerce')
+            prices[key] = df.dropna()
+        return prices
     
-    def fetch_crude_prices(self, start_date: str = None, weeks: int = 156) -> pd.DataFrame:
+    async def fetch_crude_prices_async(
+        self,
+        start_date: str = None,
+        weeks: int = 156,
+        client: Optional["httpx.AsyncClient"] = None
+    ) -> pd.DataFrame:
         """
         Fetch WTI crude oil spot prices (daily, will be aggregated to weekly)
         
         Args:
             start_date: Start date in YYYY-MM-DD format
             weeks: Number of weeks of data to fetch
+            client: Optional shared HTTP client
             
         Returns:
             DataFrame with columns: date, close
         """
         try:
-            # Calculate date range
-            if start_date is None:
-                end_date = datetime.now()
-                start_date = end_date - timedelta(weeks=weeks)
-                start_date = start_date.strftime('%Y-%m-%d')
-            
-            params = {
-                'frequency': 'daily',
-                'data[0]': 'value',
-                'facets[product][]': 'EPCWTI',  # WTI Crude
-                'sort[0][column]': 'period',
-                'sort[0][direction]': 'desc',
-                'offset': 0,
-                'length': weeks * 10  # Daily data, so need more records
-            }
+            async with self.session(client) as client:
+                df = await self._fetch_series(
+                    client,
+                    self.CRUDE_PRICE_URL,
+                    frequency='daily',
+                    facets={'product': 'EPCWTI'},  # WTI Crude
+                    length=weeks * 10  # Daily data, so need more records
+                )
+            df = df.rename(columns={'period': 'date', 'value': 'close'})
             
-            if self.api_key:
-                params['api_key'] = self.api_key
+            # Convert date and sort
+            df['date'] = pd.to_datetime(df['date'])
+            df = df.sort_values('date').reset_index(drop=True)
             
-            response = requests.get(self.CRUDE_PRICE_URL, params=params, timeout=10)
-            response.raise_for_status()
+            # Ensure numeric
+            df['close'] = pd.to_numeric(df['close'], errors='coerce')
+            df = df.dropna()
             
-            data = response.json()
+            # Resample to weekly (Monday-aligned to match EIA gas prices)
+            df = df.set_index('date')
+            df_weekly = df['close'].resample('W-MON').mean().to_frame()
+            df_weekly = df_weekly.reset_index()
             
-            if 'response' in data and 'data' in data['response']:
-                records = data['response']['data']
-                
-                # Convert to DataFrame
-                df = pd.DataFrame(records)
-                df = df.rename(columns={'period': 'date', 'value': 'close'})
-                df = df[['date', 'close']]
-                
-                # Convert date and sort
-                df['date'] = pd.to_datetime(df['date'])
-                df = df.sort_values('date').reset_index(drop=True)
-                
-                # Ensure numeric
-                df['close'] = pd.to_numeric(df['close'], errors='coerce')
-                df = df.dropna()
-                
-                # Resample to weekly (Monday-aligned to match EIA gas prices)
-                df = df.set_index('date')
-                df_weekly = df['close'].resample('W-MON').mean().to_frame()
-                df_weekly = df_weekly.reset_index()
-                
-                return df_weekly
-            else:
-                raise ValueError("Unexpected API response format")
+            return df_weekly
                 
         except Exception as e:
             print(f"Error fetching crude prices from EIA: {e}")
             return self._get_fallback_crude_data(weeks)
     
-    def get_aligned_data(self, weeks: int = 156) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    async def get_aligned_data_async(self, weeks: int = 156) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """
-        Fetch both gas and crude prices and align them by date
+        Fetch gas and crude prices concurrently over one pooled client and align them by date
         
         Args:
             weeks: Number of weeks of historical data
@@ -157,16 +179,226 @@ class EIADataLoader:
         Returns:
             Tuple of (gas_df, crude_df) with aligned dates
         """
-        gas_df = self.fetch_gas_prices(weeks=weeks)
-        crude_df = self.fetch_crude_prices(weeks=weeks)
+        aligned = await self.get_aligned_series_async([DEFAULT_SERIES], weeks=weeks)
+        return aligned[DEFAULT_SERIES]
+    
+    async def get_aligned_series_async(
+        self,
+        series: List[Tuple[str, str]],
+        weeks: int = 156
+    ) -> Dict[Tuple[str, str], Tuple[pd.DataFrame, pd.DataFrame]]:
+        """
+        Fetch several retail series plus crude concurrently and align each with crude
         
-        # Merge on date with inner join to get aligned data
-        merged = pd.merge(gas_df, crude_df, on='date', how='inner')
+        Args:
+            series: (product, area) keys
+            weeks: Number of weeks of historical data
+            
+        Returns:
+            Dict mapping each key to (gas_df, crude_df) with aligned dates
+        """
+        async with self.session() as client:
+            prices, crude_df = await asyncio.gather(
+                _timed("fetch_gas", self.fetch_retail_prices_async(series, weeks=weeks, client=client)),
+                _timed("fetch_crude", self.fetch_crude_prices_async(weeks=weeks, client=client))
+            )
         
-        gas_aligned = merged[['date', 'gas_price']].copy()
-        crude_aligned = merged[['date', 'close']].copy()
+        aligned = {}
+        for key, gas_df in prices.items():
+            # Merge on date with inner join to get aligned data
+            merged = pd.merge(gas_df, crude_df, on='date', how='inner')
+            
+            gas_aligned = merged[['date', 'gas_price']].copy()
+            crude_aligned = merged[['date', 'close']].copy()
+            aligned[key] = (gas_aligned, crude_aligned)
         
-        return gas_aligned, crude_aligned
+        return aligned
+    
+    def fetch_gas_prices(self, start_date: str = None, weeks: int = 156) -> pd.DataFrame:
+        """Blocking wrapper around fetch_gas_prices_async (not for use inside an event loop)"""
+        return asyncio.run(self.fetch_gas_prices_async(start_date=start_date, weeks=weeks))
+    
+    def fetch_crude_prices(self, start_date: str = None, weeks: int = 156) -> pd.DataFrame:
+        """Blocking wrapper around fetch_crude_prices_async (not for use inside an event loop)"""
+        return asyncio.run(self.fetch_crude_prices_async(start_date=start_date, weeks=weeks))
+    
+    def get_aligned_data(self, weeks: int = 156) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Blocking wrapper around get_aligned_data_async (not for use inside an event loop)"""
+        return asyncio.run(self.get_aligned_data_async(weeks=weeks))
+    
+    async def _fetch_series(
+        self,
+        client: "httpx.AsyncClient",
+        url: str,
+        frequency: str,
+        facets: Dict[str, str],
+        length: int
+    ) -> pd.DataFrame:
+        """Get the most recent `length` observations of a single series"""
+        frames = await self._fetch_series_many(client, url, frequency, [facets], length)
+        return frames[0]
+    
+    async def _fetch_series_many(
+        self,
+        client: "httpx.AsyncClient",
+        url: str,
+        frequency: str,
+        facet_sets: List[Dict[str, str]],
+        length: int
+    ) -> List[pd.DataFrame]:
+        """
+        Get the most recent `length` observations of each series
+        
+        With a cache configured, history is read from disk and only periods
+        from the last cached one onwards are requested from the API. The
+        network is skipped entirely while the cache is within its TTL and
+        holds the whole window, or when running offline (which serves
+        whatever is cached), and cached data is served if the API fails.
+        
+        All series that need the network are fetched with one request that
+        lists every facet value (the API returns the cross product); the
+        records are then split back into their series by facet.
+        
+        Args:
+            client: HTTP client
+            url: EIA API endpoint
+            frequency: 'weekly' or 'daily'
+            facet_sets: One facet filter per series, e.g. [{'product': 'EPM0'}]
+            length: Number of most recent records to return per series
+            
+        Returns:
+            One DataFrame with columns period, value per facet set
+        """
+        if self.offline and self.cache is None:
+            raise RuntimeError("EIA offline mode requires a data cache")
+        
+        results: List[Optional[pd.DataFrame]] = [None] * len(facet_sets)
+        cached: Dict[int, pd.DataFrame] = {}
+        pending = []
+        for i, facets in enumerate(facet_sets):
+            if self.cache is None:
+                pending.append(i)
+                continue
+            series = self.cache.series_key(url, frequency, facets)
+            cached[i] = await asyncio.to_thread(self.cache.load, series, length)
+            age = await asyncio.to_thread(self.cache.age, series)
+            if self.offline:
+                if len(cached[i]) == 0:
+                    raise RuntimeError(f"EIA offline mode and no cached data for {series}")
+                results[i] = cached[i]  # possibly shorter than asked for; it is all there is
+                continue
+            if age is not None and age < self.cache_ttl and len(cached[i]) >= length:
+                results[i] = cached[i]
+                continue
+            pending.append(i)
+        
+        if not pending:
+            return results
+        
+        # Only ask for new periods, unless some cached window is too short
+        starts = [cached[i]['period'].iloc[-1] if i in cached and len(cached[i]) >= length else None for i in pending]
+        start = None if None in starts else min(starts)
+        
+        facet_names = list(facet_sets[pending[0]])
+        merged_facets = {
+            name: sorted({facet_sets[i][name] for i in pending})
+            for name in facet_names
+        }
+        combinations = 1
+        for values in merged_facets.values():
+            combinations *= len(values)
+        try:
+            records = await self._request_records(
+                client, url, frequency, merged_facets, length * combinations, start=start
+            )
+        except Exception as e:
+            if any(len(cached.get(i, ())) == 0 for i in pending):
+                raise
+            print(f"EIA request failed ({e}), serving cached data")
+            for i in pending:
+                results[i] = cached[i]
+            return results
+        
+        grouped: Dict[Tuple, List[Dict]] = {}
+        for record in records:
+            grouped.setdefault(tuple(record.get(name) for name in facet_names), []).append(record)
+        
+        for i in pending:
+            group = grouped.get(tuple(facet_sets[i][name] for name in facet_names), [])
+            if self.cache is None:
+                results[i] = pd.DataFrame(group[:length], columns=['period', 'value'])
+                continue
+            series = self.cache.series_key(url, frequency, facet_sets[i])
+            stored = await asyncio.to_thread(self.cache.store, series, group)
+            print(f"✓ Cached {stored} {frequency} EIA records since {start or 'start of window'}")
+            results[i] = await asyncio.to_thread(self.cache.load, series, length)
+        return results
+    
+    async def _request_records(
+        self,
+        client: "httpx.AsyncClient",
+        url: str,
+        frequency: str,
+        facets: Dict[str, Union[str, List[str]]],
+        length: int,
+        start: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Request up to `length` records from the EIA API, newest first
+        
+        The API caps each response at EIA_PAGE_SIZE rows. The first page
+        reports the total row count; any remaining pages are then requested
+        concurrently by offset.
+        """
+        params = {
+            'frequency': frequency,
+            'data[0]': 'value',
+            'sort[0][column]': 'period',
+            'sort[0][direction]': 'desc',
+            'offset': 0,
+            'length': min(length, EIA_PAGE_SIZE)
+        }
+        for facet, value in facets.items():
+            params[f'facets[{facet}][]'] = value  # a list repeats the parameter
+        if start:
+            params['start'] = start
+        
+        if self.api_key:
+            params['api_key'] = self.api_key
+        
+        first = await self._get_response(client, url, params)
+        records = list(first['data'])
+        wanted = min(length, int(first.get('total', len(records))))
+        
+        offsets = range(len(records), wanted, EIA_PAGE_SIZE)
+        pages = await asyncio.gather(*(
+            self._get_response(client, url, {**params, 'offset': offset, 'length': min(EIA_PAGE_SIZE, wanted - offset)})
+            for offset in offsets
+        ))
+        for page in pages:
+            records.extend(page['data'])
+        return records
+    
+    async def _get_response(self, client: "httpx.AsyncClient", url: str, params: Dict) -> Dict:
+        """GET one page, retrying transport errors, 429s and 5xx with exponential backoff"""
+        import httpx
+        for attempt in range(EIA_MAX_RETRIES + 1):
+            try:
+                response = await client.get(url, params=params)
+                response.raise_for_status()
+                data = response.json()
+                if 'response' in data and 'data' in data['response']:
+                    return data['response']
+                raise ValueError("Unexpected API response format")
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                retryable = (
+                    isinstance(e, httpx.TransportError)
+                    or e.response.status_code == 429
+                    or e.response.status_code >= 500
+                )
+                if not retryable or attempt == EIA_MAX_RETRIES:
+                    raise
+                await asyncio.sleep(EIA_RETRY_BACKOFF * 2 ** attempt)
     
     @staticmethod
     def _get_fallback_gas_data(weeks: int) -> pd.DataFrame:
@@ -209,5 +441,22 @@ class EIADataLoader:
         })
 
 
+async def _timed(stage: str, awaitable: Awaitable) -> Any:
+    """Await while recording the duration as a refresh stage"""
+    with timed_stage(stage):
+        return await awaitable
+
+
+def _default_cache() -> Optional[EIACache]:
+    if not EIA_CACHE_PATH:
+        return None
+    return EIACache(os.path.join(SERVER_ROOT, EIA_CACHE_PATH))
+
+
 # Create singleton instance
-eia_loader = EIADataLoader(api_key=os.getenv("EIA_API_KEY"))
+eia_loader = EIADataLoader(
+    api_key=os.getenv("EIA_API_KEY"),
+    cache=_default_cache(),
+    cache_ttl_hours=EIA_CACHE_TTL_HOURS,
+    offline=EIA_OFFLINE
+)
@@ -0,0 +1,136 @@
+"""Forecast error statistics, precomputed once per snapshot"""
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+from app.config import METRICS_WINDOWS
+
+METRIC_MODELS = ('sarima', 'xgboost')
+
+
+def _rounded(value: float, decimals: int = 3) -> Optional[float]:
+    return None if np.isnan(value) else round(float(value), decimals)
+
+
+@dataclass(frozen=True)
+class ErrorAccumulator:
+    """
+    Running sufficient statistics of one model's forecast errors
+
+    Immutable: `add` returns a new accumulator, so the one attached to a
+    published snapshot never changes under a reader.
+    """
+    sse: float = 0.0
+    sae: float = 0.0
+    sape: float = 0.0
+    count: int = 0
+
+    def add(self, actual: np.ndarray, predicted: np.ndarray) -> "ErrorAccumulator":
+        """
+        Fold in newly observed weeks (constant work per week)
+
+        Args:
+            actual: Observed prices of the new weeks
+            predicted: Model predictions for the same weeks (NaN pairs are skipped)
+        """
+        err = actual - predicted
+        valid = ~np.isnan(err)
+        err, actual = err[valid], actual[valid]
+        return ErrorAccumulator(
+            sse=self.sse + float(err @ err),
+            sae=self.sae + float(np.abs(err).sum()),
+            sape=self.sape + float(np.abs(err / actual).sum()),
+            count=self.count + int(valid.sum()),
+        )
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        if self.count == 0:
+            return {'rmse': None, 'mae': None, 'mape': None, 'weeks': 0}
+        return {
+            'rmse': round(float(np.sqrt(self.sse / self.count)), 3),
+            'mae': round(self.sae / self.count, 3),
+            'mape': round(100 * self.sape / self.count, 2),
+            'weeks': self.count,
+        }
+
+
+@dataclass(frozen=True)
+class SeriesMetrics:
+    """
+    Error statistics for one series in one snapshot
+
+    `accumulators` carry running totals across refreshes (only weeks after
+    `last_date` are added on the next build); `summary` is the ready-made
+    /metrics payload.
+    """
+    last_date: Optional[str] = None
+    accumulators: Dict[str, ErrorAccumulator] = field(default_factory=dict)
+    summary: Dict = field(default_factory=dict)
+
+
+def build_series_metrics(historical: pd.DataFrame, previous: Optional[SeriesMetrics] = None) -> SeriesMetrics:
+    """
+    Compute /metrics for a historical frame in one vectorized pass
+
+    Errors for all models are stacked into a (models, weeks) matrix and
+    prefix-summed, so full-window RMSE/MAE/MAPE and every trailing window
+    in METRICS_WINDOWS are differences of two prefix sums.
+
+    Args:
+        historical: Frame with date, actual and one column per model
+        previous: Metrics of the same series in the previous snapshot, whose
+            accumulators are extended with the weeks after its last_date
+
+    Returns:
+        SeriesMetrics for the new snapshot
+    """
+    dates = historical['date'].astype(str).to_numpy()
+    actual = historical['actual'].to_numpy(dtype=np.float64, na_value=np.nan)
+    predicted = historical[list(METRIC_MODELS)].to_numpy(dtype=np.float64, na_value=np.nan).T
+    n = len(actual)
+
+    err = actual - predicted
+    valid = ~np.isnan(err)
+    abs_err = np.where(valid, np.abs(err), 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pct_err = np.where(valid, abs_err / np.abs(actual), 0.0)
+
+    zero = np.zeros((len(METRIC_MODELS), 1))
+    sq_cum = np.hstack([zero, np.cumsum(abs_err ** 2, axis=1)])
+    count_cum = np.hstack([zero, np.cumsum(valid, axis=1)])
+
+    def trailing(cum: np.ndarray, weeks: int) -> np.ndarray:
+        return cum[:, -1] - cum[:, max(n - weeks, 0)]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        count = count_cum[:, -1]
+        rmse = np.sqrt(sq_cum[:, -1] / count)
+        mae = abs_err.sum(axis=1) / count
+        mape = 100 * pct_err.sum(axis=1) / count
+        rolling = {w: np.sqrt(trailing(sq_cum, w) / trailing(count_cum, w)) for w in METRICS_WINDOWS}
+
+    if previous is None or previous.last_date is None:
+        new = np.ones(n, dtype=bool)
+    else:
+        new = dates > previous.last_date
+    accumulators = {}
+    for i, name in enumerate(METRIC_MODELS):
+        base = previous.accumulators.get(name, ErrorAccumulator()) if previous else ErrorAccumulator()
+        accumulators[name] = base.add(actual[new], predicted[i, new])
+
+    summary = {'current_price': _rounded(actual[-1], 2) if n else None}
+    for i, name in enumerate(METRIC_MODELS):
+        summary[f'{name}_rmse'] = _rounded(rmse[i])
+        summary[f'{name}_mae'] = _rounded(mae[i])
+        summary[f'{name}_mape'] = _rounded(mape[i], 2)
+    summary['rolling_rmse'] = {
+        name: {str(w): _rounded(rolling[w][i]) for w in METRICS_WINDOWS}
+        for i, name in enumerate(METRIC_MODELS)
+    }
+    summary['cumulative'] = {name: acc.summary() for name, acc in accumulators.items()}
+
+    return SeriesMetrics(
+        last_date=str(dates[-1]) if n else (previous.last_date if previous else None),
+        accumulators=accumulators,
+        summary=summary,
+    )
@@ -0,0 +1,187 @@
+"""XGBoost feature pipeline: lag and calendar features over NumPy arrays"""
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Sequence
+
+# Feature order the XGBoost model was trained with
+XGBOOST_FEATURES = ['close', 'dayofyear', 'month', 'year', 'gas_price_lag1', 'crude_price_lag4']
+GAS_LAG = 1
+CRUDE_LAG = 4
+MAX_LAG = max(GAS_LAG, CRUDE_LAG)
+
+
+def calendar_features(dates) -> Dict[str, np.ndarray]:
+    """
+    Day of year, month and year of one date or an array of dates
+
+    Works on datetime64[D] directly, so no pandas accessor is involved.
+    """
+    days = np.asarray(dates, dtype='datetime64[D]')
+    years = days.astype('datetime64[Y]')
+    return {
+        'dayofyear': (days - years).astype(np.int64) + 1,
+        'month': days.astype('datetime64[M]').astype(np.int64) % 12 + 1,
+        'year': years.astype(np.int64) + 1970,
+    }
+
+
+class FeaturePipeline:
+    """
+    Features for a weekly gas/crude series that can grow one week at a time
+
+    History lives in preallocated time-major arrays of shape
+    (capacity, batch): batch is 1 for an observed series and n_scenarios for
+    a batched recursive forecast. `append` computes the new week's feature
+    row from the stored lags in O(1) (capacity doubles when full), and the
+    same column writer is used for the vectorized pass over a whole
+    history, so training, historical predictions and forecasts cannot
+    drift apart.
+
+    The row for week t uses close_t, the calendar of week t, gas_{t-1} and
+    close_{t-4}; week t's own gas price is only needed for later rows and
+    can be set after predicting it (see `set_gas`).
+    """
+
+    def __init__(self, names: Sequence[str] = XGBOOST_FEATURES, batch: int = 1, capacity: int = 64):
+        unknown = set(names) - set(XGBOOST_FEATURES)
+        if unknown:
+            raise ValueError(f"Unknown features: {sorted(unknown)}")
+        self.names = list(names)
+        self.columns = {name: i for i, name in enumerate(self.names)}
+        self.batch = batch
+        self.size = 0
+        capacity = max(capacity, 1)
+        self._dates = np.full(capacity, np.datetime64('NaT'), dtype='datetime64[D]')
+        self._gas = np.full((capacity, batch), np.nan)
+        self._crude = np.full((capacity, batch), np.nan)
+        self._rows = np.full((capacity, batch, len(self.names)), np.nan)
+
+    @classmethod
+    def from_history(
+        cls,
+        dates,
+        gas: Sequence[float],
+        crude: Sequence[float],
+        names: Sequence[str] = XGBOOST_FEATURES,
+        reserve: int = 0,
+    ) -> "FeaturePipeline":
+        """
+        Build features for a whole observed series in one vectorized pass
+
+        Args:
+            dates: Week dates
+            gas: Gas prices aligned with dates
+            crude: Crude prices aligned with dates
+            names: Feature columns (order of the model's training data)
+            reserve: Extra capacity for weeks appended later
+
+        Returns:
+            Pipeline with batch 1 holding every week's feature row
+        """
+        gas = np.asarray(gas, dtype=np.float64)
+        n = len(gas)
+        pipeline = cls(names, batch=1, capacity=n + reserve)
+        pipeline._dates[:n] = np.asarray(pd.DatetimeIndex(dates).values, dtype='datetime64[D]')
+        pipeline._gas[:n, 0] = gas
+        pipeline._crude[:n, 0] = np.asarray(crude, dtype=np.float64)
+        pipeline.size = n
+
+        gas_lag = np.full(n, np.nan)
+        gas_lag[GAS_LAG:] = gas[:n - GAS_LAG]
+        crude_lag = np.full(n, np.nan)
+        crude_lag[CRUDE_LAG:] = pipeline._crude[:n - CRUDE_LAG, 0]
+        pipeline._write(pipeline._rows[:n, 0], pipeline._dates[:n], pipeline._crude[:n, 0], gas_lag, crude_lag)
+        return pipeline
+
+    @classmethod
+    def seeded(
+        cls,
+        last_gas: float,
+        crude_history: Sequence[float],
+        names: Sequence[str] = XGBOOST_FEATURES,
+        batch: int = 1,
+        reserve: int = 0,
+    ) -> "FeaturePipeline":
+        """
+        Pipeline positioned at the end of a history, holding only the lags future rows need
+
+        Args:
+            last_gas: Last observed gas price
+            crude_history: Observed crude prices (at least the last CRUDE_LAG)
+            names: Feature columns
+            batch: Number of paths that will be appended side by side
+            reserve: Number of weeks that will be appended
+        """
+        crude = np.asarray(crude_history, dtype=np.float64)[-MAX_LAG:]
+        pipeline = cls(names, batch=batch, capacity=len(crude) + reserve)
+        pipeline._crude[:len(crude)] = crude[:, None]
+        pipeline._gas[len(crude) - 1] = last_gas
+        pipeline.size = len(crude)
+        return pipeline
+
+    def _write(self, rows: np.ndarray, dates, close, gas_lag, crude_lag) -> None:
+        """Fill feature columns; all inputs broadcast against rows[..., 0]"""
+        col = self.columns
+        if 'close' in col:
+            rows[..., col['close']] = close
+        for name, values in calendar_features(dates).items():
+            if name in col:
+                rows[..., col[name]] = values
+        if 'gas_price_lag1' in col:
+            rows[..., col['gas_price_lag1']] = gas_lag
+        if 'crude_price_lag4' in col:
+            rows[..., col['crude_price_lag4']] = crude_lag
+
+    def _reserve(self, capacity: int) -> None:
+        if capacity <= len(self._dates):
+            return
+        capacity = max(capacity, 2 * len(self._dates))
+        for attr in ('_dates', '_gas', '_crude', '_rows'):
+            old = getattr(self, attr)
+            fill = np.datetime64('NaT') if attr == '_dates' else np.nan
+            new = np.full((capacity,) + old.shape[1:], fill, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, attr, new)
+
+    def append(self, date, crude, gas: Optional[Sequence[float]] = None) -> np.ndarray:
+        """
+        Add one week and compute its feature rows from the stored lags
+
+        Args:
+            date: Week date
+            crude: Crude price, scalar or shape (batch,)
+            gas: Gas price if already known (else set it later with set_gas)
+
+        Returns:
+            Feature rows of shape (batch, n_features), a view into the pipeline
+        """
+        self._reserve(self.size + 1)
+        t = self.size
+        self._dates[t] = np.datetime64(date, 'D')
+        self._crude[t] = crude
+        gas_lag = self._gas[t - GAS_LAG] if t >= GAS_LAG else np.nan
+        crude_lag = self._crude[t - CRUDE_LAG] if t >= CRUDE_LAG else np.nan
+        self._write(self._rows[t], self._dates[t], self._crude[t], gas_lag, crude_lag)
+        self.size += 1
+        if gas is not None:
+            self.set_gas(gas)
+        return self._rows[t]
+
+    def set_gas(self, gas) -> None:
+        """Set the gas price of the most recent week (scalar or shape (batch,))"""
+        self._gas[self.size - 1] = gas
+
+    @property
+    def features(self) -> np.ndarray:
+        """Feature rows: (weeks, n_features) for batch 1, else (weeks, batch, n_features)"""
+        rows = self._rows[:self.size]
+        return rows[:, 0] if self.batch == 1 else rows
+
+    @property
+    def valid(self) -> np.ndarray:
+        """Mask of weeks (batch 1) whose rows have every lag available"""
+        return ~np.isnan(self.features).any(axis=-1)
+
+    def frame(self) -> pd.DataFrame:
+        """Feature rows of a batch-1 pipeline as a DataFrame (e.g. for training)"""
+        return pd.DataFrame(self.features, columns=self.names)
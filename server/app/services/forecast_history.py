@@ -0,0 +1,266 @@
+"""Append-only history of published forecast snapshots"""
+import hashlib
+import os
+import sqlite3
+import numpy as np
+import pandas as pd
+from contextlib import closing
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from app.config import FORECAST_HISTORY_PATH, SERVER_ROOT
+from app.services.model_registry import SeriesKey, model_registry
+from app.services.snapshot import Snapshot
+
+HISTORY_MODELS = ('naive', 'sarima', 'xgboost')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    series TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    generation INTEGER NOT NULL,
+    model_version TEXT NOT NULL,
+    inputs TEXT NOT NULL,
+    last_observed TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS snapshots_by_series ON snapshots (series, created_at);
+CREATE TABLE IF NOT EXISTS points (
+    snapshot_id INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    actual REAL,
+    sarima REAL,
+    xgboost REAL,
+    PRIMARY KEY (snapshot_id, date)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS actuals (
+    series TEXT NOT NULL,
+    date TEXT NOT NULL,
+    actual REAL NOT NULL,
+    PRIMARY KEY (series, date)
+) WITHOUT ROWID;
+"""
+
+# Every stored forecast point with the price later realized for its week and
+# the last price its snapshot had seen (the naive forecast)
+_REALIZED = """
+SELECT s.id AS snapshot_id, s.created_at,
+       CAST(round((julianday(p.date) - julianday(s.last_observed)) / 7) AS INTEGER) AS horizon,
+       a.actual, o.actual AS naive, p.sarima, p.xgboost
+FROM snapshots s
+JOIN points p ON p.snapshot_id = s.id AND p.date > s.last_observed
+JOIN actuals a ON a.series = s.series AND a.date = p.date
+JOIN points o ON o.snapshot_id = s.id AND o.date = s.last_observed
+WHERE s.series = ? AND s.created_at >= ?
+"""
+
+
+def _series_name(key: SeriesKey) -> str:
+    return f"{key[0]}:{key[1]}"
+
+
+def _timestamp(created_at: float) -> str:
+    return datetime.fromtimestamp(created_at, timezone.utc).isoformat(timespec='seconds')
+
+
+def _nullable(values: pd.Series) -> List[Optional[float]]:
+    return [None if np.isnan(v) else float(v) for v in values.to_numpy(dtype=np.float64)]
+
+
+def _inputs_digest(historical: pd.DataFrame, points: pd.DataFrame) -> str:
+    """
+    Digest of the observed data a snapshot's forecasts were made from and
+    of the points it served (forecasts include random noise, so the same
+    inputs can publish different values)
+    """
+    digest = hashlib.sha1()
+    digest.update(pd.to_datetime(historical['date']).to_numpy(dtype='datetime64[D]').tobytes())
+    for column in ('actual', 'crude'):
+        if column in historical:
+            digest.update(historical[column].to_numpy(dtype=np.float64).tobytes())
+    for column in ('sarima', 'xgboost'):
+        if column in points:
+            digest.update(points[column].to_numpy(dtype=np.float64, na_value=np.nan).tobytes())
+    return digest.hexdigest()[:16]
+
+
+class ForecastHistory:
+    """
+    SQLite store of every published snapshot's predictions, per series
+
+    Each recorded snapshot keeps its historical predictions and forecast
+    (one `points` row per week), the model version and a digest of its
+    input data and served points. Realized prices are kept once per series in `actuals`,
+    overwritten as newer snapshots bring EIA revisions, so scoring past
+    forecasts is a join rather than a recomputation. A snapshot whose
+    models, inputs and served values all match the series' latest recorded
+    one adds nothing and is skipped.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._schema_ready = False  # created on first use, keeping import free of disk I/O
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        if not self._schema_ready:
+            conn.executescript(_SCHEMA)  # idempotent, so racing first connections are harmless
+            self._schema_ready = True
+        return conn
+
+    def record(self, snapshot: Snapshot) -> int:
+        """
+        Append a published snapshot
+
+        Args:
+            snapshot: Snapshot built in this process (its series' models
+                are the ones loaded in model_registry)
+
+        Returns:
+            Number of series recorded (unchanged series are skipped)
+        """
+        recorded = 0
+        with closing(self._connect()) as conn, conn:
+            for key, frames in snapshot.series.items():
+                series = _series_name(key)
+                historical = frames.historical
+                points = frames.combined
+                inputs = _inputs_digest(historical, points)
+                version = model_registry.get(key).version
+
+                latest = conn.execute(
+                    "SELECT model_version, inputs FROM snapshots WHERE series = ? ORDER BY created_at DESC LIMIT 1",
+                    (series,),
+                ).fetchone()
+                if latest == (version, inputs):
+                    continue
+
+                last_observed = str(historical['date'].iloc[-1])[:10]
+                snapshot_id = conn.execute(
+                    "INSERT INTO snapshots (series, created_at, generation, model_version, inputs, last_observed)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (series, snapshot.created_at, snapshot.generation, version, inputs, last_observed),
+                ).lastrowid
+
+                dates = pd.to_datetime(points['date']).dt.strftime('%Y-%m-%d').tolist()
+                columns = [
+                    _nullable(points[c]) if c in points else [None] * len(points)
+                    for c in ('actual', 'sarima', 'xgboost')
+                ]
+                conn.executemany(
+                    "INSERT INTO points VALUES (?, ?, ?, ?, ?)",
+                    zip([snapshot_id] * len(points), dates, *columns),
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO actuals VALUES (?, ?, ?)",
+                    ((series, d, a) for d, a in zip(dates, columns[0]) if a is not None),
+                )
+                recorded += 1
+        return recorded
+
+    def snapshots(self, key: SeriesKey, limit: int = 100) -> List[Dict]:
+        """Metadata of the series' most recent recorded snapshots, newest first"""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT id, created_at, generation, model_version, inputs, last_observed FROM snapshots"
+                " WHERE series = ? ORDER BY created_at DESC LIMIT ?",
+                (_series_name(key), limit),
+            ).fetchall()
+        return [self._meta(row) for row in rows]
+
+    def as_of(self, key: SeriesKey, when: Optional[float] = None) -> Optional[Dict]:
+        """
+        The snapshot that was current for a series at a point in time
+
+        Args:
+            key: (product, area)
+            when: Unix time (None for the latest)
+
+        Returns:
+            Snapshot metadata plus 'points' (DataFrame of date, actual,
+            sarima, xgboost), or None if nothing was recorded by then
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT id, created_at, generation, model_version, inputs, last_observed FROM snapshots"
+                " WHERE series = ? AND created_at <= ? ORDER BY created_at DESC LIMIT 1",
+                (_series_name(key), float('inf') if when is None else when),
+            ).fetchone()
+            if row is None:
+                return None
+            points = pd.read_sql_query(
+                "SELECT date, actual, sarima, xgboost FROM points WHERE snapshot_id = ? ORDER BY date",
+                conn, params=(row[0],),
+            )
+        return {**self._meta(row), 'points': points}
+
+    def realized_errors(self, key: SeriesKey, since: Optional[float] = None) -> Optional[Dict]:
+        """
+        Score recorded forecasts against the prices realized since, per horizon
+
+        Args:
+            key: (product, area)
+            since: Only snapshots recorded at or after this Unix time
+
+        Returns:
+            {"snapshots", "first_snapshot", "last_snapshot", "horizons",
+            "metrics": {model: {"n", "mae", "rmse", "mape"}}} with one list
+            entry per horizon, like BacktestEngine.summarize; None if no
+            recorded forecast week has been realized yet
+        """
+        with closing(self._connect()) as conn:
+            df = pd.read_sql_query(_REALIZED, conn, params=(_series_name(key), since or 0.0))
+        if df.empty:
+            return None
+
+        steps = int(df['horizon'].max())
+        slot = df['horizon'].to_numpy() - 1
+        actual = df['actual'].to_numpy(dtype=np.float64)
+
+        metrics = {}
+        for name in HISTORY_MODELS:
+            err = df[name].to_numpy(dtype=np.float64) - actual
+            valid = ~np.isnan(err)
+            abs_err = np.abs(err[valid])
+            n = np.bincount(slot[valid], minlength=steps)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                mae = np.bincount(slot[valid], abs_err, minlength=steps) / n
+                rmse = np.sqrt(np.bincount(slot[valid], abs_err ** 2, minlength=steps) / n)
+                mape = 100 * np.bincount(slot[valid], abs_err / np.abs(actual[valid]), minlength=steps) / n
+            if not n.any():
+                continue
+            metrics[name] = {
+                'n': n.tolist(),
+                'mae': [None if np.isnan(v) else round(float(v), 4) for v in mae],
+                'rmse': [None if np.isnan(v) else round(float(v), 4) for v in rmse],
+                'mape': [None if np.isnan(v) else round(float(v), 3) for v in mape],
+            }
+
+        return {
+            'snapshots': int(df['snapshot_id'].nunique()),
+            'first_snapshot': _timestamp(df['created_at'].min()),
+            'last_snapshot': _timestamp(df['created_at'].max()),
+            'horizons': list(range(1, steps + 1)),
+            'metrics': metrics,
+        }
+
+    @staticmethod
+    def _meta(row) -> Dict:
+        snapshot_id, created_at, generation, model_version, inputs, last_observed = row
+        return {
+            'snapshot_id': snapshot_id,
+            'created_at': _timestamp(created_at),
+            'generation': generation,
+            'model_version': model_version,
+            'inputs': inputs,
+            'last_observed': last_observed,
+        }
+
+
+def _default_history() -> Optional[ForecastHistory]:
+    if not FORECAST_HISTORY_PATH:
+        return None
+    return ForecastHistory(os.path.join(SERVER_ROOT, FORECAST_HISTORY_PATH))
+
+
+forecast_history = _default_history()
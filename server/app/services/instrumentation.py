@@ -0,0 +1,155 @@
+"""
+Prometheus metrics and opt-in per-request profiling
+
+Metrics live in the process-wide prometheus_client registry and are served
+by `/metrics/prom`. Each process exposes its own: with `serve.py`, every
+worker reports its request latencies, and the leader (which builds the
+snapshots) can expose its refresh-stage timings on LEADER_METRICS_PORT.
+"""
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from prometheus_client import Counter, Gauge, Histogram
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import PROFILE_HEADER, PROFILE_TOKEN
+
+# Cached responses are served in well under a millisecond, so the default
+# buckets (starting at 5 ms) would put every request in the first one
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STAGE_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+REQUEST_LATENCY = Histogram(
+    "fuelcast_request_duration_seconds", "HTTP request latency by route",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS
+)
+STAGE_DURATION = Histogram(
+    "fuelcast_refresh_stage_duration_seconds",
+    "Duration of each data refresh stage (EIA fetches, per-series model predictions)",
+    ["stage"], buckets=STAGE_BUCKETS
+)
+REFRESH_DURATION = Histogram(
+    "fuelcast_refresh_duration_seconds", "Duration of a full snapshot refresh", buckets=STAGE_BUCKETS
+)
+MODEL_LOAD_DURATION = Histogram(
+    "fuelcast_model_load_duration_seconds", "Model artifact load duration",
+    ["model"], buckets=STAGE_BUCKETS
+)
+SNAPSHOT_AGE = Gauge("fuelcast_snapshot_age_seconds", "Seconds since the served snapshot was built")
+SNAPSHOT_GENERATION = Gauge("fuelcast_snapshot_generation", "Generation of the served snapshot")
+STREAM_SUBSCRIBERS = Gauge("fuelcast_stream_subscribers", "Connected /stream clients")
+STREAM_RESYNCS = Counter("fuelcast_stream_resyncs_total", "Stream clients sent a full snapshot after falling behind")
+
+
+@contextmanager
+def timed_stage(stage: str, timings: Optional[Dict[str, float]] = None) -> Iterator[None]:
+    """
+    Time a block as a refresh stage
+
+    Args:
+        stage: Stage label (e.g. "fetch_gas", "sarimax_history")
+        timings: If given, add the duration here instead of observing it,
+            for code running in a pool process whose metrics would be lost
+            (see observe_stages)
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        if timings is None:
+            STAGE_DURATION.labels(stage).observe(elapsed)
+        else:
+            timings[stage] = timings.get(stage, 0.0) + elapsed
+
+
+def observe_stages(timings: Dict[str, float]) -> None:
+    """Record stage durations collected with timed_stage(..., timings)"""
+    for stage, elapsed in timings.items():
+        STAGE_DURATION.labels(stage).observe(elapsed)
+
+
+class RequestMetricsMiddleware:
+    """
+    Observe request latency per route template
+
+    Labels use the matched route's path (e.g. "/forecast"), not the raw
+    URL, so query strings and unknown paths cannot grow the label set.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            REQUEST_LATENCY.labels(
+                scope["method"], getattr(route, "path", "unmatched"), str(status)
+            ).observe(time.perf_counter() - start)
+
+
+class ProfilerMiddleware:
+    """
+    Profile single requests on demand with pyinstrument
+
+    Disabled unless PROFILE_TOKEN is set. A request carrying that token in
+    the PROFILE_HEADER header is run under a sampling profiler and answered
+    with the HTML profile instead of its normal body (the original status
+    is kept in X-Profiled-Status). Other requests pay one header lookup.
+    """
+
+    def __init__(self, app: ASGIApp, token: str = PROFILE_TOKEN, header: str = PROFILE_HEADER):
+        self.app = app
+        self.token = token
+        self.header = header
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if not self.token or scope["type"] != "http" or Headers(scope=scope).get(self.header) != self.token:
+            await self.app(scope, receive, send)
+            return
+
+        from pyinstrument import Profiler  # debugging aid; not imported unless used
+
+        status = 500
+
+        async def discard_body(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        profiler = Profiler(async_mode="enabled")
+        profiler.start()
+        try:
+            await self.app(scope, receive, discard_body)
+        finally:
+            profiler.stop()
+
+        body = profiler.output_html().encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/html; charset=utf-8"),
+                (b"content-length", str(len(body)).encode()),
+                (b"cache-control", b"no-store"),
+                (b"x-profiled-status", str(status).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
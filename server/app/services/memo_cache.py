@@ -0,0 +1,80 @@
+"""Bounded LRU/TTL cache for async computations, with in-flight coalescing"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class MemoCache:
+    """
+    Results of expensive async computations, keyed by their inputs
+
+    At most `max_entries` results are kept, least recently used dropped
+    first, and each expires `ttl` seconds after it was computed. A miss
+    starts the computation as its own task; callers asking for the same key
+    while it runs await that task instead of starting another, so N
+    identical concurrent requests cost one computation. A caller that goes
+    away (e.g. a client disconnect) does not cancel it for the others.
+    Failures are not cached.
+
+    All methods must be called from the event loop thread.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    async def get(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Return the cached result for key, computing it on a miss
+
+        Args:
+            key: Hashable digest of every input the result depends on
+            compute: Coroutine function producing the result
+
+        Returns:
+            Tuple of (result, True if served without computing)
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value, True
+            del self._entries[key]
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task), True
+
+        self.misses += 1
+        task = asyncio.create_task(self._compute(key, compute))
+        self._inflight[key] = task
+        return await asyncio.shield(task), False
+
+    async def _compute(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await compute()
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return value
+        finally:
+            del self._inflight[key]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+        }
@@ -0,0 +1,119 @@
+"""
+Export trained models to compact, fast-loading artifacts
+
+XGBoost models are saved in the booster's native UBJSON format. SARIMAX
+results are reduced to their constructor arguments, fitted parameters
+and training data (as .npy files that are memory-mapped on load); at load
+time the model is rebuilt and the parameters are re-applied with a single
+Kalman filter pass instead of unpickling the full results object.
+
+Usage (from the server directory):
+    python -m app.services.model_export [--model-dir models/diesel_PADD3]
+"""
+import argparse
+import json
+import os
+import pickle
+import numpy as np
+import pandas as pd
+from app.config import MODEL_PATH, SARIMAX_MODEL_PATH, SARIMAX_EXPORT_DIR, SERVER_ROOT, XGBOOST_NATIVE_PATH
+
+
+def export_xgboost(model, path: str) -> None:
+    """Save an XGBoost model (sklearn wrapper or Booster) in native format"""
+    model.save_model(path)
+
+
+def export_sarimax(results, directory: str) -> None:
+    """
+    Save a fitted SARIMAX results object as spec + parameters + data arrays
+
+    Args:
+        results: statsmodels SARIMAXResults (or wrapper)
+        directory: Output directory (created if needed)
+    """
+    os.makedirs(directory, exist_ok=True)
+    model = results.model
+    data = model.data
+
+    spec = {
+        'init_kwds': model._get_init_kwds(),
+        'params': dict(zip(model.param_names, np.asarray(results.params, dtype=float).tolist())),
+        'endog_name': data.ynames if isinstance(data.ynames, str) else None,
+        'exog_names': list(data.xnames) if data.orig_exog is not None else None,
+        'freq': None,
+    }
+    np.save(os.path.join(directory, 'endog.npy'), np.asarray(data.orig_endog, dtype=np.float64).ravel())
+    if data.orig_exog is not None:
+        np.save(os.path.join(directory, 'exog.npy'), np.asarray(data.orig_exog, dtype=np.float64))
+
+    index = getattr(data.orig_endog, 'index', None)
+    if isinstance(index, pd.DatetimeIndex):
+        np.save(os.path.join(directory, 'index.npy'), index.asi8)
+        spec['freq'] = index.freqstr
+
+    with open(os.path.join(directory, 'spec.json'), 'w') as f:
+        json.dump(spec, f, indent=2)
+
+
+def load_sarimax(directory: str):
+    """
+    Rebuild SARIMAX results from an export_sarimax directory
+
+    Data arrays are opened with mmap_mode='r', so workers loading the same
+    artifact share the file's pages until statsmodels copies them into its
+    state-space representation.
+
+    Returns:
+        SARIMAXResultsWrapper equivalent (for prediction) to the original
+    """
+    from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+    with open(os.path.join(directory, 'spec.json')) as f:
+        spec = json.load(f)
+
+    endog = np.load(os.path.join(directory, 'endog.npy'), mmap_mode='r')
+    index = None
+    index_path = os.path.join(directory, 'index.npy')
+    if os.path.exists(index_path):
+        index = pd.DatetimeIndex(np.load(index_path), freq=spec['freq'])
+    endog = pd.Series(endog, index=index, name=spec['endog_name'])
+
+    exog = None
+    if spec['exog_names'] is not None:
+        exog = pd.DataFrame(
+            np.load(os.path.join(directory, 'exog.npy'), mmap_mode='r'),
+            index=endog.index,
+            columns=spec['exog_names'],
+        )
+
+    init_kwds = {k: tuple(v) if isinstance(v, list) else v for k, v in spec['init_kwds'].items()}
+    model = SARIMAX(endog, exog=exog, **init_kwds)
+    params = np.array([spec['params'][name] for name in model.param_names])
+    return model.filter(params)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-dir", default="", help="model directory relative to the server root")
+    args = parser.parse_args()
+    directory = os.path.join(SERVER_ROOT, args.model_dir)
+    import joblib
+
+    xgb_path = os.path.join(directory, MODEL_PATH)
+    if os.path.exists(xgb_path):
+        out = os.path.join(directory, XGBOOST_NATIVE_PATH)
+        export_xgboost(joblib.load(xgb_path), out)
+        print(f"✓ Exported XGBoost model to {out} ({os.path.getsize(out):,} bytes, was {os.path.getsize(xgb_path):,})")
+
+    sarimax_path = os.path.join(directory, SARIMAX_MODEL_PATH)
+    if os.path.exists(sarimax_path):
+        out = os.path.join(directory, SARIMAX_EXPORT_DIR)
+        with open(sarimax_path, 'rb') as f:
+            export_sarimax(pickle.load(f), out)
+        size = sum(os.path.getsize(os.path.join(out, name)) for name in os.listdir(out))
+        print(f"✓ Exported SARIMAX model to {out} ({size:,} bytes, was {os.path.getsize(sarimax_path):,})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Registry of per-series model pairs"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Tuple
+from app.config import DEFAULT_SERIES, MODEL_DIR, MODEL_REGISTRY_SIZE
+from app.services.model_service import ModelService, model_service
+
+SeriesKey = Tuple[str, str]  # (product, area)
+
+
+class ModelRegistry:
+    """
+    ModelService instances keyed by (product, area)
+
+    The default series is served by the shared `model_service` singleton
+    and is always resident (loaded on first use if warm-up did not load
+    it, e.g. in worker processes that attach to a leader's snapshot). Other series are loaded from
+    MODEL_DIR/<product>_<area>/ on first use and evicted least-recently-used
+    once more than `capacity` are held.
+
+    Artifacts are read outside the registry lock, behind a per-series
+    guard: concurrent first requests for one series load it once, and
+    lookups of series already held never wait on a load.
+    """
+
+    def __init__(self, capacity: int = MODEL_REGISTRY_SIZE):
+        self.capacity = capacity
+        self._models: "OrderedDict[SeriesKey, ModelService]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading: Dict[SeriesKey, threading.Lock] = {}
+        self._default_lock = threading.Lock()
+        self._default_checked = False
+
+    def get(self, key: SeriesKey) -> ModelService:
+        """
+        Return the models for a series, loading them if needed
+
+        Args:
+            key: (product, area)
+
+        Returns:
+            ModelService (models are None where no artifact exists)
+        """
+        key = tuple(key)
+        if key == DEFAULT_SERIES:
+            if not self._default_checked:
+                with self._default_lock:
+                    if not self._default_checked and model_service.xgboost_model is None and model_service.sarimax_model is None:
+                        model_service.load_xgboost_model()
+                        model_service.load_sarimax_model()
+                    self._default_checked = True
+            return model_service
+
+        models = self._lookup(key)
+        if models is not None:
+            return models
+        with self._lock:
+            guard = self._loading.setdefault(key, threading.Lock())
+
+        with guard:
+            # Loaded by whoever held the guard before us?
+            models = self._lookup(key)
+            if models is not None:
+                return models
+            try:
+                models = ModelService(model_dir=os.path.join(MODEL_DIR, f"{key[0]}_{key[1]}"))
+                models.load_xgboost_model()
+                models.load_sarimax_model()
+                with self._lock:
+                    self._models[key] = models
+                    while len(self._models) > self.capacity:
+                        evicted, _ = self._models.popitem(last=False)
+                        print(f"Evicted models for {evicted[0]}/{evicted[1]}")
+            finally:
+                with self._lock:
+                    self._loading.pop(key, None)
+            return models
+
+    def _lookup(self, key: SeriesKey):
+        with self._lock:
+            models = self._models.get(key)
+            if models is not None:
+                self._models.move_to_end(key)
+            return models
+
+    def loaded(self):
+        return [DEFAULT_SERIES] + list(self._models)
+
+
+model_registry = ModelRegistry()
@@ -1,51 +1,142 @@
 """Model service"""
-import joblib
+import hashlib
 import pickle
 import os
-from typing import Optional, List, Dict
-from app.config import MODEL_PATH, SARIMAX_MODEL_PATH
+import threading
+import time
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from typing import Any, Optional, List, Dict, Sequence, Tuple, Union
+from app.config import MODEL_PATH, SARIMAX_MODEL_PATH, SARIMAX_EXPORT_DIR, SERVER_ROOT, XGBOOST_NATIVE_PATH
+from app.services.features import XGBOOST_FEATURES, FeaturePipeline
+from app.services.instrumentation import MODEL_LOAD_DURATION
+from app.services.model_export import load_sarimax
+
+# Booster.get_score importance types served by /importance
+IMPORTANCE_TYPES = ('weight', 'gain', 'cover', 'total_gain', 'total_cover')
+
+
+@dataclass(frozen=True)
+class _FilteredHistory:
+    """SARIMAX state filtered through an observed series, with its one-step predictions"""
+    model: Any  # the fitted results the state was built from
+    state: Any  # results object filtered through the last week of `dates`
+    dates: np.ndarray  # datetime64[D]
+    gas: np.ndarray
+    crude: np.ndarray
+    fitted: np.ndarray  # one-step-ahead prediction for each week of `dates`
+
+    def overlap(self, dates: np.ndarray, gas: np.ndarray, crude: np.ndarray) -> Optional[int]:
+        """
+        Position of dates[0] in this history if the given series agrees with
+        it wherever both have data, else None (unseen start, EIA revision)
+        """
+        start = int(np.searchsorted(self.dates, dates[0]))
+        if start == len(self.dates) or self.dates[start] != dates[0]:
+            return None
+        n = min(len(self.dates) - start, len(dates))
+        same = (
+            np.array_equal(self.dates[start:start + n], dates[:n])
+            and np.array_equal(self.gas[start:start + n], gas[:n])
+            and np.array_equal(self.crude[start:start + n], crude[:n])
+        )
+        return start if same else None
+
+
+def _artifact_version(path: str) -> str:
+    """Cheap fingerprint of a model file or export directory (names, sizes, mtimes)"""
+    paths = [path]
+    if os.path.isdir(path):
+        paths = [os.path.join(path, name) for name in sorted(os.listdir(path))]
+    digest = hashlib.sha1()
+    for p in paths:
+        stat = os.stat(p)
+        digest.update(f"{os.path.basename(p)}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()[:12]
 
 
 class ModelService:
-    def __init__(self):
+    def __init__(self, model_dir: str = ""):
+        """
+        Args:
+            model_dir: Directory holding the model files, relative to the server root
+        """
+        self.model_dir = model_dir
         self.xgboost_model = None
         self.sarimax_model = None
+        self.versions: Dict[str, str] = {}
+        self._importance: Dict[str, List[Dict]] = {}
+        self._importance_model = None  # model the cached importance was computed for
+        self._sarimax_history: Optional[_FilteredHistory] = None
+        self._sarimax_lock = threading.Lock()
+    
+    @property
+    def version(self) -> str:
+        """Identifier of the loaded artifacts, for keying caches of model output"""
+        return "-".join(f"{name}:{self.versions.get(name, 'none')}" for name in ('xgboost', 'sarimax'))
     
     def load_xgboost_model(self) -> bool:
-        server_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-        model_path = os.path.join(server_root, MODEL_PATH)
+        """Load XGBoost model, preferring the native UBJSON export over joblib"""
+        native_path = os.path.join(SERVER_ROOT, self.model_dir, XGBOOST_NATIVE_PATH)
+        model_path = os.path.join(SERVER_ROOT, self.model_dir, MODEL_PATH)
         
+        start = time.perf_counter()
         try:
-            self.xgboost_model = joblib.load(model_path)
+            if os.path.exists(native_path):
+                import xgboost as xgb  # only needed here; workers that never load models skip it
+                model_path = native_path
+                self.xgboost_model = xgb.XGBRegressor()
+                self.xgboost_model.load_model(native_path)
+            else:
+                import joblib
+                self.xgboost_model = joblib.load(model_path)
+            self.versions['xgboost'] = _artifact_version(model_path)
+            MODEL_LOAD_DURATION.labels('xgboost').observe(time.perf_counter() - start)
+            self._cache_importance()
             print(f"✓ Loaded XGBoost model from {model_path}")
             return True
         except Exception as e:
             print(f"✗ Failed to load XGBoost model: {e}")
             self.xgboost_model = None
+            self.versions.pop('xgboost', None)
             return False
     
     def load_sarimax_model(self) -> bool:
-        """Load SARIMAX model from pickle file"""
-        server_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-        model_path = os.path.join(server_root, SARIMAX_MODEL_PATH)
+        """Load SARIMAX model, preferring the parameter export over the full pickle"""
+        export_dir = os.path.join(SERVER_ROOT, self.model_dir, SARIMAX_EXPORT_DIR)
+        model_path = os.path.join(SERVER_ROOT, self.model_dir, SARIMAX_MODEL_PATH)
         
+        start = time.perf_counter()
         try:
-            with open(model_path, 'rb') as f:
-                self.sarimax_model = pickle.load(f)
+            if os.path.isdir(export_dir):
+                model_path = export_dir
+                self.sarimax_model = load_sarimax(export_dir)
+            else:
+                with open(model_path, 'rb') as f:
+                    self.sarimax_model = pickle.load(f)
+            self.versions['sarimax'] = _artifact_version(model_path)
+            MODEL_LOAD_DURATION.labels('sarimax').observe(time.perf_counter() - start)
             print(f"✓ Loaded SARIMAX model from {model_path}")
             return True
         except Exception as e:
             print(f"✗ Failed to load SARIMAX model: {e}")
             self.sarimax_model = None
+            self.versions.pop('sarimax', None)
             return False
     
-    def predict_sarimax(self, exog_future, steps: int):
+    def predict_sarimax(self, exog_future, steps: int, state=None):
         """
         Generate SARIMAX predictions
         
         Args:
             exog_future: DataFrame or array of exogenous variables for forecast period
             steps: Number of steps to forecast
+            state: Filtered results to forecast from (see sarimax_state)
+            
+        Without a state the forecast starts after the last week passed to
+        sarimax_history, or after the training data if it has not been
+        called; pass one when other threads may filter other series.
             
         Returns:
             Array of predictions or None if model not loaded
@@ -54,33 +145,300 @@ class ModelService:
             return None
         
         try:
-            forecast = self.sarimax_model.get_forecast(steps=steps, exog=exog_future)
-            predictions = forecast.predicted_mean
+            exog = np.asarray(exog_future, dtype=np.float64).reshape(steps, -1)
+            results = self._sarimax_results() if state is None else state
+            forecast = results.get_forecast(steps=steps, exog=exog)
+            predictions = np.asarray(forecast.predicted_mean, dtype=np.float64)
             return predictions
         except Exception as e:
             print(f"Error making SARIMAX predictions: {e}")
             return None
     
-    def get_feature_importance(self) -> Optional[List[Dict]]:
+    def sarimax_exog_response(self, steps: int, state=None):
+        """
+        Linearize the SARIMAX forecast with respect to the future crude path
+
+        The state-space forecast mean is affine in the exogenous regressors,
+        so forecast(x) == base + response @ x exactly. Computing base and
+        response once (steps + 1 get_forecast calls) lets any number of crude
+        scenarios be forecast with a single matrix product.
+
+        Args:
+            steps: Forecast horizon
+            state: Filtered results to forecast from, as for predict_sarimax
+
+        Returns:
+            Tuple of (base, response, variance) with shapes (steps,),
+            (steps, steps) and (steps,), or None if model not loaded
+        """
+        if self.sarimax_model is None:
+            return None
+
+        try:
+            results = self._sarimax_results() if state is None else state
+            zeros = np.zeros((steps, 1))
+            forecast = results.get_forecast(steps=steps, exog=zeros)
+            base = np.asarray(forecast.predicted_mean, dtype=np.float64)
+            variance = np.asarray(forecast.var_pred_mean, dtype=np.float64)
+
+            response = np.empty((steps, steps))
+            for j in range(steps):
+                impulse = zeros.copy()
+                impulse[j, 0] = 1.0
+                shifted = results.get_forecast(steps=steps, exog=impulse).predicted_mean
+                response[:, j] = np.asarray(shifted, dtype=np.float64) - base
+            return base, response, variance
+        except Exception as e:
+            print(f"Error linearizing SARIMAX forecast: {e}")
+            return None
+
+    def _sarimax_results(self):
+        """Latest filtered state of the served series, else the training results"""
+        history = self._sarimax_history
+        if history is not None and history.model is self.sarimax_model:
+            return history.state
+        return self.sarimax_model
+
+    def sarimax_history(self, dates, gas_prices: Sequence[float], crude_prices: Sequence[float]) -> Optional[np.ndarray]:
+        """
+        One-step-ahead SARIMAX predictions over an observed series
+
+        The filtered state is kept between calls. When the series continues
+        the one seen last time (same values wherever both have data, e.g. a
+        rolling window that gained a week), the state is extended by only
+        the new weeks (`extend`, no refit) and the earlier weeks' predictions
+        are reused, so a refresh costs O(new weeks) rather than O(history).
+        Anything else (first call, reloaded model, EIA revision) filters the
+        whole series once with the fitted parameters (`apply`), as does a
+        series ending before the kept state (e.g. an older snapshot's
+        history), so the kept state always ends at the last week given and
+        predict_sarimax forecasts the weeks after it. Reused predictions keep
+        the state they were made with, so after a rolling window moves they
+        are conditioned on weeks before its start.
+
+        Args:
+            dates: Week dates
+            gas_prices: Observed gas prices aligned with dates
+            crude_prices: Observed crude prices aligned with dates
+
+        Returns:
+            Array aligned with dates, or None if model not loaded
+        """
+        model = self.sarimax_model
+        if model is None:
+            return None
+        history, start, n = self._filter(model, dates, gas_prices, crude_prices)
+        return history.fitted[start:start + n].copy()
+
+    def sarimax_state(self, dates, gas_prices: Sequence[float], crude_prices: Sequence[float]):
+        """
+        SARIMAX results filtered through an observed series, to forecast the weeks after it
+
+        Shares the kept state with sarimax_history, so for the series a
+        refresh just filtered this is a lookup.
+
+        Returns:
+            Results object for predict_sarimax / sarimax_exog_response, or
+            None if model not loaded
+        """
+        model = self.sarimax_model
+        if model is None:
+            return None
+        return self._filter(model, dates, gas_prices, crude_prices)[0].state
+
+    def _filter(self, model, dates, gas_prices, crude_prices) -> Tuple[_FilteredHistory, int, int]:
+        """Kept state ending at the series' last week, the series' position in it and its length"""
+        dates = pd.DatetimeIndex(dates).values.astype('datetime64[D]')
+        gas = np.asarray(gas_prices, dtype=np.float64)
+        crude = np.asarray(crude_prices, dtype=np.float64)
+
+        with self._sarimax_lock:
+            history = self._sarimax_history
+            start = None
+            if history is not None and history.model is model:
+                start = history.overlap(dates, gas, crude)
+
+            if start is not None and start + len(dates) < len(history.dates):
+                start = None  # ends before the kept state, which must end at the last week given
+            if start is None:
+                state = model.apply(gas, exog=crude[:, None])
+                history = _FilteredHistory(model, state, dates, gas, crude, np.asarray(state.fittedvalues))
+                start = 0
+            elif start + len(dates) > len(history.dates):
+                seen = len(history.dates) - start
+                state = history.state.extend(gas[seen:], exog=crude[seen:, None])
+                history = _FilteredHistory(
+                    model, state,
+                    np.concatenate([history.dates, dates[seen:]]),
+                    np.concatenate([history.gas, gas[seen:]]),
+                    np.concatenate([history.crude, crude[seen:]]),
+                    np.concatenate([history.fitted, np.asarray(state.fittedvalues)]),
+                )
+            self._sarimax_history = history
+
+        return history, start, len(dates)
+
+    def _xgboost_booster(self):
+        model = self.xgboost_model
+        return model.get_booster() if hasattr(model, 'get_booster') else model
+
+    def forecast_xgboost(
+        self,
+        last_gas_price: float,
+        crude_history: Sequence[float],
+        future_crude,
+        forecast_dates: Sequence,
+        noise_std: float = 0.0,
+        rng=None,
+        return_features: bool = False,
+    ) -> Union[None, np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+        """
+        Recursive multi-step XGBoost forecast for one or many crude scenarios
+
+        Each step feeds the previous step's prediction back in as
+        gas_price_lag1. Feature rows come from a FeaturePipeline that
+        appends one week per step for all scenarios at once, so the horizon
+        costs one batched booster call per step.
+
+        Args:
+            last_gas_price: Last observed gas price (seeds gas_price_lag1)
+            crude_history: Observed weekly crude prices, at least the last 4
+            future_crude: Crude path of shape (steps,) or (n_scenarios, steps)
+            forecast_dates: Dates of the forecast steps
+            noise_std: Std of Gaussian noise added to each step's prediction
+            rng: np.random.Generator (defaults to the global np.random state)
+            return_features: Also return the feature rows each step was
+                predicted from, shaped (steps, n_features) for one path or
+                (steps, n_scenarios, n_features)
+
+        Returns:
+            Predictions shaped like future_crude (plus the feature rows if
+            requested), or None if model not loaded
+        """
         if self.xgboost_model is None:
             return None
+
+        future_crude = np.asarray(future_crude, dtype=np.float64)
+        paths = np.atleast_2d(future_crude)
+        n_paths, steps = paths.shape
+        rng = np.random if rng is None else rng
+
+        booster = self._xgboost_booster()
+        pipeline = FeaturePipeline.seeded(
+            last_gas_price, crude_history, names=booster.feature_names or XGBOOST_FEATURES,
+            batch=n_paths, reserve=steps,
+        )
+        dates = pd.DatetimeIndex(forecast_dates).values
+
+        gas = np.empty((n_paths, steps + 1))
+        gas[:, 0] = last_gas_price
+        for i in range(steps):
+            features = pipeline.append(dates[i], paths[:, i])
+            pred = booster.inplace_predict(features)
+            if noise_std:
+                pred = pred + rng.normal(0, noise_std, n_paths)
+            pipeline.set_gas(pred)
+            gas[:, i + 1] = pred
+
+        forecast = gas[:, 1:]
+        forecast = forecast[0] if future_crude.ndim == 1 else forecast
+        if return_features:
+            return forecast, pipeline.features[-steps:].copy()
+        return forecast
+
+    def explain_xgboost(self, features: np.ndarray) -> Optional[pd.DataFrame]:
+        """
+        SHAP contributions of each feature to XGBoost predictions
+
+        All rows are explained in one batched pred_contribs call (TreeSHAP
+        inside XGBoost).
+
+        Args:
+            features: Feature rows of shape (n, n_features), in model order
+
+        Returns:
+            DataFrame with one column per feature plus 'bias' (the expected
+            value); each row sums to the model's prediction. None if no
+            model is loaded.
+        """
+        if self.xgboost_model is None:
+            return None
+
+        import xgboost as xgb
+
+        booster = self._xgboost_booster()
+        names = list(booster.feature_names or XGBOOST_FEATURES)
+        contribs = booster.predict(xgb.DMatrix(features, feature_names=names), pred_contribs=True)
+        return pd.DataFrame(contribs, columns=names + ['bias'])
+
+    def predict_xgboost_history(self, dates, gas_prices: Sequence[float], crude_prices: Sequence[float]) -> Optional[np.ndarray]:
+        """
+        One-step-ahead XGBoost predictions over an observed series
+
+        Args:
+            dates: Week dates
+            gas_prices: Observed gas prices aligned with dates
+            crude_prices: Observed crude prices aligned with dates
+
+        Returns:
+            Array aligned with dates, NaN for the leading weeks without lag
+            features, or None if model not loaded
+        """
+        if self.xgboost_model is None:
+            return None
+
+        booster = self._xgboost_booster()
+        pipeline = FeaturePipeline.from_history(
+            dates, gas_prices, crude_prices, names=booster.feature_names or XGBOOST_FEATURES
+        )
+        preds = np.full(pipeline.size, np.nan)
+        valid = pipeline.valid
+        if valid.any():
+            preds[valid] = booster.inplace_predict(pipeline.features[valid])
+        return preds
+
+    def _cache_importance(self) -> None:
+        """Compute normalized importance for every type once for the loaded model"""
+        self._importance = {}
+        self._importance_model = self.xgboost_model
+        if self.xgboost_model is None:
+            return
         
         try:
-            booster = self.xgboost_model.get_booster() if hasattr(self.xgboost_model, 'get_booster') else self.xgboost_model
-            importance_dict = booster.get_score(importance_type='weight')
-            
-            features = [{"feature": f, "score": float(s)} for f, s in importance_dict.items()]
-            
-            if features:
-                max_score = max(f['score'] for f in features)
-                for f in features:
-                    f['score'] = round(f['score'] / max_score, 3)
-            
-            features.sort(key=lambda x: x['score'], reverse=True)
-            return features
+            booster = self._xgboost_booster()
+            for importance_type in IMPORTANCE_TYPES:
+                importance_dict = booster.get_score(importance_type=importance_type)
+                
+                features = [{"feature": f, "score": float(s)} for f, s in importance_dict.items()]
+                
+                if features:
+                    max_score = max(f['score'] for f in features)
+                    for f in features:
+                        f['score'] = round(f['score'] / max_score, 3)
+                
+                features.sort(key=lambda x: x['score'], reverse=True)
+                self._importance[importance_type] = features
         except Exception as e:
             print(f"Failed to extract feature importance: {e}")
-            return None
+            self._importance = {}
+    
+    def get_feature_importance(self, importance_type: str = 'weight') -> Optional[List[Dict]]:
+        """
+        Feature importance scores normalized to the largest, highest first
+        
+        Scores for all IMPORTANCE_TYPES are computed once per model load
+        and served from memory.
+        
+        Args:
+            importance_type: One of IMPORTANCE_TYPES
+        
+        Returns:
+            List of {"feature", "score"}, or None if no model is loaded or
+            extraction failed
+        """
+        if self._importance_model is not self.xgboost_model:
+            self._cache_importance()  # model assigned directly rather than loaded
+        return self._importance.get(importance_type)
     
     @staticmethod
     def get_fallback_importance() -> List[Dict]:
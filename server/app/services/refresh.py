@@ -0,0 +1,152 @@
+"""Periodic data refresh"""
+import asyncio
+import time
+from fastapi.concurrency import run_in_threadpool
+from typing import Awaitable, Callable, Dict, Optional
+from app.config import FORECAST_SERIES, HISTORICAL_WEEKS, REFRESH_INTERVAL_HOURS, REFRESH_RETRY_BACKOFF, REFRESH_RETRY_MAX
+from app.services.data_generator import generate_series
+from app.services.eia_data_loader import eia_loader
+from app.services.forecast_history import forecast_history
+from app.services.instrumentation import REFRESH_DURATION
+from app.services.snapshot import Snapshot, snapshot_store
+
+
+class RefreshScheduler:
+    """
+    Rebuilds the forecast snapshot on a fixed interval
+
+    Each refresh fetches EIA data for every configured series on the event
+    loop (async I/O), then runs the model predictions (which fan out across
+    processes for multiple series) and publishes the result as a new
+    snapshot in a worker thread, so neither the predictions nor the
+    snapshot's metrics, cache invalidation and subscriber notifications
+    block the event loop. Each snapshot is also appended to the forecast
+    history. Only one refresh runs at a time. A failed refresh is retried
+    with exponential backoff (REFRESH_RETRY_BACKOFF up to REFRESH_RETRY_MAX
+    seconds, never later than the regular interval).
+    """
+
+    def __init__(self, interval_hours: float):
+        self.interval = interval_hours * 3600
+        self.last_started_at: Optional[float] = None
+        self.last_success_at: Optional[float] = None
+        self.last_duration: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.next_refresh_at: Optional[float] = None
+        self.refresh_count = 0
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    async def refresh(self, *concurrently: Awaitable) -> Snapshot:
+        """
+        Build and publish a new snapshot
+        
+        Args:
+            concurrently: Awaitables to run alongside the EIA fetch, before
+                predictions (e.g. model loading at startup)
+        
+        Returns:
+            The published snapshot
+        """
+        async with self._lock:
+            self.last_started_at = time.time()
+            start = time.perf_counter()
+            try:
+                aligned, *_ = await asyncio.gather(
+                    eia_loader.get_aligned_series_async(FORECAST_SERIES, weeks=HISTORICAL_WEEKS),
+                    *concurrently
+                )
+                snapshot = await run_in_threadpool(lambda: snapshot_store.publish(generate_series(aligned)))
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                print(f"✗ Data refresh failed: {self.last_error}")
+                raise
+
+            self.last_duration = time.perf_counter() - start
+            REFRESH_DURATION.observe(self.last_duration)
+            self.last_success_at = snapshot.created_at
+            self.last_error = None
+            self.refresh_count += 1
+            print(f"✓ Published snapshot generation {snapshot.generation} in {self.last_duration:.2f}s")
+
+            if forecast_history is not None:
+                try:
+                    recorded = await run_in_threadpool(forecast_history.record, snapshot)
+                    print(f"✓ Recorded {recorded} series to forecast history")
+                except Exception as e:
+                    print(f"✗ Failed to record forecast history: {type(e).__name__}: {e}")
+            return snapshot
+
+    async def first_refresh(
+        self,
+        *startup: Callable[[], Awaitable],
+        on_error: Optional[Callable[[Exception], None]] = None
+    ) -> Snapshot:
+        """
+        Build the first snapshot, retrying with backoff until it succeeds
+        
+        Args:
+            startup: Functions returning awaitables to run alongside each
+                attempt's EIA fetch (e.g. model loading)
+            on_error: Called with each failed attempt's exception
+        
+        Returns:
+            The published snapshot
+        """
+        delay = REFRESH_RETRY_BACKOFF
+        while True:
+            try:
+                return await self.refresh(*(start() for start in startup))
+            except Exception as e:
+                if on_error is not None:
+                    on_error(e)
+                self.next_refresh_at = time.time() + delay
+                print(f"  Retrying in {delay:.0f}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, REFRESH_RETRY_MAX)
+
+    async def _run(self) -> None:
+        delay = None  # backoff after a failed refresh
+        while True:
+            wait = self.interval if delay is None else min(delay, self.interval)
+            self.next_refresh_at = time.time() + wait
+            await asyncio.sleep(wait)
+            try:
+                await self.refresh()
+                delay = None
+            except Exception:
+                # Recorded in last_error; keep serving the previous snapshot
+                delay = REFRESH_RETRY_BACKOFF if delay is None else min(delay * 2, REFRESH_RETRY_MAX)
+
+    def start(self) -> None:
+        """Start the periodic loop (no-op if the interval is 0 or already running)"""
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def status(self) -> Dict:
+        snapshot = snapshot_store.current
+        now = time.time()
+        return {
+            "interval_seconds": self.interval,
+            "refresh_count": self.refresh_count,
+            "running": self._lock.locked(),
+            "last_started_at": self.last_started_at,
+            "last_success_at": self.last_success_at,
+            "last_duration_seconds": self.last_duration,
+            "last_error": self.last_error,
+            "next_refresh_at": self.next_refresh_at,
+            "snapshot_generation": snapshot.generation if snapshot else None,
+            "snapshot_age_seconds": now - snapshot.created_at if snapshot else None,
+        }
+
+
+refresh_scheduler = RefreshScheduler(REFRESH_INTERVAL_HOURS)
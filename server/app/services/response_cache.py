@@ -0,0 +1,168 @@
+"""Pre-serialized response cache for read-only endpoints"""
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+from app.config import RESPONSE_CACHE_MAX_ENTRIES
+from app.services.content_negotiation import JSON_MEDIA_TYPE, SERIALIZERS, compress
+
+
+class CachedResponse:
+    """Serialized response body plus its validator and compressed variants"""
+
+    __slots__ = ("body", "etag", "media_type", "_encoded")
+
+    def __init__(self, body: bytes, generation: int, media_type: str = JSON_MEDIA_TYPE):
+        self.body = body
+        self.media_type = media_type
+        digest = hashlib.sha1(body).hexdigest()[:16]
+        self.etag = f'"{generation}-{digest}"'
+        self._encoded: Dict[str, bytes] = {}
+
+    def encoded(self, coding: Optional[str]) -> Tuple[bytes, str]:
+        """
+        Body and ETag for a content-coding, compressing on first use only
+
+        Each coding gets its own ETag, since the bytes differ. Two requests
+        racing on the first use may both compress; either result is kept.
+
+        Args:
+            coding: "br", "gzip", or None for the uncompressed body
+
+        Returns:
+            Tuple of (body, ETag)
+        """
+        if coding is None:
+            return self.body, self.etag
+        body = self._encoded.get(coding)
+        if body is None:
+            body = self._encoded.setdefault(coding, compress(self.body, coding))
+        return body, f'{self.etag[:-1]}-{coding}"'
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """
+        Check an If-None-Match header value against this response's ETag
+
+        Args:
+            if_none_match: Raw header value (may list several tags or be '*')
+
+        Returns:
+            True if the client already holds this exact representation
+        """
+        if not if_none_match:
+            return False
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag.startswith("W/"):
+                tag = tag[2:]
+            # Any coding of the same payload validates it
+            if tag == "*" or tag == self.etag or tag.startswith(self.etag[:-1] + "-"):
+                return True
+        return False
+
+
+class _Build:
+    """A payload being built by one thread, awaited by the others asking for it"""
+
+    __slots__ = ("done", "entry")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.entry: Optional[CachedResponse] = None
+
+
+class ResponseCache:
+    """
+    Cache of serialized endpoint payloads, valid for one data generation
+
+    Payloads are built and encoded once, the first time they are requested
+    for a generation, and then served as raw bytes; each compressed variant
+    is likewise produced once per entry. Entries are keyed by
+    generation as well as by key, so a request that started on an older
+    snapshot can never publish its payload under a newer generation.
+    Parameterized endpoints can create many keys, so at most `max_entries`
+    payloads are held; the oldest are dropped first.
+
+    Builds run outside the cache lock, which only guards the dict reads
+    and inserts, so a slow build never holds up other keys or
+    invalidation. Concurrent misses on the same key are coalesced: one
+    caller builds, the others wait for its result (and retry if it fails).
+    """
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.generation = 0
+        self._entries: Dict[Tuple[int, str, str], CachedResponse] = {}
+        self._inflight: Dict[Tuple[int, str, str], _Build] = {}
+        self._lock = threading.Lock()
+
+    def invalidate(self, generation: Optional[int] = None) -> int:
+        """
+        Start a new data generation and drop payloads from older ones
+
+        Args:
+            generation: New generation number (default: current + 1)
+
+        Returns:
+            The new generation number
+        """
+        with self._lock:
+            self.generation = self.generation + 1 if generation is None else generation
+            self._entries = {k: v for k, v in self._entries.items() if k[0] >= self.generation}
+            return self.generation
+
+    def get(
+        self,
+        key: str,
+        builder: Callable[[], Any],
+        generation: Optional[int] = None,
+        media_type: str = JSON_MEDIA_TYPE
+    ) -> CachedResponse:
+        """
+        Return the cached payload for key, building it on first use
+
+        Args:
+            key: Cache key (usually the route plus any parameters)
+            builder: Callable returning a serializable payload
+            generation: Data generation the builder reads from (default: current)
+            media_type: Serialization to cache (JSON or MessagePack)
+
+        Returns:
+            CachedResponse holding the encoded body and ETag
+        """
+        generation = self.generation if generation is None else generation
+        entry_key = (generation, media_type, key)
+        entry = self._entries.get(entry_key)
+        if entry is not None:
+            return entry
+
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry is not None:
+                return entry
+            build = self._inflight.get(entry_key)
+            owner = build is None
+            if owner:
+                build = self._inflight[entry_key] = _Build()
+
+        if not owner:
+            build.done.wait()
+            if build.entry is not None:
+                return build.entry
+            return self.get(key, builder, generation, media_type)  # the build failed
+
+        try:
+            body = SERIALIZERS[media_type](builder())
+            entry = build.entry = CachedResponse(body, generation, media_type)
+            with self._lock:
+                if generation >= self.generation:
+                    self._entries[entry_key] = entry
+                    while len(self._entries) > self.max_entries:
+                        del self._entries[next(iter(self._entries))]
+        finally:
+            with self._lock:
+                del self._inflight[entry_key]
+            build.done.set()
+        return entry
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,161 @@
+"""Monte Carlo scenario engine for forecast uncertainty bands"""
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+from app.config import SCENARIO_CHUNK_SIZE, SCENARIO_PERCENTILES
+from app.services.model_service import model_service
+
+
+def project_crude_trend(crude_history: Sequence[float], steps: int) -> np.ndarray:
+    """
+    Deterministic crude projection: recent 12-week mean plus 13-week trend
+
+    Args:
+        crude_history: Observed weekly crude prices
+        steps: Number of weeks to project
+
+    Returns:
+        Array of shape (steps,)
+    """
+    crude = np.asarray(crude_history, dtype=np.float64)
+    recent_avg = crude[-12:].mean()
+    trend = (crude[-1] - crude[-13]) / 13 if len(crude) >= 13 else 0.0
+    return recent_avg + trend * np.arange(steps)
+
+
+def sample_crude_paths(
+    crude_history: Sequence[float],
+    steps: int,
+    n: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """
+    Sample crude price paths as random walks around the trend projection
+
+    Weekly shocks are drawn from N(0, sigma) where sigma is the std of the
+    last year's week-over-week crude changes.
+
+    Returns:
+        Array of shape (n, steps)
+    """
+    crude = np.asarray(crude_history, dtype=np.float64)
+    sigma = np.diff(crude[-53:]).std() if len(crude) > 2 else 1.0
+    shocks = rng.normal(0.0, sigma, size=(n, steps))
+    return project_crude_trend(crude, steps) + np.cumsum(shocks, axis=1)
+
+
+def _init_worker() -> None:
+    """Process-pool initializer: make sure models exist in the child"""
+    if model_service.xgboost_model is None:
+        model_service.load_xgboost_model()
+
+
+def _run_chunk(args) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+    """Simulate one chunk of scenarios (runs in-process or in a pool worker)"""
+    seed, n, inputs = args
+    rng = np.random.default_rng(seed)
+    steps = len(inputs['forecast_dates'])
+
+    paths = sample_crude_paths(inputs['crude_history'], steps, n, rng)
+
+    sarima = None
+    if inputs['sarimax'] is not None:
+        base, response, variance = inputs['sarimax']
+        sarima = base + paths @ response.T
+        sarima += rng.normal(0.0, 1.0, size=(n, steps)) * np.sqrt(variance)
+
+    xgboost = model_service.forecast_xgboost(
+        last_gas_price=inputs['last_gas_price'],
+        crude_history=inputs['crude_history'],
+        future_crude=paths,
+        forecast_dates=inputs['forecast_dates'],
+        noise_std=inputs['xgboost_noise_std'],
+        rng=rng,
+    )
+    return sarima, xgboost
+
+
+class ScenarioEngine:
+    """Propagate sampled crude paths through SARIMAX and XGBoost in bulk"""
+
+    def run(
+        self,
+        gas_history: Sequence[float],
+        crude_history: Sequence[float],
+        forecast_dates: Sequence,
+        n: int,
+        seed: Optional[int] = None,
+        workers: int = 0,
+        history_dates: Optional[Sequence] = None,
+    ) -> Dict:
+        """
+        Simulate n scenarios and summarize them as percentile bands
+
+        Scenarios are split into fixed-size chunks, each with its own child
+        seed, so a given seed gives the same bands whether the chunks run
+        in-process or across a process pool.
+
+        Args:
+            gas_history: Observed weekly gas prices
+            crude_history: Observed weekly crude prices, aligned with gas_history
+            forecast_dates: Dates of the forecast steps
+            n: Number of scenarios
+            seed: RNG seed (None for a fresh random draw)
+            workers: Process-pool size (capped at the CPU count); 0 runs
+                in the current process
+            history_dates: Week dates of gas_history; SARIMAX then forecasts
+                from its state filtered through the history (otherwise from
+                the last series filtered in this process)
+
+        Returns:
+            Dict with dates, scenario count and per-model percentile bands
+        """
+        gas = np.asarray(gas_history, dtype=np.float64)
+        steps = len(forecast_dates)
+        inputs = {
+            'crude_history': np.asarray(crude_history, dtype=np.float64),
+            'last_gas_price': float(gas[-1]),
+            'xgboost_noise_std': float(pd.Series(gas).pct_change().std()),
+            'forecast_dates': pd.DatetimeIndex(forecast_dates),
+            'sarimax': model_service.sarimax_exog_response(
+                steps,
+                None if history_dates is None else model_service.sarimax_state(history_dates, gas, crude_history),
+            ),
+        }
+
+        sizes = [SCENARIO_CHUNK_SIZE] * (n // SCENARIO_CHUNK_SIZE)
+        if n % SCENARIO_CHUNK_SIZE:
+            sizes.append(n % SCENARIO_CHUNK_SIZE)
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        chunks = [(s, size, inputs) for s, size in zip(seeds, sizes)]
+
+        workers = min(workers, len(chunks), os.cpu_count() or 1)
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+                results = list(pool.map(_run_chunk, chunks))
+        else:
+            results = [_run_chunk(chunk) for chunk in chunks]
+
+        bands = {}
+        for index, name in enumerate(['sarima', 'xgboost']):
+            parts = [r[index] for r in results if r[index] is not None]
+            if parts:
+                bands[name] = self.percentile_bands(np.vstack(parts))
+
+        return {
+            'date': [d.strftime('%Y-%m-%d') for d in inputs['forecast_dates']],
+            'n_scenarios': n,
+            'seed': seed,
+            **bands,
+        }
+
+    @staticmethod
+    def percentile_bands(samples: np.ndarray) -> Dict[str, List[float]]:
+        """Per-step percentiles of an (n, steps) sample matrix"""
+        values = np.percentile(samples, SCENARIO_PERCENTILES, axis=0)
+        return {f"p{p}": np.round(row, 3).tolist() for p, row in zip(SCENARIO_PERCENTILES, values)}
+
+
+scenario_engine = ScenarioEngine()
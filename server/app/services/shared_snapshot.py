@@ -0,0 +1,254 @@
+"""
+Snapshots shared between processes through memory-mapped files
+
+The leader serializes each published snapshot into one flat file: a JSON
+header (series keys, metrics, column layout) followed by 64-byte aligned
+float64/datetime64 column arrays. Workers mmap the file read-only and wrap
+the arrays in DataFrames without copying, so every worker serves the same
+bytes from the same physical pages (on Linux the default directory is
+/dev/shm, i.e. RAM).
+
+A small `current` file names the latest generation; it is replaced
+atomically after the snapshot file is complete.
+"""
+import asyncio
+import json
+import mmap
+import os
+import struct
+import time
+import numpy as np
+import pandas as pd
+from dataclasses import asdict
+from typing import Dict, List, Optional, Tuple
+from app.config import SNAPSHOT_KEEP, SNAPSHOT_POLL_SECONDS, SNAPSHOT_SHM_DIR
+from app.services.error_metrics import ErrorAccumulator, SeriesMetrics
+from app.services.snapshot import SeriesFrames, Snapshot, snapshot_store
+
+_MAGIC = b"FCSNAP01"
+_PREFIX = struct.Struct("<8sQ")  # magic, header length
+_ALIGN = 64
+_POINTER = "current"
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _snapshot_name(generation: int) -> str:
+    return f"snapshot-{generation:010d}.bin"
+
+
+def _frame_arrays(df: pd.DataFrame) -> List[Tuple[str, np.ndarray]]:
+    """Columns as fixed-width arrays: dates as datetime64[ns], everything else float64"""
+    arrays = []
+    for name in df.columns:
+        if name == 'date':
+            values = pd.to_datetime(df['date']).to_numpy(dtype='datetime64[ns]')
+        else:
+            values = df[name].to_numpy(dtype=np.float64, na_value=np.nan)
+        arrays.append((name, np.ascontiguousarray(values)))
+    return arrays
+
+
+def write_snapshot(snapshot: Snapshot, path: str) -> int:
+    """
+    Serialize a snapshot to `path` (written to a temp file, then renamed)
+
+    Returns:
+        File size in bytes
+    """
+    entries, blocks = [], []
+    offset = 0
+    for (product, area), frames in snapshot.series.items():
+        entry = {
+            'product': product,
+            'area': area,
+            'metrics': {
+                'last_date': frames.metrics.last_date,
+                'accumulators': {k: asdict(v) for k, v in frames.metrics.accumulators.items()},
+                'summary': frames.metrics.summary,
+            },
+        }
+        for part in ('historical', 'forecast'):
+            df = getattr(frames, part)
+            columns = []
+            for name, values in _frame_arrays(df):
+                offset = _align(offset)
+                columns.append([name, values.dtype.str, offset])
+                blocks.append((offset, values))
+                offset += values.nbytes
+            entry[part] = {'rows': len(df), 'columns': columns}
+        entries.append(entry)
+
+    header = json.dumps({
+        'generation': snapshot.generation,
+        'created_at': snapshot.created_at,
+        'series': entries,
+    }).encode('utf-8')
+    data_start = _align(_PREFIX.size + len(header))
+
+    tmp = f"{path}.tmp-{os.getpid()}"
+    with open(tmp, 'wb') as f:
+        f.write(_PREFIX.pack(_MAGIC, len(header)))
+        f.write(header)
+        for block_offset, values in blocks:
+            f.seek(data_start + block_offset)
+            f.write(values.tobytes())
+        f.truncate(data_start + _align(offset))
+    os.replace(tmp, path)
+    return data_start + _align(offset)
+
+
+def read_snapshot(path: str) -> Snapshot:
+    """
+    Attach to a snapshot file without copying its column data
+
+    The returned frames are backed by a read-only mmap that stays open for
+    as long as any of their arrays is referenced.
+    """
+    with open(path, 'rb') as f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, header_len = _PREFIX.unpack_from(buf, 0)
+    if magic != _MAGIC:
+        raise ValueError(f"{path} is not a snapshot file")
+    header = json.loads(buf[_PREFIX.size:_PREFIX.size + header_len])
+    data_start = _align(_PREFIX.size + header_len)
+
+    def frame(layout: Dict) -> pd.DataFrame:
+        columns = {}
+        for name, dtype, offset in layout['columns']:
+            values = np.frombuffer(buf, dtype=np.dtype(dtype), count=layout['rows'], offset=data_start + offset)
+            columns[name] = pd.Series(values, copy=False)
+        return pd.DataFrame(columns, copy=False)
+
+    series = {}
+    for entry in header['series']:
+        metrics = entry['metrics']
+        series[(entry['product'], entry['area'])] = SeriesFrames(
+            historical=frame(entry['historical']),
+            forecast=frame(entry['forecast']),
+            metrics=SeriesMetrics(
+                last_date=metrics['last_date'],
+                accumulators={k: ErrorAccumulator(**v) for k, v in metrics['accumulators'].items()},
+                summary=metrics['summary'],
+            ),
+        )
+    return Snapshot(series=series, generation=header['generation'], created_at=header['created_at'])
+
+
+def _read_pointer(directory: str) -> Optional[int]:
+    try:
+        with open(os.path.join(directory, _POINTER)) as f:
+            return int(f.read().strip())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+class SnapshotPublisher:
+    """Leader side: write each published snapshot and point `current` at it"""
+
+    def __init__(self, directory: str = SNAPSHOT_SHM_DIR, keep: int = SNAPSHOT_KEEP):
+        self.directory = directory
+        self.keep = keep
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def latest_generation(self) -> int:
+        """Generation currently pointed to (0 if none), so a restarted leader keeps counting up"""
+        return _read_pointer(self.directory) or 0
+
+    def publish(self, snapshot: Snapshot) -> None:
+        size = write_snapshot(snapshot, os.path.join(self.directory, _snapshot_name(snapshot.generation)))
+        pointer = os.path.join(self.directory, _POINTER)
+        with open(f"{pointer}.tmp", 'w') as f:
+            f.write(str(snapshot.generation))
+        os.replace(f"{pointer}.tmp", pointer)
+        print(f"✓ Shared snapshot generation {snapshot.generation} ({size:,} bytes) in {self.directory}")
+        self._prune()
+
+    def _prune(self) -> None:
+        # Unlinking is safe for workers still mapping an old file; the pages
+        # are released once their last mapping goes away.
+        names = sorted(n for n in os.listdir(self.directory) if n.startswith("snapshot-") and n.endswith(".bin"))
+        for name in names[:-self.keep]:
+            try:
+                os.unlink(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+
+
+class SnapshotFollower:
+    """
+    Worker side: poll `current` and install new generations into snapshot_store
+
+    The poll is one small file read per interval; the snapshot itself is
+    only mapped when the generation changes.
+    """
+
+    def __init__(self, directory: str = SNAPSHOT_SHM_DIR, interval: float = SNAPSHOT_POLL_SECONDS):
+        self.directory = directory
+        self.interval = interval
+        self.attached_generation: Optional[int] = None
+        self.attached_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._attached = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def poll(self) -> bool:
+        """Attach to the latest snapshot if its generation changed; returns True on change"""
+        generation = _read_pointer(self.directory)
+        if generation is None or generation == self.attached_generation:
+            return False
+        try:
+            snapshot = read_snapshot(os.path.join(self.directory, _snapshot_name(generation)))
+        except (FileNotFoundError, ValueError) as e:
+            # Pruned or replaced between reading the pointer and opening; retry next poll
+            self.last_error = f"{type(e).__name__}: {e}"
+            return False
+        snapshot_store.install(snapshot)
+        self.attached_generation = generation
+        self.attached_at = time.time()
+        self.last_error = None
+        self._attached.set()
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                self.poll()
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def wait_until_attached(self) -> None:
+        await self._attached.wait()
+
+    def status(self) -> Dict:
+        snapshot = snapshot_store.current
+        return {
+            "role": "follower",
+            "directory": self.directory,
+            "poll_interval_seconds": self.interval,
+            "attached_generation": self.attached_generation,
+            "attached_at": self.attached_at,
+            "last_error": self.last_error,
+            "snapshot_generation": snapshot.generation if snapshot else None,
+            "snapshot_age_seconds": time.time() - snapshot.created_at if snapshot else None,
+        }
+
+
+snapshot_follower = SnapshotFollower()
@@ -0,0 +1,161 @@
+"""Immutable forecast snapshots with atomic publication"""
+import threading
+import time
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Callable, Dict, List, Optional, Tuple
+from app.config import DEFAULT_SERIES
+from app.services.error_metrics import SeriesMetrics, build_series_metrics
+from app.services.instrumentation import SNAPSHOT_AGE, SNAPSHOT_GENERATION
+from app.services.model_registry import SeriesKey
+from app.services.response_cache import response_cache
+
+
+@dataclass(frozen=True)
+class SeriesFrames:
+    """Historical and forecast frames for one (product, area) series, plus their error metrics"""
+    historical: pd.DataFrame
+    forecast: pd.DataFrame
+    metrics: SeriesMetrics
+
+    @cached_property
+    def combined(self) -> pd.DataFrame:
+        """History followed by forecast, as served by /forecast (built once per snapshot)"""
+        return pd.concat([self.historical, self.forecast], ignore_index=True)
+
+    @cached_property
+    def dates(self) -> np.ndarray:
+        """Sorted datetime64[D] index of `combined`, for binary-searching date windows"""
+        return pd.to_datetime(self.combined['date']).to_numpy(dtype='datetime64[D]')
+
+    def window(self, start=None, end=None) -> Tuple[int, int]:
+        """
+        Row positions [lo, hi) of `combined` with start <= date <= end
+
+        Args:
+            start: First date to include (None for the beginning)
+            end: Last date to include (None for the end)
+        """
+        lo = 0 if start is None else int(np.searchsorted(self.dates, np.datetime64(start, 'D'), side='left'))
+        hi = len(self.dates) if end is None else int(np.searchsorted(self.dates, np.datetime64(end, 'D'), side='right'))
+        return lo, max(lo, hi)
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """
+    One consistent generation of served data
+
+    The frames must be treated as read-only once published; a refresh
+    builds new frames and publishes a new Snapshot rather than mutating.
+    """
+    series: Dict[SeriesKey, SeriesFrames]
+    generation: int
+    created_at: float
+
+    @property
+    def default_key(self) -> SeriesKey:
+        return DEFAULT_SERIES if DEFAULT_SERIES in self.series else next(iter(self.series))
+
+    @property
+    def historical(self) -> pd.DataFrame:
+        """Historical frame of the default series"""
+        return self.series[self.default_key].historical
+
+    @property
+    def forecast(self) -> pd.DataFrame:
+        """Forecast frame of the default series"""
+        return self.series[self.default_key].forecast
+
+
+class SnapshotStore:
+    """
+    Holds the current snapshot
+
+    Readers grab `current` once per request and use only that object, so a
+    refresh swapping in a new snapshot mid-request is never observed as a
+    half-updated state.
+    """
+
+    def __init__(self):
+        self._current: Optional[Snapshot] = None
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._subscribers: List[Callable[[Snapshot], None]] = []
+
+    @property
+    def current(self) -> Optional[Snapshot]:
+        return self._current
+
+    def publish(self, series: Dict[SeriesKey, Tuple[pd.DataFrame, pd.DataFrame]]) -> Snapshot:
+        """
+        Swap in a new snapshot and invalidate caches derived from the old one
+
+        Error metrics are computed here, extending each series' running
+        accumulators from the previous snapshot with the newly added weeks.
+
+        Args:
+            series: (product, area) -> (historical_df, forecast_df)
+
+        Returns:
+            The published snapshot
+        """
+        with self._lock:
+            previous = self._current.series if self._current else {}
+            frames = {}
+            for key, (historical, forecast) in series.items():
+                prev_metrics = previous[key].metrics if key in previous else None
+                frames[key] = SeriesFrames(historical, forecast, build_series_metrics(historical, prev_metrics))
+
+            snapshot = Snapshot(
+                series=frames,
+                generation=self._generation + 1,
+                created_at=time.time(),
+            )
+            self._install(snapshot)
+        self._notify(snapshot)
+        return snapshot
+
+    def install(self, snapshot: Snapshot) -> None:
+        """
+        Make an already-built snapshot current, keeping its generation
+
+        Used by workers attaching to snapshots built by another process, so
+        generations (and therefore ETags) agree across processes.
+        """
+        with self._lock:
+            self._install(snapshot)
+        self._notify(snapshot)
+
+    def _install(self, snapshot: Snapshot) -> None:
+        self._generation = snapshot.generation
+        self._current = snapshot
+        response_cache.invalidate(snapshot.generation)
+        SNAPSHOT_GENERATION.set(snapshot.generation)
+
+    def age(self) -> float:
+        """Seconds since the current snapshot was built (NaN before the first)"""
+        snapshot = self._current
+        return time.time() - snapshot.created_at if snapshot else float("nan")
+
+    def resume(self, generation: int) -> None:
+        """Number the next published snapshot after `generation` (e.g. after a leader restart)"""
+        with self._lock:
+            self._generation = max(self._generation, generation)
+
+    def subscribe(self, callback: Callable[[Snapshot], None]) -> None:
+        """Call `callback(snapshot)` after every publish or install"""
+        self._subscribers.append(callback)
+
+    def _notify(self, snapshot: Snapshot) -> None:
+        for callback in self._subscribers:
+            try:
+                callback(snapshot)
+            except Exception as e:
+                print(f"✗ Snapshot subscriber failed: {type(e).__name__}: {e}")
+
+
+snapshot_store = SnapshotStore()
+SNAPSHOT_AGE.set_function(snapshot_store.age)
@@ -0,0 +1,235 @@
+"""Server-sent events feed of snapshot updates"""
+import asyncio
+from collections import deque
+from typing import AsyncIterator, Deque, Dict, Optional
+import pandas as pd
+from app.config import STREAM_BACKLOG, STREAM_HEARTBEAT, STREAM_RETRY_MS
+from app.services.content_negotiation import JSON_MEDIA_TYPE, SERIALIZERS
+from app.services.instrumentation import STREAM_RESYNCS, STREAM_SUBSCRIBERS
+from app.services.model_registry import SeriesKey
+from app.services.snapshot import Snapshot, snapshot_store
+from app.utils import FORECAST_VALUE_COLUMNS, dataframe_to_forecast_columns
+
+KEEPALIVE = b": keepalive\n\n"
+
+_serialize = SERIALIZERS[JSON_MEDIA_TYPE]
+
+
+def sse_frame(event: str, event_id: int, payload: Dict) -> bytes:
+    """One server-sent event (the id lets a reconnecting client resume)"""
+    return b"id: %d\nevent: %s\ndata: %s\n\n" % (event_id, event.encode(), _serialize(payload))
+
+
+def forecast_delta(old: pd.DataFrame, new: pd.DataFrame) -> Dict:
+    """
+    Rows of `new` that are not in `old` with the same served values
+
+    Both frames are compared as served (rounded to cents), so refits that
+    move a prediction by less than a cent are not sent.
+
+    Returns:
+        {"start", "end", "upserts"}: the new frame's date range (rows
+        outside it are dropped by the client) and the changed or added
+        rows in the /forecast columns shape
+    """
+    new_cols = pd.DataFrame(dataframe_to_forecast_columns(new))
+    old_cols = pd.DataFrame(dataframe_to_forecast_columns(old))
+    merged = new_cols.merge(old_cols, on='date', how='left', suffixes=('', '_old'), indicator=True)
+
+    changed = (merged['_merge'] == 'left_only').to_numpy()
+    for name in FORECAST_VALUE_COLUMNS:
+        a, b = merged[name].astype(float), merged[f'{name}_old'].astype(float)
+        changed |= ~((a == b) | (a.isna() & b.isna())).to_numpy()
+
+    return {
+        'start': new_cols['date'].iloc[0] if len(new_cols) else None,
+        'end': new_cols['date'].iloc[-1] if len(new_cols) else None,
+        'upserts': dataframe_to_forecast_columns(new_cols[changed]),
+    }
+
+
+class _StreamEvent:
+    """One published snapshot; its per-series frames are built on first request"""
+
+    def __init__(self, seq: int, previous: Optional[Snapshot], snapshot: Snapshot):
+        self.seq = seq
+        self.previous = previous
+        self.snapshot = snapshot
+        self._frames: Dict[SeriesKey, Optional[bytes]] = {}
+
+    def frame(self, key: SeriesKey) -> Optional[bytes]:
+        """The delta event for a series (a resync event if it is new), None if it left"""
+        if key not in self._frames:
+            snapshot, previous = self.snapshot, self.previous
+            if key not in snapshot.series:
+                frame = None
+            elif previous is None or key not in previous.series:
+                frame = StreamBroadcaster.resync_frame(snapshot, key)
+            else:
+                frames = snapshot.series[key]
+                frame = sse_frame('delta', snapshot.generation, {
+                    'generation': snapshot.generation,
+                    'base_generation': previous.generation,
+                    'product': key[0],
+                    'area': key[1],
+                    **forecast_delta(previous.series[key].combined, frames.combined),
+                    'metrics': frames.metrics.summary,
+                })
+            self._frames[key] = frame
+        return self._frames[key]
+
+
+class StreamBroadcaster:
+    """
+    Fans snapshot updates out to every /stream client
+
+    Each publish appends one event to a single bounded backlog and wakes
+    all waiting clients at once; a series' delta is encoded once, on first
+    request, and the same bytes go to every client of that series. Clients
+    keep only a position in the backlog, so an idle connection costs a
+    suspended generator and nothing per publish.
+
+    Backpressure: a client that reads slowly is held back by its own TCP
+    send buffer, not by the broadcaster. If it falls more than
+    STREAM_BACKLOG events behind, the deltas it missed are gone and it is
+    sent a resync event instead, so memory stays bounded whatever the
+    clients do.
+
+    The stream never carries the whole series: a client starts from (and
+    after a resync returns to) the /forecast window it wants, which is
+    sliced and downsampled there, and applies deltas on top.
+    """
+
+    def __init__(self, backlog: int = STREAM_BACKLOG, heartbeat: float = STREAM_HEARTBEAT):
+        self.heartbeat = heartbeat
+        self.subscribers = 0
+        self._events: Deque[_StreamEvent] = deque(maxlen=backlog)
+        self._seq = 0
+        self._last: Optional[Snapshot] = None
+        self._resync_frames: Dict[SeriesKey, bytes] = {}
+        self._resync_generation: Optional[int] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Attach to the running event loop and the snapshot store (idempotent)"""
+        if self._loop is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._last = snapshot_store.current
+        snapshot_store.subscribe(self._on_snapshot)
+        self._heartbeat_task = asyncio.create_task(self._beat())
+
+    async def stop(self) -> None:
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            try:
+                await self._heartbeat_task
+            except asyncio.CancelledError:
+                pass
+            self._heartbeat_task = None
+
+    def _on_snapshot(self, snapshot: Snapshot) -> None:
+        # Snapshots may be published from a worker thread (e.g. the follower's poller)
+        try:
+            on_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            on_loop = False
+        if on_loop:
+            self._append(snapshot)
+        else:
+            self._loop.call_soon_threadsafe(self._append, snapshot)
+
+    def _append(self, snapshot: Snapshot) -> None:
+        if self._last is not None and snapshot.generation <= self._last.generation:
+            return
+        self._seq += 1
+        self._events.append(_StreamEvent(self._seq, self._last, snapshot))
+        self._last = snapshot
+        self._wake()
+
+    def _wake(self) -> None:
+        wakeup, self._wakeup = self._wakeup, asyncio.Event()
+        wakeup.set()
+
+    async def _beat(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat)
+            self._wake()
+
+    @staticmethod
+    def resync_frame(snapshot: Snapshot, key: SeriesKey) -> bytes:
+        """Generation and metrics only: the client refetches its /forecast window"""
+        return sse_frame('resync', snapshot.generation, {
+            'generation': snapshot.generation,
+            'product': key[0],
+            'area': key[1],
+            'metrics': snapshot.series[key].metrics.summary,
+        })
+
+    def _resync(self, key: SeriesKey) -> Optional[bytes]:
+        """Resync event for the latest snapshot, encoded once per generation"""
+        snapshot = self._last
+        if snapshot is None or key not in snapshot.series:
+            return None
+        if self._resync_generation != snapshot.generation:
+            self._resync_frames = {}
+            self._resync_generation = snapshot.generation
+        if key not in self._resync_frames:
+            self._resync_frames[key] = self.resync_frame(snapshot, key)
+        return self._resync_frames[key]
+
+    async def events(self, key: SeriesKey, last_generation: Optional[int] = None) -> AsyncIterator[bytes]:
+        """
+        Event stream for one client of a series
+
+        Starts with a resync event, or with only the deltas since
+        `last_generation` when a reconnecting client's Last-Event-ID is
+        still in the backlog (nothing if it is the latest); then one delta
+        per publish, and a keep-alive comment every `heartbeat` seconds
+        while idle.
+        """
+        self.start()
+        self.subscribers += 1
+        STREAM_SUBSCRIBERS.inc()
+        try:
+            yield b"retry: %d\n\n" % STREAM_RETRY_MS
+            position = self._seq
+            resume = [e for e in self._events if e.previous is not None and e.previous.generation == last_generation]
+            if resume:
+                position = resume[0].seq - 1
+            elif last_generation is None or self._last is None or last_generation != self._last.generation:
+                frame = self._resync(key)
+                if frame is not None:
+                    yield frame
+
+            while True:
+                if position == self._seq:
+                    await self._wakeup.wait()
+                    if position == self._seq:
+                        yield KEEPALIVE
+                        continue
+
+                if not self._events or self._events[0].seq > position + 1:
+                    # Fell behind the backlog: the missed deltas are gone
+                    STREAM_RESYNCS.inc()
+                    position = self._seq
+                    frame = self._resync(key)
+                    if frame is not None:
+                        yield frame
+                    continue
+
+                for event in list(self._events):
+                    if event.seq > position:
+                        position = event.seq
+                        frame = event.frame(key)
+                        if frame is not None:
+                            yield frame
+        finally:
+            self.subscribers -= 1
+            STREAM_SUBSCRIBERS.dec()
+
+
+stream_broadcaster = StreamBroadcaster()
@@ -0,0 +1,52 @@
+"""Background warm-up status"""
+import time
+from typing import Dict, Optional
+
+
+class WarmupStatus:
+    """Tracks the background model loading and data generation run"""
+
+    def __init__(self):
+        self.started_at: Optional[float] = None
+        self.completed_at: Optional[float] = None
+        self.error: Optional[str] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.completed_at is not None
+
+    def start(self) -> None:
+        self.started_at = time.time()
+        self.completed_at = None
+        self.error = None
+
+    def complete(self) -> None:
+        self.completed_at = time.time()
+        self.error = None
+        print(f"✓ Warm-up finished in {self.completed_at - self.started_at:.2f}s")
+
+    def published(self, snapshot) -> None:
+        """Snapshot store subscriber: the first published snapshot completes warm-up"""
+        if not self.ready and self.started_at is not None:
+            self.complete()
+
+    def fail(self, error: Exception) -> None:
+        self.error = f"{type(error).__name__}: {error}"
+        print(f"✗ Warm-up attempt failed: {self.error}")
+
+    def as_dict(self) -> Dict:
+        if self.ready:
+            status = "ready"
+        elif self.error:
+            status = "retrying"  # the last attempt failed; warm-up keeps retrying
+        else:
+            status = "warming_up"
+        return {
+            "status": status,
+            "started_at": self.started_at,
+            "completed_at": self.completed_at,
+            "error": self.error,
+        }
+
+
+warmup = WarmupStatus()
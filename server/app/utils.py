@@ -1,21 +1,81 @@
 """Utilities"""
 import pandas as pd
 import numpy as np
-from typing import List, Dict
+from typing import List, Dict, Optional
 
+FORECAST_VALUE_COLUMNS = ('actual', 'sarima', 'xgboost')
+# Forecast frame columns holding per-feature SHAP contributions (shap_bias is the base value)
+SHAP_PREFIX = 'shap_'
 
-def calculate_rmse(actual: pd.Series, predicted: pd.Series) -> float:
-    errors = actual - predicted
-    return float(np.sqrt(np.mean(errors ** 2)))
+
+def _date_column(df: pd.DataFrame) -> List[str]:
+    dates = df['date']
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        dates = dates.dt.strftime('%Y-%m-%d')
+    return dates.astype(str).tolist()
+
+
+def _rounded_column(values: pd.Series, decimals: int = 2) -> List[Optional[float]]:
+    """Round a whole column at once, mapping NaN/None to None"""
+    arr = values.to_numpy(dtype=np.float64, na_value=np.nan)
+    out = np.round(arr, decimals).tolist()
+    for i in np.flatnonzero(np.isnan(arr)):
+        out[i] = None
+    return out
+
+
+def dataframe_to_forecast_columns(df: pd.DataFrame) -> Dict[str, List]:
+    """
+    Serialize a forecast frame column-wise
+
+    Returns:
+        {"date": [...], "actual": [...], "sarima": [...], "xgboost": [...]}
+        with values rounded to cents and missing values as None
+    """
+    columns = {'date': _date_column(df)}
+    for name in FORECAST_VALUE_COLUMNS:
+        columns[name] = _rounded_column(df[name])
+    return columns
 
 
 def dataframe_to_forecast_list(df: pd.DataFrame) -> List[Dict]:
-    result = []
-    for _, row in df.iterrows():
-        result.append({
-            "date": row['date'],
-            "actual": None if pd.isna(row['actual']) else round(float(row['actual']), 2),
-            "sarima": None if pd.isna(row['sarima']) else round(float(row['sarima']), 2),
-            "xgboost": None if pd.isna(row['xgboost']) else round(float(row['xgboost']), 2)
-        })
-    return result
+    columns = dataframe_to_forecast_columns(df)
+    return [
+        {"date": d, "actual": a, "sarima": s, "xgboost": x}
+        for d, a, s, x in zip(*(columns[k] for k in ('date',) + FORECAST_VALUE_COLUMNS))
+    ]
+
+
+def dataframe_to_forecast_arrays(df: pd.DataFrame) -> Dict:
+    """
+    Serialize a forecast frame as packed little-endian arrays (for MessagePack)
+
+    Returns:
+        {"rows": n, "date": int32 days since 1970-01-01, "actual"/"sarima"/
+        "xgboost": float32 rounded to cents, NaN for missing}, each array as raw
+        bytes that decode with numpy.frombuffer
+    """
+    days = pd.to_datetime(df['date']).to_numpy(dtype='datetime64[D]').astype('<i4')
+    arrays = {'rows': len(df), 'date': days.tobytes()}
+    for name in FORECAST_VALUE_COLUMNS:
+        values = np.round(df[name].to_numpy(dtype=np.float64, na_value=np.nan), 2)
+        arrays[name] = values.astype('<f4').tobytes()
+    return arrays
+
+
+def dataframe_to_forecast_explanation(df: pd.DataFrame) -> Dict:
+    """
+    Serialize the SHAP columns of a forecast frame
+
+    Returns:
+        {"date", "xgboost", "base_value", "contributions": {feature: [...]}}
+        with contributions rounded to 4 decimals
+    """
+    bias = f'{SHAP_PREFIX}bias'
+    features = [c for c in df.columns if c.startswith(SHAP_PREFIX) and c != bias]
+    return {
+        'date': _date_column(df),
+        'xgboost': _rounded_column(df['xgboost'], 4),
+        'base_value': _rounded_column(df[bias], 4),
+        'contributions': {c[len(SHAP_PREFIX):]: _rounded_column(df[c], 4) for c in features},
+    }
@@ -0,0 +1,111 @@
+"""Local stand-in for the EIA v2 price API so benchmarks run offline"""
+import itertools
+import json
+import threading
+import zlib
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+_ROUTES = {
+    "/v2/petroleum/pri/gnd/data/": "weekly",
+    "/v2/petroleum/pri/spt/data/": "daily",
+}
+
+
+def _series(frequency: str, facets: Tuple[str, ...], years: int, end: date) -> List[Dict]:
+    """Deterministic random-walk prices for one facet combination, newest first"""
+    rng = np.random.default_rng(zlib.crc32("/".join(facets).encode()))
+    if frequency == "weekly":
+        end = end - timedelta(days=end.weekday())  # EIA weekly prices are dated Mondays
+        periods = [end - timedelta(weeks=i) for i in range(years * 52)]
+        values = np.round(3.0 + rng.normal(0, 0.02, len(periods)).cumsum(), 3)
+    else:
+        days = (end - timedelta(days=i) for i in range(years * 365))
+        periods = [d for d in days if d.weekday() < 5]
+        values = np.round(70 + rng.normal(0, 1, len(periods)).cumsum() * 0.5, 2)
+    return [{"period": p.isoformat(), "value": float(v)} for p, v in zip(periods, values)]
+
+
+class FakeEIAServer:
+    """
+    Threaded HTTP server answering the two EIA endpoints the loader uses
+
+    Supports the query features the loader relies on: repeated facet
+    parameters (cross product of values), period-descending order, `start`
+    and `offset`/`length` paging with a reported total.
+
+    Usage:
+        with FakeEIAServer() as eia:
+            os.environ["EIA_API_URL"] = eia.api_url
+    """
+
+    def __init__(self, years: int = 30, end: date = date(2024, 12, 30), page_size: int = 5000):
+        self.years = years
+        self.end = end
+        self.page_size = page_size
+        self.requests = 0
+        self._series: Dict[Tuple, List[Dict]] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def api_url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/v2"
+
+    def __enter__(self) -> "FakeEIAServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _records(self, frequency: str, facets: Dict[str, List[str]], start: str) -> List[Dict]:
+        names = list(facets)
+        records = []
+        for combo in itertools.product(*facets.values()):
+            with self._lock:
+                key = (frequency, combo)
+                if key not in self._series:
+                    self._series[key] = _series(frequency, combo, self.years, self.end)
+                series = self._series[key]
+            records.extend({**r, **dict(zip(names, combo))} for r in series if r["period"] >= start)
+        records.sort(key=lambda r: r["period"], reverse=True)
+        return records
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                frequency = _ROUTES.get(url.path)
+                if frequency is None:
+                    self.send_error(404)
+                    return
+                query = parse_qs(url.query)
+                facets = {k[len("facets["):-len("][]")]: v for k, v in query.items() if k.startswith("facets[")}
+                records = fake._records(frequency, facets, query.get("start", [""])[0])
+                offset = int(query.get("offset", ["0"])[0])
+                length = min(int(query.get("length", [str(fake.page_size)])[0]), fake.page_size)
+                body = json.dumps({
+                    "response": {"total": str(len(records)), "data": records[offset:offset + length]}
+                }).encode()
+                with fake._lock:
+                    fake.requests += 1
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
@@ -0,0 +1,52 @@
+"""Small synthetic models so benchmarks run offline"""
+import os
+import pickle
+import shutil
+import warnings
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from app.config import MODEL_PATH, SARIMAX_EXPORT_DIR, SARIMAX_MODEL_PATH, XGBOOST_NATIVE_PATH
+from app.services.features import FeaturePipeline
+
+
+def fit_synthetic_models(weeks: int = 260, seed: int = 0):
+    """Fit small XGBoost and SARIMAX models on a synthetic weekly series"""
+    import xgboost as xgb
+    from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(end="2024-12-30", periods=weeks, freq="W-MON")
+    crude = 70 + rng.normal(0, 1.5, weeks).cumsum()
+    gas = 2.4 + 0.02 * crude + rng.normal(0, 0.05, weeks)
+
+    pipeline = FeaturePipeline.from_history(dates, gas, crude)
+    valid = pipeline.valid
+    xgb_model = xgb.XGBRegressor(n_estimators=100, max_depth=4).fit(pipeline.frame()[valid], gas[valid])
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        sarimax_model = SARIMAX(
+            pd.Series(gas), exog=pd.DataFrame({'close': crude}), order=(1, 1, 1)
+        ).fit(disp=False)
+
+    return dates, gas, crude, xgb_model, sarimax_model
+
+
+def save_synthetic_models(root: str, xgb_model, sarimax_model) -> None:
+    """
+    Write models under a server root as the joblib/pickle artifacts
+
+    Any native exports there are removed so the server loads these models.
+    """
+    for export in (XGBOOST_NATIVE_PATH, SARIMAX_EXPORT_DIR):
+        path = os.path.join(root, export)
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        elif os.path.exists(path):
+            os.unlink(path)
+    joblib.dump(xgb_model, os.path.join(root, MODEL_PATH))
+    with open(os.path.join(root, SARIMAX_MODEL_PATH), "wb") as f:
+        pickle.dump(sarimax_model, f)
@@ -0,0 +1,90 @@
+"""
+Measure cold-start time to first byte of a fresh uvicorn process
+
+Starts `uvicorn main:app` in a subprocess and polls it, recording when
+/healthz first answers (process bound and serving), when /readyz turns 200
+and when /forecast first returns data.
+
+Run from the server directory:
+    python -m benchmarks.bench_cold_start [--runs 3] [--port 8765]
+
+Set EIA_OFFLINE=1 and/or EIA_CACHE_PATH to control the data source.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, Optional
+
+import httpx
+
+
+def _wait_for(client: httpx.Client, url: str, status: int, deadline: float) -> Optional[float]:
+    while time.perf_counter() < deadline:
+        try:
+            if client.get(url).status_code == status:
+                return time.perf_counter()
+        except httpx.TransportError:
+            pass
+        time.sleep(0.01)
+    return None
+
+
+def measure(
+    port: int,
+    timeout: float,
+    cwd: Optional[str] = None,
+    env: Optional[Dict[str, str]] = None
+) -> Dict[str, Optional[float]]:
+    base = f"http://127.0.0.1:{port}"
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=cwd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        env=os.environ.copy() if env is None else env,
+    )
+    try:
+        deadline = start + timeout
+        with httpx.Client(timeout=5) as client:
+            first_byte = _wait_for(client, f"{base}/healthz", 200, deadline)
+            first_503 = client.get(f"{base}/forecast").status_code if first_byte else None
+            ready = _wait_for(client, f"{base}/readyz", 200, deadline)
+            data = _wait_for(client, f"{base}/forecast", 200, deadline)
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    def since_start(t):
+        return None if t is None else t - start
+
+    return {
+        "healthz_ttfb": since_start(first_byte),
+        "forecast_status_at_bind": first_503,
+        "ready": since_start(ready),
+        "forecast_ttfb": since_start(data),
+    }
+
+
+def _fmt(value: Optional[float]) -> str:
+    return "timeout" if value is None else f"{value:.3f}s"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=120)
+    args = parser.parse_args()
+
+    print(f"{'run':>4}{'healthz TTFB':>14}{'/forecast@bind':>16}{'ready':>9}{'forecast TTFB':>15}")
+    for run in range(args.runs):
+        r = measure(args.port, args.timeout)
+        print(f"{run + 1:>4}{_fmt(r['healthz_ttfb']):>14}{str(r['forecast_status_at_bind']):>16}"
+              f"{_fmt(r['ready']):>9}{_fmt(r['forecast_ttfb']):>15}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Payload size and latency of each /forecast response encoding
+
+For JSON and MessagePack, each uncompressed, gzip and br: body size, the
+first (building/compressing) request, and p50/p99 of the cached requests
+after it. The last column is what compressing that body on every request
+would add instead. Bodies under COMPRESSION_MIN_BYTES are never compressed.
+
+Run from the server directory:
+    python -m benchmarks.bench_encodings [--requests 2000] [--weeks 1500]
+"""
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+import main
+from app import config
+from app.services import data_generator
+from app.services.content_negotiation import JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, compress
+from app.services.snapshot import snapshot_store
+from benchmarks._asgi import asgi_request
+
+VARIANTS = [
+    (JSON_MEDIA_TYPE, None),
+    (JSON_MEDIA_TYPE, "gzip"),
+    (JSON_MEDIA_TYPE, "br"),
+    (MSGPACK_MEDIA_TYPE, None),
+    (MSGPACK_MEDIA_TYPE, "gzip"),
+    (MSGPACK_MEDIA_TYPE, "br"),
+]
+
+
+async def run(path: str, n: int) -> None:
+    print(f"{'media type':<22}{'coding':<8}{'bytes':>10}{'first ms':>10}{'p50 us':>10}{'p99 us':>10}{'compress ms':>13}")
+    for media_type, coding in VARIANTS:
+        headers = {"Accept": media_type, "Accept-Encoding": coding or "identity"}
+        start = time.perf_counter()
+        status, response_headers, body = await asgi_request(main.app, path, headers=headers)
+        first = time.perf_counter() - start
+        assert status == 200, status
+        coding = response_headers.get("content-encoding")  # None if the body is below COMPRESSION_MIN_BYTES
+
+        latencies = np.empty(n)
+        for i in range(n):
+            start = time.perf_counter()
+            await asgi_request(main.app, path, headers=headers)
+            latencies[i] = time.perf_counter() - start
+
+        per_request = ""
+        if coding is not None:
+            _, _, raw = await asgi_request(main.app, path, headers={"Accept": media_type})
+            start = time.perf_counter()
+            compress(raw, coding)
+            per_request = f"{(time.perf_counter() - start) * 1000:.2f}"
+        p50, p99 = np.percentile(latencies, [50, 99]) * 1e6
+        print(f"{media_type:<22}{coding or '-':<8}{len(body):>10,}{first * 1000:>10.2f}{p50:>10.0f}{p99:>10.0f}{per_request:>13}")
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--weeks", type=int, default=1500)
+    parser.add_argument("--path", default="/forecast")
+    args = parser.parse_args()
+
+    data_generator.HISTORICAL_WEEKS = args.weeks
+    snapshot = snapshot_store.publish({config.DEFAULT_SERIES: data_generator._generate_fallback_data()})
+    print(f"{args.path}: {len(snapshot.historical) + len(snapshot.forecast)} points, {args.requests} requests per variant")
+    asyncio.run(run(args.path, args.requests))
+
+
+if __name__ == "__main__":
+    main_cli()
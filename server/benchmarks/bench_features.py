@@ -0,0 +1,92 @@
+"""
+Compare the FeaturePipeline with the previous pandas feature construction
+
+1. Full history: the DataFrame built in generate_data (.dt accessors and
+   shift()) vs FeaturePipeline.from_history.
+2. Incremental: adding one week by rebuilding the DataFrame vs
+   FeaturePipeline.append.
+
+Both paths are checked to produce identical feature values.
+
+Run from the server directory:
+    python -m benchmarks.bench_features [--weeks 15000] [--appends 200]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.services.features import XGBOOST_FEATURES, FeaturePipeline
+
+
+def legacy_features(dates: pd.Series, gas: pd.Series, crude: pd.Series) -> pd.DataFrame:
+    """Feature frame as previously built inline in generate_data"""
+    return pd.DataFrame({
+        'close': crude,
+        'dayofyear': dates.dt.dayofyear,
+        'month': dates.dt.month,
+        'year': dates.dt.year,
+        'gas_price_lag1': gas.shift(1),
+        'crude_price_lag4': crude.shift(4),
+    })
+
+
+def make_series(weeks: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    dates = pd.Series(pd.date_range("1750-01-05", periods=weeks, freq="W-MON"))
+    crude = pd.Series(70 + rng.normal(0, 1.5, weeks).cumsum())
+    gas = pd.Series(2.4 + 0.02 * crude + rng.normal(0, 0.05, weeks))
+    return dates, gas, crude
+
+
+def timed(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--weeks", type=int, default=15000)
+    parser.add_argument("--appends", type=int, default=200)
+    args = parser.parse_args()
+
+    dates, gas, crude = make_series(args.weeks + args.appends)
+    base = slice(0, args.weeks)
+
+    legacy = legacy_features(dates[base], gas[base], crude[base]).to_numpy(dtype=np.float64)
+    pipeline = FeaturePipeline.from_history(dates[base], gas[base].values, crude[base].values)
+    np.testing.assert_array_equal(legacy, pipeline.features)
+
+    t_legacy = timed(lambda: legacy_features(dates[base], gas[base], crude[base]).to_numpy(dtype=np.float64))
+    t_pipeline = timed(lambda: FeaturePipeline.from_history(dates[base], gas[base].values, crude[base].values))
+    print(f"history ({args.weeks:,} weeks): pandas {t_legacy * 1000:8.2f} ms   pipeline {t_pipeline * 1000:8.2f} ms"
+          f"   ({t_legacy / t_pipeline:.1f}x)")
+
+    new_dates = dates.values[args.weeks:]
+    start = time.perf_counter()
+    for i in range(args.appends):
+        end = args.weeks + i + 1
+        legacy_row = legacy_features(dates[:end], gas[:end], crude[:end]).to_numpy(dtype=np.float64)[-1]
+    t_legacy = (time.perf_counter() - start) / args.appends
+
+    start = time.perf_counter()
+    for i in range(args.appends):
+        j = args.weeks + i
+        row = pipeline.append(new_dates[i], crude.values[j], gas.values[j])
+    t_pipeline = (time.perf_counter() - start) / args.appends
+
+    np.testing.assert_array_equal(legacy_row, row[0])
+    np.testing.assert_array_equal(
+        legacy_features(dates, gas, crude)[XGBOOST_FEATURES].to_numpy(dtype=np.float64), pipeline.features
+    )
+    print(f"append one week (x{args.appends}): pandas rebuild {t_legacy * 1e6:10.1f} us   "
+          f"pipeline {t_pipeline * 1e6:8.1f} us   ({t_legacy / t_pipeline:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark /forecast throughput with and without the response cache
+
+Run from the server directory:
+    python -m benchmarks.bench_forecast_cache [--requests 2000] [--weeks 52]
+"""
+import argparse
+import asyncio
+import time
+from typing import List
+
+import pandas as pd
+from fastapi import FastAPI
+
+import main
+from app import config
+from app.models import ForecastDataPoint
+from app.services import data_generator
+from app.services.snapshot import snapshot_store
+from app.utils import dataframe_to_forecast_list
+from benchmarks._asgi import asgi_request
+
+
+def _legacy_app() -> FastAPI:
+    """The original uncached endpoint: concat + iterrows + Pydantic on every call"""
+    legacy = FastAPI()
+
+    @legacy.get("/forecast", response_model=List[ForecastDataPoint])
+    async def get_forecast():
+        snapshot = snapshot_store.current
+        combined_df = pd.concat([snapshot.historical, snapshot.forecast], ignore_index=True)
+        return dataframe_to_forecast_list(combined_df)
+
+    return legacy
+
+
+async def _measure(app, n: int, headers=None) -> float:
+    status, _, _ = await asgi_request(app, "/forecast", headers=headers)
+    assert status in (200, 304), status
+    start = time.perf_counter()
+    for _ in range(n):
+        await asgi_request(app, "/forecast", headers=headers)
+    return n / (time.perf_counter() - start)
+
+
+async def run(n: int) -> None:
+    legacy_rps = await _measure(_legacy_app(), n)
+    cached_rps = await _measure(main.app, n)
+    _, headers, _ = await asgi_request(main.app, "/forecast")
+    revalidate_rps = await _measure(main.app, n, {"If-None-Match": headers["etag"]})
+
+    print(f"{'variant':<24}{'req/s':>12}{'speedup':>10}")
+    for name, rps in [
+        ("uncached (before)", legacy_rps),
+        ("cached 200", cached_rps),
+        ("cached 304", revalidate_rps),
+    ]:
+        print(f"{name:<24}{rps:>12.0f}{rps / legacy_rps:>9.1f}x")
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--weeks", type=int, default=config.HISTORICAL_WEEKS)
+    args = parser.parse_args()
+
+    data_generator.HISTORICAL_WEEKS = args.weeks
+    snapshot = snapshot_store.publish({config.DEFAULT_SERIES: data_generator._generate_fallback_data()})
+    print(f"{len(snapshot.historical) + len(snapshot.forecast)} points per response, {args.requests} requests")
+    asyncio.run(run(args.requests))
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,121 @@
+"""
+Measure cold import time of the API module and enforce a budget
+
+Runs `python -X importtime -c "import main"` in fresh processes and reports
+the median total, the slowest modules (self time) and the time per
+top-level package. The check fails (exit status 1) if the median exceeds
+the budget or if any module that should load lazily at first use was
+imported anyway:
+
+- httpx: imported by EIADataLoader on the first fetch
+- joblib, xgboost, statsmodels (and scipy, which it pulls in): imported by
+  ModelService / model_export when models are loaded
+
+Run from the server directory:
+    python -m benchmarks.bench_import_time [--runs 5] [--budget-ms 1500]
+"""
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from app.config import SERVER_ROOT
+
+LAZY_MODULES = ("httpx", "joblib", "xgboost", "statsmodels", "scipy", "requests")
+DEFAULT_BUDGET_MS = 1500.0
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def import_profile(module: str = "main", cwd: Optional[str] = None) -> List[Tuple[str, int, int, int]]:
+    """
+    Import `module` in a fresh interpreter under -X importtime
+
+    Args:
+        module: Module to import
+        cwd: Working directory (defaults to the server root)
+
+    Returns:
+        One (name, self_us, cumulative_us, depth) per imported module, in
+        the order the interpreter reports them (children before parents)
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd or SERVER_ROOT, capture_output=True, text=True, check=True,
+    )
+    profile = []
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            profile.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return profile
+
+
+def summarize(profile: List[Tuple[str, int, int, int]], module: str = "main") -> Dict:
+    """Total, per-package and per-module times (ms) and any lazy modules imported eagerly"""
+    total = next(cum for name, _, cum, depth in profile if name == module and depth == 0)
+    packages: Dict[str, int] = defaultdict(int)
+    for name, self_us, _, _ in profile:
+        packages[name.split(".")[0]] += self_us
+    names = {name.split(".")[0] for name, _, _, _ in profile}
+    return {
+        "total_ms": total / 1000,
+        "modules": len(profile),
+        "packages_ms": {k: v / 1000 for k, v in sorted(packages.items(), key=lambda kv: -kv[1])},
+        "slowest_ms": {name: s / 1000 for name, s, _, _ in sorted(profile, key=lambda p: -p[1])[:15]},
+        "eager": [m for m in LAZY_MODULES if m in names],
+    }
+
+
+def measure(runs: int, cwd: Optional[str] = None) -> Dict:
+    """Median total over `runs` fresh processes, with the last run's breakdown"""
+    import_profile(cwd=cwd)  # warm the bytecode cache so runs compare like with like
+    summaries = [summarize(import_profile(cwd=cwd)) for _ in range(runs)]
+    totals = [s["total_ms"] for s in summaries]
+    return {
+        **summaries[-1],
+        "total_ms": statistics.median(totals),
+        "min_ms": min(totals),
+        "max_ms": max(totals),
+        "runs": runs,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=10, help="packages/modules to list")
+    args = parser.parse_args()
+
+    result = measure(args.runs)
+
+    print(f"import main: median {result['total_ms']:.0f} ms "
+          f"(min {result['min_ms']:.0f}, max {result['max_ms']:.0f}) over {args.runs} runs, "
+          f"{result['modules']} modules")
+    print(f"\n{'package':<32}{'self ms':>10}")
+    for name, ms in list(result["packages_ms"].items())[:args.top]:
+        print(f"{name:<32}{ms:>10.1f}")
+    print(f"\n{'module':<48}{'self ms':>10}")
+    for name, ms in list(result["slowest_ms"].items())[:args.top]:
+        print(f"{name:<48}{ms:>10.1f}")
+    print()
+
+    failed = False
+    if result["eager"]:
+        print(f"✗ Imported at startup but should load lazily: {', '.join(result['eager'])}")
+        failed = True
+    if result["total_ms"] > args.budget_ms:
+        print(f"✗ Import time {result['total_ms']:.0f} ms exceeds budget of {args.budget_ms:.0f} ms")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print(f"✓ Import time {result['total_ms']:.0f} ms within budget of {args.budget_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Compare model load time and memory for legacy vs exported artifacts
+
+Fits synthetic models, writes them both as the legacy joblib/pickle files
+and via app.services.model_export, then loads each variant in a fresh
+interpreter (libraries imported up front so only the artifact load is
+timed) and reports wall time and the RSS added by the load.
+
+Run from the server directory:
+    python -m benchmarks.bench_model_load [--weeks 1500] [--runs 3]
+"""
+import argparse
+import json
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+
+import joblib
+
+from app.config import MODEL_PATH, SARIMAX_EXPORT_DIR, SARIMAX_MODEL_PATH, XGBOOST_NATIVE_PATH
+from app.services.model_export import export_sarimax, export_xgboost
+from benchmarks._models import fit_synthetic_models
+
+_CHILD = """
+import json, sys, time
+import joblib, pickle, xgboost, statsmodels.tsa.statespace.sarimax
+from app.services.model_service import ModelService
+
+def rss_kb():
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1])
+
+service = ModelService(model_dir=sys.argv[1])
+result = {}
+for name, load in [('xgboost', service.load_xgboost_model), ('sarimax', service.load_sarimax_model)]:
+    before = rss_kb()
+    start = time.perf_counter()
+    load()
+    result[name] = {'seconds': time.perf_counter() - start, 'rss_kb': rss_kb() - before}
+print(json.dumps(result))
+"""
+
+
+def _artifact_size(path: str) -> int:
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+    return os.path.getsize(path)
+
+
+def _measure(model_dir: str) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD, model_dir],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--weeks", type=int, default=1500, help="length of the synthetic training series")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    _, _, _, xgb_model, sarimax_model = fit_synthetic_models(weeks=args.weeks)
+
+    with tempfile.TemporaryDirectory() as root:
+        legacy = os.path.join(root, "legacy")
+        exported = os.path.join(root, "exported")
+        os.makedirs(legacy)
+        os.makedirs(exported)
+
+        joblib.dump(xgb_model, os.path.join(legacy, MODEL_PATH))
+        with open(os.path.join(legacy, SARIMAX_MODEL_PATH), 'wb') as f:
+            pickle.dump(sarimax_model, f)
+        export_xgboost(xgb_model, os.path.join(exported, XGBOOST_NATIVE_PATH))
+        export_sarimax(sarimax_model, os.path.join(exported, SARIMAX_EXPORT_DIR))
+
+        sizes = {
+            "legacy": {
+                "xgboost": _artifact_size(os.path.join(legacy, MODEL_PATH)),
+                "sarimax": _artifact_size(os.path.join(legacy, SARIMAX_MODEL_PATH)),
+            },
+            "exported": {
+                "xgboost": _artifact_size(os.path.join(exported, XGBOOST_NATIVE_PATH)),
+                "sarimax": _artifact_size(os.path.join(exported, SARIMAX_EXPORT_DIR)),
+            },
+        }
+
+        print(f"{'variant':<10}{'model':<10}{'bytes':>12}{'load ms':>10}{'+RSS MB':>10}")
+        for variant, directory in [("legacy", legacy), ("exported", exported)]:
+            runs = [_measure(directory) for _ in range(args.runs)]
+            for model in ("xgboost", "sarimax"):
+                seconds = min(r[model]["seconds"] for r in runs)
+                rss = min(r[model]["rss_kb"] for r in runs) / 1024
+                print(f"{variant:<10}{model:<10}{sizes[variant][model]:>12,}{seconds * 1000:>10.1f}{rss:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark incremental SARIMAX history updates against full re-filtering
+
+Simulates weekly refreshes over a multi-decade series: each refresh adds
+one week and needs one-step-ahead predictions for the whole history.
+
+- full: filter the whole series again with the fitted parameters (`apply`),
+  which is what a refresh cost before the state was kept
+- incremental: ModelService.sarimax_history, which extends the kept state
+  by the new week and reuses earlier predictions
+
+Run from the server directory:
+    python -m benchmarks.bench_sarimax_update [--years 30] [--refreshes 52]
+"""
+import argparse
+import statistics
+import time
+import warnings
+
+import numpy as np
+
+from app.services.model_service import ModelService
+from benchmarks._models import fit_synthetic_models
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--years", type=int, default=30)
+    parser.add_argument("--refreshes", type=int, default=52, help="weekly refreshes to simulate")
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    weeks = args.years * 52
+    dates, gas, crude, _, sarimax_model = fit_synthetic_models(weeks=weeks + args.refreshes)
+    service = ModelService()
+    service.sarimax_model = sarimax_model
+
+    start = time.perf_counter()
+    service.sarimax_history(dates[:weeks], gas[:weeks], crude[:weeks])
+    initial = time.perf_counter() - start
+
+    full_times, incremental_times, max_diff = [], [], 0.0
+    for end in range(weeks + 1, weeks + args.refreshes + 1):
+        start = time.perf_counter()
+        full = np.asarray(sarimax_model.apply(gas[:end], exog=crude[:end, None]).fittedvalues)
+        full_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        incremental = service.sarimax_history(dates[:end], gas[:end], crude[:end])
+        incremental_times.append(time.perf_counter() - start)
+
+        max_diff = max(max_diff, float(np.abs(full - incremental).max()))
+
+    full_ms = statistics.median(full_times) * 1000
+    incremental_ms = statistics.median(incremental_times) * 1000
+    print(f"{weeks:,} weeks of history, {args.refreshes} weekly refreshes (initial filter {initial * 1000:.1f} ms)")
+    print(f"{'full re-filter':<20}{full_ms:>10.2f} ms/refresh")
+    print(f"{'incremental':<20}{incremental_ms:>10.2f} ms/refresh")
+    print(f"speedup {full_ms / incremental_ms:.1f}x, max |full - incremental| = {max_diff:.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Benchmark Monte Carlo scenario throughput (scenarios per second)
+
+Uses small synthetic XGBoost/SARIMAX models so it runs offline.
+
+Run from the server directory:
+    python -m benchmarks.bench_scenarios [--scenarios 1000 10000 50000] [--workers 0 2 4]
+"""
+import argparse
+import time
+from datetime import timedelta
+
+from app.services.model_service import model_service
+from app.services.scenario_engine import scenario_engine
+from benchmarks._models import fit_synthetic_models
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scenarios", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 2, 4])
+    parser.add_argument("--steps", type=int, default=12)
+    args = parser.parse_args()
+
+    dates, gas, crude, model_service.xgboost_model, model_service.sarimax_model = fit_synthetic_models()
+    forecast_dates = [dates[-1] + timedelta(weeks=i + 1) for i in range(args.steps)]
+
+    print(f"{'scenarios':>10}{'workers':>9}{'seconds':>10}{'scenarios/s':>14}")
+    for n in args.scenarios:
+        for workers in args.workers:
+            start = time.perf_counter()
+            scenario_engine.run(gas, crude, forecast_dates, n=n, seed=0, workers=workers)
+            elapsed = time.perf_counter() - start
+            print(f"{n:>10}{workers:>9}{elapsed:>10.3f}{n / elapsed:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Load test for the /stream server-sent events feed with many idle subscribers
+
+Serves the app with uvicorn on a background thread (lifespan off, so no
+models or EIA data are needed) from synthetic snapshots, connects
+--subscribers streaming clients, then publishes --updates new snapshots
+(each one new week) and measures how long every client takes to receive
+each delta.
+
+Reports connect time for all clients, per-update fan-out latency
+percentiles across clients, delta size, and the process CPU time spent
+while all clients sit idle.
+
+Run from the server directory:
+    python -m benchmarks.bench_stream [--subscribers 2000] [--updates 5]
+"""
+import argparse
+import asyncio
+import socket
+import threading
+import time
+import warnings
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+import httpx
+import numpy as np
+import pandas as pd
+import uvicorn
+
+from app.config import DEFAULT_SERIES, FORECAST_WEEKS, HISTORICAL_WEEKS
+from app.services.snapshot import snapshot_store
+from app.services.stream import stream_broadcaster
+import main as api
+
+
+def make_frames(prices: np.ndarray, end: int, weeks: int = HISTORICAL_WEEKS) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Historical window ending at week `end` of a price path, plus a flat-ish forecast"""
+    dates = pd.date_range("2000-01-03", periods=len(prices) + FORECAST_WEEKS, freq="W-MON")
+    window = slice(end - weeks, end)
+    actual = prices[window]
+    historical = pd.DataFrame({
+        'date': dates[window].strftime('%Y-%m-%d'),
+        'actual': actual,
+        'sarima': actual + 0.02,
+        'xgboost': actual - 0.01,
+    })
+    forecast = pd.DataFrame({
+        'date': dates[end:end + FORECAST_WEEKS].strftime('%Y-%m-%d'),
+        'actual': [None] * FORECAST_WEEKS,
+        'sarima': actual[-1] + 0.01 * np.arange(1, FORECAST_WEEKS + 1),
+        'xgboost': actual[-1] - 0.01 * np.arange(1, FORECAST_WEEKS + 1),
+    })
+    return historical, forecast
+
+
+class Subscribers:
+    """Streaming clients recording when each event id arrives"""
+
+    def __init__(self, url: str, count: int):
+        self.url = url
+        self.count = count
+        self.received: Dict[int, List[float]] = defaultdict(list)
+        self.delta_bytes = 0
+
+    async def _subscribe(self, client: httpx.AsyncClient) -> None:
+        async with client.stream("GET", self.url) as response:
+            event_id = None
+            async for line in response.aiter_lines():
+                if line.startswith("id: "):
+                    event_id = int(line[4:])
+                elif line.startswith("data: ") and event_id is not None:
+                    self.received[event_id].append(time.perf_counter())
+                    self.delta_bytes = len(line)
+
+    async def wait_for(self, event_id: int, timeout: float) -> None:
+        deadline = time.perf_counter() + timeout
+        while len(self.received[event_id]) < self.count:
+            if time.perf_counter() > deadline:
+                raise TimeoutError(f"{len(self.received[event_id])}/{self.count} clients got event {event_id}")
+            await asyncio.sleep(0.005)
+
+
+async def run(port: int, subscribers: int, updates: int, idle: float, timeout: float) -> None:
+    prices = 3.0 + np.random.default_rng(0).normal(0, 0.03, HISTORICAL_WEEKS + updates + 1).cumsum()
+    end = HISTORICAL_WEEKS
+    generation = snapshot_store.current.generation
+
+    subs = Subscribers(f"http://127.0.0.1:{port}/stream", subscribers)
+    limits = httpx.Limits(max_connections=subscribers, max_keepalive_connections=0)
+    async with httpx.AsyncClient(limits=limits, timeout=httpx.Timeout(timeout, read=None)) as client:
+        start = time.perf_counter()
+        tasks = [asyncio.create_task(subs._subscribe(client)) for _ in range(subscribers)]
+        await subs.wait_for(generation, timeout)
+        print(f"{subscribers} subscribers connected and got the first event in {time.perf_counter() - start:.2f}s")
+
+        cpu = time.process_time()
+        await asyncio.sleep(idle)
+        print(f"idle for {idle:.0f}s: {(time.process_time() - cpu) * 1000:.0f} ms CPU "
+              f"(server and clients), {stream_broadcaster.subscribers} server-side subscribers")
+
+        print(f"\n{'update':>6}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}{'bytes':>8}")
+        for update in range(updates):
+            end += 1
+            published = time.perf_counter()
+            generation = snapshot_store.publish({DEFAULT_SERIES: make_frames(prices, end)}).generation
+            await subs.wait_for(generation, timeout)
+            latencies = (np.array(subs.received[generation]) - published) * 1000
+            p50, p99 = np.percentile(latencies, [50, 99])
+            print(f"{update + 1:>6}{p50:>10.1f}{p99:>10.1f}{latencies.max():>10.1f}{subs.delta_bytes:>8}")
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--subscribers", type=int, default=2000)
+    parser.add_argument("--updates", type=int, default=5)
+    parser.add_argument("--idle", type=float, default=5, help="seconds to sit idle before publishing")
+    parser.add_argument("--timeout", type=float, default=60)
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+
+    prices = 3.0 + np.random.default_rng(0).normal(0, 0.03, HISTORICAL_WEEKS + 1).cumsum()
+    snapshot_store.publish({DEFAULT_SERIES: make_frames(prices, HISTORICAL_WEEKS)})
+
+    server = uvicorn.Server(uvicorn.Config(
+        api.app, host="127.0.0.1", port=port, log_level="warning", lifespan="off", backlog=args.subscribers
+    ))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+
+    try:
+        asyncio.run(run(port, args.subscribers, args.updates, args.idle, args.timeout))
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Compare multi-worker serving: independent workers vs shared snapshot
+
+Starts `uvicorn main:app --workers N` (every worker builds its own
+snapshot) and `python serve.py --workers N` (one leader, workers attach to
+its shared snapshot), waits until /forecast answers, then reports:
+
+- distinct ETags seen across many /forecast requests (1 = every worker
+  serves identical data)
+- total RSS and PSS of the process tree (PSS splits shared pages between
+  the processes mapping them, so it is the fairer total)
+
+Both run from a temporary copy of the server directory; if no trained
+model artifacts are present, synthetic ones are fitted into the copy so the
+workers carry realistic model memory.
+
+Linux only (reads /proc). Run from the server directory:
+    python -m benchmarks.bench_workers [--workers 4] [--requests 200]
+
+Set EIA_OFFLINE=1 and/or EIA_CACHE_PATH to control the data source.
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+import httpx
+
+from app.config import MODEL_PATH, SERVER_ROOT
+from benchmarks._models import fit_synthetic_models, save_synthetic_models
+
+
+def _children(pid: int) -> List[int]:
+    found = []
+    try:
+        for tid in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{tid}/children") as f:
+                found.extend(int(c) for c in f.read().split())
+    except FileNotFoundError:
+        pass
+    return found
+
+
+def _tree(pid: int) -> List[int]:
+    pids, stack = [], [pid]
+    while stack:
+        p = stack.pop()
+        pids.append(p)
+        stack.extend(_children(p))
+    return pids
+
+
+def _memory_kb(pid: int) -> Dict[str, int]:
+    totals = {"Rss": 0, "Pss": 0}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                name, _, rest = line.partition(":")
+                if name in totals:
+                    totals[name] = int(rest.split()[0])
+    except FileNotFoundError:
+        pass
+    return totals
+
+
+def prepare_server_copy(root: str) -> bool:
+    """Copy the server tree into root; returns True if synthetic models were added"""
+    shutil.copytree(SERVER_ROOT, root, dirs_exist_ok=True,
+                    ignore=shutil.ignore_patterns("__pycache__", "*.sqlite3*", "node_modules"))
+    if os.path.exists(os.path.join(root, MODEL_PATH)):
+        return False
+    _, _, _, xgb_model, sarimax_model = fit_synthetic_models(weeks=1000)
+    save_synthetic_models(root, xgb_model, sarimax_model)
+    return True
+
+
+def measure(cmd: List[str], cwd: str, port: int, requests: int, timeout: float, env: Dict[str, str]) -> Dict:
+    proc = subprocess.Popen(cmd, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env)
+    url = f"http://127.0.0.1:{port}/forecast"
+    try:
+        deadline = time.perf_counter() + timeout
+        with httpx.Client(timeout=5) as client:
+            while True:
+                try:
+                    if client.get(url).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                if time.perf_counter() > deadline:
+                    raise TimeoutError(f"{' '.join(cmd)} did not serve /forecast within {timeout}s")
+                time.sleep(0.1)
+            time.sleep(2)  # let the remaining workers finish warming up
+            etags = set()
+            for _ in range(requests):
+                # a fresh connection per request so the requests spread over workers
+                etags.add(httpx.get(url).headers.get("etag"))
+
+        pids = _tree(proc.pid)
+        memory = [_memory_kb(p) for p in pids]
+        return {
+            "processes": len(pids),
+            "distinct_etags": len(etags),
+            "rss_mb": sum(m["Rss"] for m in memory) / 1024,
+            "pss_mb": sum(m["Pss"] for m in memory) / 1024,
+        }
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--timeout", type=float, default=120)
+    args = parser.parse_args()
+
+    env = os.environ.copy()
+    env["SNAPSHOT_SHM_DIR"] = tempfile.mkdtemp(prefix="fuelcast-bench-", dir="/dev/shm" if os.path.isdir("/dev/shm") else None)
+    variants = {
+        "independent": [sys.executable, "-m", "uvicorn", "main:app", "--port", str(args.port),
+                        "--workers", str(args.workers), "--log-level", "warning"],
+        "shared": [sys.executable, "serve.py", "--port", str(args.port), "--workers", str(args.workers)],
+    }
+
+    root = tempfile.mkdtemp(prefix="fuelcast-server-")
+    if prepare_server_copy(root):
+        print("No trained models found; using synthetic models")
+
+    print(f"{'mode':<12}{'procs':>6}{'etags':>7}{'RSS MB':>10}{'PSS MB':>10}")
+    for name, cmd in variants.items():
+        r = measure(cmd, root, args.port, args.requests, args.timeout, env)
+        print(f"{name:<12}{r['processes']:>6}{r['distinct_etags']:>7}{r['rss_mb']:>10.1f}{r['pss_mb']:>10.1f}")
+    shutil.rmtree(root, ignore_errors=True)
+    shutil.rmtree(env["SNAPSHOT_SHM_DIR"], ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
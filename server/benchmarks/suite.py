@@ -0,0 +1,300 @@
+"""
+Offline benchmark suite for the API and data pipeline
+
+Starts a local fake EIA API, fits small synthetic XGBoost/SARIMAX models on
+the history it serves, and measures:
+
+- import_time: `import main` in a fresh interpreter (-X importtime)
+- cold_start: a fresh `uvicorn main:app` process until /healthz answers,
+  /readyz turns 200 (startup_event's warm-up done) and /forecast has data
+- eia_fetch: get_aligned_series_async for every configured series
+- generate_data: end to end for the default series, with the models
+- serializer: dataframe_to_forecast_list at several frame sizes
+- xgboost_forecast: the recursive XGBoost loop over the forecast horizon
+- load: throughput and latency percentiles of /forecast, /metrics and
+  /importance under concurrent HTTP clients against a uvicorn process
+
+The server processes run from a temporary copy of the server directory
+holding the synthetic models, with EIA_API_URL pointing at the fake API
+and the on-disk caches disabled, so results depend only on the code.
+
+Results go to a JSON file (tagged with the git commit) for comparing
+commits; --compare prints the change against an earlier result.
+
+Run from the server directory:
+    python -m benchmarks.suite [--output results.json] [--compare baseline.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from datetime import timedelta
+from typing import Callable, Dict, List, Optional
+
+import httpx
+import numpy as np
+import pandas as pd
+
+from app.config import FORECAST_SERIES, FORECAST_WEEKS, HISTORICAL_WEEKS, SERVER_ROOT
+from app.services.data_generator import generate_data
+from app.services.eia_data_loader import EIADataLoader
+from app.services.model_service import ModelService
+from app.utils import dataframe_to_forecast_list
+from benchmarks import bench_cold_start, bench_import_time
+from benchmarks._fake_eia import FakeEIAServer
+from benchmarks._models import fit_synthetic_models, save_synthetic_models
+from benchmarks.bench_serializer import make_frame
+
+LOAD_ENDPOINTS = ("/forecast", "/metrics", "/importance")
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=SERVER_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def timed(fn: Callable, repeat: int) -> Dict[str, float]:
+    """Run fn `repeat` times; min/median/max wall time in seconds"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {"min_s": min(times), "median_s": statistics.median(times), "max_s": max(times), "runs": repeat}
+
+
+def _loader(api_url: str) -> EIADataLoader:
+    loader = EIADataLoader()
+    loader.GAS_PRICE_URL = f"{api_url}/petroleum/pri/gnd/data/"
+    loader.CRUDE_PRICE_URL = f"{api_url}/petroleum/pri/spt/data/"
+    return loader
+
+
+def _server_env(api_url: str) -> Dict[str, str]:
+    env = os.environ.copy()
+    env.update({
+        "EIA_API_URL": api_url,
+        "EIA_OFFLINE": "0",
+        "EIA_CACHE_PATH": "",
+        "BACKTEST_CACHE_PATH": "",
+        "FORECAST_HISTORY_PATH": "",
+        "REFRESH_INTERVAL_HOURS": "0",
+        "SNAPSHOT_ROLE": "standalone",
+    })
+    env.pop("PROFILE_TOKEN", None)
+    return env
+
+
+def bench_pipeline(api_url: str, models: ModelService, repeat: int, horizon: int) -> Dict:
+    loader = _loader(api_url)
+    results = {"eia_fetch": timed(
+        lambda: asyncio.run(loader.get_aligned_series_async(FORECAST_SERIES, weeks=HISTORICAL_WEEKS)), repeat
+    )}
+
+    gas_df, crude_df = asyncio.run(loader.get_aligned_data_async(weeks=HISTORICAL_WEEKS))
+    results["generate_data"] = {
+        "weeks": len(gas_df),
+        **timed(lambda: generate_data(gas_df, crude_df, models=models), repeat),
+    }
+
+    last_date = pd.to_datetime(gas_df['date'].iloc[-1])
+    dates = [last_date + timedelta(weeks=i + 1) for i in range(horizon)]
+    future_crude = np.full(horizon, crude_df['close'].iloc[-1])
+    results["xgboost_forecast"] = {
+        "steps": horizon,
+        **timed(lambda: models.forecast_xgboost(
+            last_gas_price=gas_df['gas_price'].iloc[-1],
+            crude_history=crude_df['close'].values,
+            future_crude=future_crude,
+            forecast_dates=dates,
+        ), repeat * 10),
+    }
+    return results
+
+
+def bench_serializer(sizes: List[int], repeat: int) -> Dict:
+    results = {}
+    for rows in sizes:
+        df = make_frame(rows)
+        r = timed(lambda: dataframe_to_forecast_list(df), repeat)
+        results[str(rows)] = {**r, "rows_per_s": rows / r["median_s"]}
+    return results
+
+
+def bench_cold_starts(root: str, env: Dict[str, str], runs: int, timeout: float) -> Dict:
+    samples = [bench_cold_start.measure(_free_port(), timeout, cwd=root, env=env) for _ in range(runs)]
+    results = {"runs": runs}
+    for name in ("healthz_ttfb", "ready", "forecast_ttfb"):
+        values = [s[name] for s in samples if s[name] is not None]
+        results[f"{name}_median_s"] = statistics.median(values) if values else None
+    results["timeouts"] = sum(s["forecast_ttfb"] is None for s in samples)
+    return results
+
+
+async def _load(base: str, path: str, requests: int, concurrency: int) -> Dict:
+    latencies: List[float] = []
+    errors = 0
+    remaining = requests
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base, limits=limits, timeout=30) as client:
+        await client.get(path)  # build the cached payload before timing
+
+        async def worker() -> None:
+            nonlocal remaining, errors
+            while remaining > 0:
+                remaining -= 1
+                start = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    if response.status_code != 200:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "requests_per_s": requests / elapsed,
+        "p50_ms": p50,
+        "p95_ms": p95,
+        "p99_ms": p99,
+        "max_ms": max(latencies) * 1000,
+    }
+
+
+def bench_load(root: str, env: Dict[str, str], requests: int, concurrency: int, timeout: float) -> Dict:
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=root, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env,
+    )
+    try:
+        with httpx.Client(timeout=5) as client:
+            if bench_cold_start._wait_for(client, f"{base}/forecast", 200, time.perf_counter() + timeout) is None:
+                raise TimeoutError(f"server did not serve /forecast within {timeout}s")
+        return {path: asyncio.run(_load(base, path, requests, concurrency)) for path in LOAD_ENDPOINTS}
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def _flatten(results: Dict, prefix: str = "") -> Dict[str, float]:
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(current: Dict, baseline: Dict) -> None:
+    """Print each timing/throughput metric with its change against a baseline result"""
+    now, before = _flatten(current["results"]), _flatten(baseline["results"])
+    print(f"\nvs {baseline['meta'].get('commit') or 'baseline'}:")
+    print(f"{'metric':<48}{'before':>12}{'now':>12}{'change':>9}")
+    for name, value in now.items():
+        old = before.get(name)
+        if old is None or not name.endswith(("_s", "_ms", "_per_s")):
+            continue
+        change = f"{(value - old) / old * 100:+.1f}%" if old else "n/a"
+        print(f"{name:<48}{old:>12.4g}{value:>12.4g}{change:>9}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--compare", help="earlier results JSON to compare against")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--cold-starts", type=int, default=3)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--horizon", type=int, default=FORECAST_WEEKS)
+    parser.add_argument("--requests", type=int, default=2000, help="requests per endpoint in the load test")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--timeout", type=float, default=120)
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    results: Dict[str, Dict] = {}
+    root = tempfile.mkdtemp(prefix="fuelcast-suite-")
+    try:
+        with FakeEIAServer() as eia:
+            # Fit on the history the server will fetch
+            gas_df, _ = asyncio.run(_loader(eia.api_url).get_aligned_data_async(weeks=HISTORICAL_WEEKS))
+            _, _, _, xgb_model, sarimax_model = fit_synthetic_models(weeks=len(gas_df))
+            models = ModelService()
+            models.xgboost_model, models.sarimax_model = xgb_model, sarimax_model
+
+            shutil.copytree(SERVER_ROOT, root, dirs_exist_ok=True,
+                            ignore=shutil.ignore_patterns("__pycache__", "*.sqlite3*", "models"))
+            save_synthetic_models(root, xgb_model, sarimax_model)
+            env = _server_env(eia.api_url)
+
+            print("pipeline...", flush=True)
+            results.update(bench_pipeline(eia.api_url, models, args.repeat, args.horizon))
+            print("serializer...", flush=True)
+            results["serializer"] = bench_serializer(args.sizes, args.repeat)
+            print("import time...", flush=True)
+            imports = bench_import_time.measure(args.cold_starts, cwd=root)
+            results["import_time"] = {k: imports[k] for k in ("total_ms", "min_ms", "max_ms", "modules")}
+            print("cold start...", flush=True)
+            results["cold_start"] = bench_cold_starts(root, env, args.cold_starts, args.timeout)
+            print("load...", flush=True)
+            results["load"] = bench_load(root, env, args.requests, args.concurrency, args.timeout)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "args": vars(args),
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    for name, value in _flatten(results).items():
+        print(f"{name:<48}{value:>12.4g}")
+    print(f"✓ Wrote {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
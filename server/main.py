@@ -1,14 +1,44 @@
 """FastAPI application for FuelCast gasoline price forecasting"""
-from fastapi import FastAPI
+import asyncio
+import threading
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+import numpy as np
 import pandas as pd
-from typing import List
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Literal, Optional, Tuple, Union
 
-from app.config import API_TITLE, API_DESCRIPTION, API_VERSION, CORS_ORIGINS
-from app.models import ForecastDataPoint, MetricsResponse, FeatureImportance
-from app.services.data_generator import generate_data
-from app.services.model_service import model_service
-from app.utils import calculate_rmse, dataframe_to_forecast_list
+from app.config import (
+    API_TITLE, API_DESCRIPTION, API_VERSION, CORS_ORIGINS, COMPRESSION_MIN_BYTES, GZIP_LEVEL, RESPONSE_CACHE_MAX_AGE, SNAPSHOT_ROLE, WARMUP_RETRY_AFTER,
+    AREAS, BACKTEST_MIN_TRAIN_WEEKS, BACKTEST_STEP_WEEKS, BACKTEST_WEEKS, DEFAULT_SERIES, FORECAST_WEEKS, PRODUCTS, RANDOM_SEED, SCENARIO_COUNT, SCENARIO_MAX_CONCURRENT, SCENARIO_MAX_COUNT, SCENARIO_QUEUE_TIMEOUT, SCENARIO_WORKERS,
+)
+from app.models import (
+    ForecastDataPoint, ForecastColumns, ForecastExplanation, MetricsResponse, FeatureImportance,
+    ScenarioForecastResponse, BacktestResponse, CrudeScenarioRequest, CrudeScenarioForecast,
+    HistorySnapshot, ForecastHistoryResponse, ForecastErrorsResponse, DashboardResponse,
+)
+from app.services.backtest import backtest_engine
+from app.services.crude_scenario import crude_scenarios
+from app.services.content_negotiation import MSGPACK_MEDIA_TYPE, NegotiatedGZipMiddleware, negotiate_encoding, negotiate_media_type
+from app.services.instrumentation import ProfilerMiddleware, RequestMetricsMiddleware
+from app.services.downsampling import DOWNSAMPLERS
+from app.services.forecast_history import forecast_history
+from app.services.model_registry import SeriesKey, model_registry
+from app.services.model_service import IMPORTANCE_TYPES, model_service
+from app.services.refresh import refresh_scheduler
+from app.services.response_cache import response_cache
+from app.services.scenario_engine import scenario_engine
+from app.services.shared_snapshot import snapshot_follower
+from app.services.snapshot import SeriesFrames, Snapshot, snapshot_store
+from app.services.stream import stream_broadcaster
+from app.services.warmup import warmup
+from app.utils import (
+    SHAP_PREFIX, dataframe_to_forecast_arrays, dataframe_to_forecast_columns, dataframe_to_forecast_explanation,
+    dataframe_to_forecast_list,
+)
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -26,24 +56,90 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Global data storage
-historical_data: pd.DataFrame = None
-forecast_data: pd.DataFrame = None
+# Compresses uncached responses; cached ones arrive already encoded and pass through.
+# The event stream is sent as is, event by event
+app.add_middleware(
+    NegotiatedGZipMiddleware,
+    minimum_size=COMPRESSION_MIN_BYTES,
+    compresslevel=GZIP_LEVEL,
+    exclude_paths=("/stream",),
+)
+app.add_middleware(RequestMetricsMiddleware)
+# Outermost, so a profile covers the whole middleware stack and is sent as is
+app.add_middleware(ProfilerMiddleware)
+
+warmup_task: asyncio.Task = None
+
+
+async def warm_up():
+    """Load models and build the first snapshot in the background, retrying until it succeeds"""
+    warmup.start()
+    # Model loading runs in worker threads while both EIA series download;
+    # the first published snapshot marks warm-up complete (see startup_event)
+    await refresh_scheduler.first_refresh(
+        lambda: run_in_threadpool(model_service.load_xgboost_model),
+        lambda: run_in_threadpool(model_service.load_sarimax_model),
+        on_error=warmup.fail
+    )
+    refresh_scheduler.start()
+
+
+async def follow_leader():
+    """Attach to snapshots built by the leader process (multi-worker mode, see serve.py)"""
+    warmup.start()
+    snapshot_follower.start()
+    await snapshot_follower.wait_until_attached()
+    warmup.complete()
 
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize models and data on startup"""
-    global historical_data, forecast_data
-    
-    # Load models
-    model_service.load_xgboost_model()
-    model_service.load_sarimax_model()
-    
-    # Generate data with real model predictions
-    historical_data, forecast_data = generate_data()
-    print(f"✓ Generated {len(historical_data)} historical data points")
-    print(f"✓ Generated {len(forecast_data)} forecast data points")
+    """Start warm-up in the background so the server accepts traffic immediately"""
+    global warmup_task
+    snapshot_store.subscribe(warmup.published)
+    stream_broadcaster.start()
+    if SNAPSHOT_ROLE == "follower":
+        warmup_task = asyncio.create_task(follow_leader())
+    else:
+        warmup_task = asyncio.create_task(warm_up())
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background work"""
+    if warmup_task is not None:
+        warmup_task.cancel()
+    await refresh_scheduler.stop()
+    await snapshot_follower.stop()
+    await stream_broadcaster.stop()
+
+
+async def current_snapshot() -> Snapshot:
+    """Dependency: the snapshot this request will read, or 503 until one exists"""
+    snapshot = snapshot_store.current
+    if snapshot is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Forecast data is warming up",
+            headers={"Retry-After": str(WARMUP_RETRY_AFTER)}
+        )
+    return snapshot
+
+
+async def selected_series(
+    product: str = DEFAULT_SERIES[0],
+    area: str = DEFAULT_SERIES[1],
+    snapshot: Snapshot = Depends(current_snapshot)
+) -> SeriesKey:
+    """Dependency: the (product, area) series requested, 404 if it is not being forecast"""
+    key = (product, area)
+    if key not in snapshot.series:
+        available = ", ".join(f"{p}/{a}" for p, a in snapshot.series)
+        raise HTTPException(
+            status_code=404,
+            detail=f"No forecast for product={product!r}, area={area!r} (available: {available})"
+        )
+    return key
 
 
 @app.get("/")
@@ -53,68 +149,601 @@ async def root():
         "message": "FuelCast API",
         "version": API_VERSION,
         "endpoints": {
-            "/forecast": "Get historical and predicted gas prices",
+            "/series": "List the product/area series being forecast",
+            "/dashboard": "Get forecast, metrics and feature importance in one cached response (?fields=)",
+            "/forecast": "Get historical and predicted gas prices (?product=&area=)",
+            "/forecast/scenarios": "Get Monte Carlo uncertainty bands for the forecast",
+            "/forecast/scenario": "POST a horizon and crude price path for a what-if forecast",
+            "/forecast/explain": "Get SHAP contributions behind each XGBoost forecast point",
             "/metrics": "Get model performance metrics",
-            "/importance": "Get XGBoost feature importance",
+            "/stream": "Server-sent events: forecast deltas and metrics on every refresh",
+            "/metrics/prom": "Prometheus metrics: request latency, refresh stages, model loads, snapshot age",
+            "/importance": "Get XGBoost feature importance (?type=weight|gain|cover|total_gain|total_cover)",
+            "/backtest": "Get walk-forward backtest accuracy per forecast horizon",
+            "/forecast/history": "Get the forecast as published at a past time (?as_of=)",
+            "/forecast/history/snapshots": "List recorded forecast snapshots",
+            "/forecast/errors": "Get accuracy of published forecasts against realized prices per horizon",
+            "/healthz": "Liveness probe",
+            "/readyz": "Readiness probe",
+            "/refresh": "Get data refresh status",
             "/docs": "Interactive API documentation"
         }
     }
 
 
-@app.get("/forecast", response_model=List[ForecastDataPoint])
-async def get_forecast():
+@app.get("/healthz")
+async def healthz():
+    """Liveness probe: the process is up and serving"""
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+async def readyz(response: Response):
+    """Readiness probe: 200 once warm-up has completed, 503 until then"""
+    if not warmup.ready:
+        response.status_code = 503
+        response.headers["Retry-After"] = str(WARMUP_RETRY_AFTER)
+    return warmup.as_dict()
+
+
+@app.get("/series")
+async def get_series(snapshot: Snapshot = Depends(current_snapshot)):
+    """List the (product, area) series in the current snapshot"""
+    return [
+        {"product": product, "area": area, "eia_product": PRODUCTS[product], "eia_area": AREAS[area]}
+        for product, area in snapshot.series
+    ]
+
+
+@app.get("/refresh")
+async def get_refresh_status():
+    """Scheduled refresh status: last success, duration, errors and snapshot age"""
+    if SNAPSHOT_ROLE == "follower":
+        return snapshot_follower.status()
+    return refresh_scheduler.status()
+
+
+def cached_response(request: Request, snapshot: Snapshot, key: str, builder, binary_builder=None) -> Response:
+    """
+    Serve a payload from the response cache with content negotiation and ETag revalidation
+
+    The body is JSON, or MessagePack if the Accept header asks for it, and
+    is sent br- or gzip-compressed when Accept-Encoding allows. Every
+    serialization and compressed variant is produced once per generation.
+
+    Args:
+        request: Incoming request (checked for Accept, Accept-Encoding and If-None-Match)
+        snapshot: Snapshot the builder reads from
+        key: Response cache key
+        builder: Callable producing the payload on a cache miss
+        binary_builder: Callable producing a more compact payload for
+            MessagePack (default: builder)
+
+    Returns:
+        304 if the client's copy is current, otherwise the cached bytes
+    """
+    media_type = negotiate_media_type(request.headers.get("accept"))
+    if media_type == MSGPACK_MEDIA_TYPE and binary_builder is not None:
+        builder = binary_builder
+    cached = response_cache.get(key, builder, generation=snapshot.generation, media_type=media_type)
+    coding = negotiate_encoding(request.headers.get("accept-encoding"), len(cached.body))
+    body, etag = cached.encoded(coding)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={RESPONSE_CACHE_MAX_AGE}, must-revalidate",
+        "Vary": "Accept, Accept-Encoding",
+    }
+    if cached.matches(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+    if coding is not None:
+        headers["Content-Encoding"] = coding
+    return Response(content=body, media_type=cached.media_type, headers=headers)
+
+
+def _forecast_window(
+    frames: SeriesFrames,
+    time_range: str,
+    start: Optional[date],
+    end: Optional[date]
+) -> Tuple[int, int]:
+    """Row positions [lo, hi) of the combined frame selected by range, start and end"""
+    n_history = len(frames.historical)
+    lo, hi = 0, len(frames.dates)
+    if time_range == "forecast":
+        lo = n_history
+    elif time_range == "last-year" and n_history:
+        lo, _ = frames.window(start=frames.dates[n_history - 1] - np.timedelta64(365, 'D'))
+    if start is not None:
+        lo = max(lo, frames.window(start=start)[0])
+    if end is not None:
+        hi = min(hi, frames.window(end=end)[1])
+    return lo, max(lo, hi)
+
+
+def _downsampled_positions(frames: SeriesFrames, lo: int, hi: int, max_points: int, method: str) -> np.ndarray:
+    """
+    Positions to keep so that at most max_points rows of [lo, hi) remain
+
+    Normally only history is thinned and forecast rows in the window are
+    all kept. If the forecast rows leave room for fewer than three history
+    points, the whole window is thinned together instead. Points are chosen
+    on the actual price (gaps, including forecast weeks, filled from SARIMA).
+    """
+    split = min(max(len(frames.historical), lo), hi)
+    budget = max_points - (hi - split)
+    if budget < 3:
+        split, budget = hi, max_points
+    window = frames.combined.iloc[lo:split]
+    y = window['actual'].fillna(window['sarima']).ffill().bfill().to_numpy(dtype=np.float64, na_value=0.0)
+    return np.concatenate([lo + DOWNSAMPLERS[method](y, budget), np.arange(split, hi)])
+
+
+def _build_forecast_payload(
+    frames: SeriesFrames,
+    shape: str,
+    lo: int = 0,
+    hi: Optional[int] = None,
+    max_points: Optional[int] = None,
+    method: str = "lttb"
+):
+    hi = len(frames.combined) if hi is None else hi
+    if max_points is not None and hi - lo > max_points:
+        combined_df = frames.combined.iloc[_downsampled_positions(frames, lo, hi, max_points, method)]
+    else:
+        combined_df = frames.combined.iloc[lo:hi]
+    if shape == "arrays":
+        return dataframe_to_forecast_arrays(combined_df)
+    if shape == "columnar":
+        return dataframe_to_forecast_columns(combined_df)
+    return dataframe_to_forecast_list(combined_df)
+
+
+@app.get("/forecast", response_model=Union[List[ForecastDataPoint], ForecastColumns])
+async def get_forecast(
+    request: Request,
+    shape: Literal["rows", "columnar"] = "rows",
+    time_range: Literal["all", "last-year", "forecast"] = Query("all", alias="range"),
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    max_points: Optional[int] = Query(None, ge=4),
+    downsample: Literal["lttb", "minmax"] = "lttb",
+    snapshot: Snapshot = Depends(current_snapshot),
+    key: SeriesKey = Depends(selected_series)
+):
     """
     Get historical gas prices and future forecasts from SARIMA and XGBoost models
     
+    The window is found by binary search on the snapshot's sorted dates and,
+    if it holds more than max_points rows, it is downsampled to at most
+    max_points rows (history only, unless the forecast alone nearly fills
+    the budget). Each resulting payload is serialized once per
+    data generation and served from the response cache; clients can
+    revalidate with If-None-Match.
+    
+    With `Accept: application/msgpack` the body is a MessagePack map of
+    packed int32 day numbers and float32 price arrays instead (shape is
+    ignored); either form is br/gzip-compressed per Accept-Encoding.
+    
+    Args:
+        shape: "rows" for a list of points, "columnar" for one array per field
+        range: "all", "last-year" (52 weeks before the last observation
+            onwards) or "forecast" (forecast rows only)
+        start: First date to include (narrows range)
+        end: Last date to include (narrows range)
+        max_points: Point budget for the response
+        downsample: "lttb" (shape-preserving) or "minmax" (per-bucket extremes)
+        product: Product key (regular, midgrade, premium, diesel)
+        area: Area key (US, PADD1..PADD5)
+    
     Returns:
-        List of data points with date, actual price, SARIMA prediction, and XGBoost prediction
+        Data points with date, actual price, SARIMA prediction, and XGBoost prediction
     """
-    combined_df = pd.concat([historical_data, forecast_data], ignore_index=True)
-    return dataframe_to_forecast_list(combined_df)
+    frames = snapshot.series[key]
+    lo, hi = _forecast_window(frames, time_range, start, end)
+    if max_points is None or hi - lo <= max_points:
+        max_points, downsample = None, ""
+    cache_key = f"forecast:{key[0]}:{key[1]}:{shape}:{lo}:{hi}:{max_points}:{downsample}"
+    return cached_response(
+        request, snapshot, cache_key,
+        lambda: _build_forecast_payload(frames, shape, lo, hi, max_points, downsample),
+        lambda: _build_forecast_payload(frames, "arrays", lo, hi, max_points, downsample)
+    )
 
 
-@app.get("/metrics", response_model=MetricsResponse)
-async def get_metrics():
+@app.get("/forecast/explain", response_model=ForecastExplanation)
+async def get_forecast_explanation(
+    request: Request,
+    snapshot: Snapshot = Depends(current_snapshot),
+    key: SeriesKey = Depends(selected_series)
+):
+    """
+    Get SHAP contributions of each feature to every XGBoost forecast point
+    
+    Contributions are computed in one batched pred_contribs call when the
+    snapshot is built; for each date, base_value plus the contributions
+    equals the model output (the served forecast also carries noise).
+    
+    Returns:
+        Forecast dates, XGBoost forecast, base value and per-feature contributions
+    """
+    forecast_df = snapshot.series[key].forecast
+    if f"{SHAP_PREFIX}bias" not in forecast_df:
+        raise HTTPException(status_code=404, detail="No XGBoost explanation for this series (model not loaded)")
+    return cached_response(
+        request, snapshot, f"explain:{key[0]}:{key[1]}", lambda: dataframe_to_forecast_explanation(forecast_df)
+    )
+
+
+# Bounds the scenario runs computing at once; cache hits never take a slot
+_scenario_slots = threading.BoundedSemaphore(SCENARIO_MAX_CONCURRENT)
+
+
+def _build_scenario_payload(historical_df: pd.DataFrame, n: int, seed: Optional[int]) -> dict:
+    if not _scenario_slots.acquire(timeout=SCENARIO_QUEUE_TIMEOUT):
+        raise HTTPException(
+            status_code=503,
+            detail="Too many scenario runs in progress",
+            headers={"Retry-After": str(WARMUP_RETRY_AFTER)}
+        )
+    try:
+        model_registry.get(DEFAULT_SERIES)  # loads the models on first use in follower workers
+        last_date = pd.to_datetime(historical_df['date'].iloc[-1])
+        forecast_dates = [last_date + timedelta(weeks=i + 1) for i in range(FORECAST_WEEKS)]
+        return scenario_engine.run(
+            gas_history=historical_df['actual'].values,
+            crude_history=historical_df['crude'].values,
+            forecast_dates=forecast_dates,
+            n=n,
+            seed=seed,
+            workers=SCENARIO_WORKERS,
+            history_dates=historical_df['date'],
+        )
+    finally:
+        _scenario_slots.release()
+
+
+@app.get("/forecast/scenarios", response_model=ScenarioForecastResponse)
+async def get_forecast_scenarios(
+    request: Request,
+    n: int = Query(SCENARIO_COUNT, ge=1, le=SCENARIO_MAX_COUNT),
+    seed: int = Query(RANDOM_SEED, ge=0),
+    snapshot: Snapshot = Depends(current_snapshot)
+):
+    """
+    Get p5/p50/p95 forecast bands from Monte Carlo crude price scenarios
+    
+    Seeded runs are deterministic, so each (n, seed) result is cached for
+    the current data generation. At most SCENARIO_MAX_CONCURRENT runs
+    compute at once; a miss that cannot start within
+    SCENARIO_QUEUE_TIMEOUT seconds gets a 503 with Retry-After.
+    
+    Args:
+        n: Number of crude price scenarios
+        seed: RNG seed
+    
+    Returns:
+        Forecast dates with percentile bands for each model
     """
-    Get model performance metrics and current gas price
+    frames = snapshot.series.get(DEFAULT_SERIES)
+    if frames is None or 'crude' not in frames.historical:
+        raise HTTPException(status_code=503, detail="Scenario engine requires EIA crude price data")
+    return await run_in_threadpool(
+        cached_response, request, snapshot, f"scenarios:{n}:{seed}",
+        lambda: _build_scenario_payload(frames.historical, n, seed)
+    )
+
+
+@app.post("/forecast/scenario", response_model=CrudeScenarioForecast)
+async def post_forecast_scenario(
+    scenario: CrudeScenarioRequest,
+    snapshot: Snapshot = Depends(current_snapshot),
+    key: SeriesKey = Depends(selected_series)
+):
+    """
+    Forecast gas prices for a caller-supplied crude price path
+    
+    Both models run in a worker thread. Results are cached by a digest of
+    the series, snapshot generation, model version and crude path, and
+    identical concurrent requests share one computation.
+    
+    Args:
+        scenario: Horizon in weeks and the weekly WTI path (or one flat price)
+        product: Product key (regular, midgrade, premium, diesel)
+        area: Area key (US, PADD1..PADD5)
     
     Returns:
-        Dictionary with SARIMA RMSE, XGBoost RMSE, and current price
+        Forecast dates, the crude path, and SARIMA and XGBoost forecasts
+    """
+    historical = snapshot.series[key].historical
+    if 'crude' not in historical:
+        raise HTTPException(status_code=503, detail="Scenario forecasts require EIA crude price data")
+    return await crude_scenarios.forecast(key, historical, snapshot.generation, scenario.crude)
+
+
+@app.get("/metrics", response_model=MetricsResponse)
+async def get_metrics(
+    request: Request,
+    snapshot: Snapshot = Depends(current_snapshot),
+    key: SeriesKey = Depends(selected_series)
+):
     """
-    hist_df = historical_data.copy()
+    Get model performance metrics and current gas price for a product/area series
     
-    # Calculate RMSE for both models
-    sarima_rmse = calculate_rmse(hist_df['actual'], hist_df['sarima'])
-    xgb_rmse = calculate_rmse(hist_df['actual'], hist_df['xgboost'])
+    Metrics are computed when the snapshot is published; this only serves
+    them from the response cache.
     
-    # Get current price (last actual price)
-    current_price = float(hist_df['actual'].iloc[-1])
+    Returns:
+        RMSE, MAE and MAPE per model over the historical window, rolling
+        RMSE over the last 4/13/52 weeks, running totals across refreshes,
+        and the current price
+    """
+    product, area = key
+    return cached_response(
+        request, snapshot, f"metrics:{product}:{area}",
+        lambda: snapshot.series[key].metrics.summary
+    )
+
+
+@app.get("/stream")
+async def stream(
+    request: Request,
+    key: SeriesKey = Depends(selected_series),
+    since: Optional[int] = Query(None, ge=0),
+):
+    """
+    Server-sent events feed of a product/area series
     
-    return MetricsResponse(
-        sarima_rmse=round(sarima_rmse, 3),
-        xgboost_rmse=round(xgb_rmse, 3),
-        current_price=round(current_price, 2)
+    Sends a `resync` event (the snapshot generation and /metrics payload)
+    once, then a `delta` event per refresh with only the forecast rows that
+    were added or changed, the series' new date range and the updated
+    metrics. The forecast itself is not streamed: on a resync the client
+    (re)fetches the /forecast window it shows, with its own range and
+    max_points. Event ids are snapshot generations: a client reconnecting
+    with Last-Event-ID gets just the deltas it missed if they are still
+    buffered, otherwise a fresh resync event.
+    
+    Args:
+        product: Product key (regular, midgrade, premium, diesel)
+        area: Area key (US, PADD1..PADD5)
+        since: Generation the client already holds (e.g. from /dashboard),
+            as Last-Event-ID but settable on a new EventSource; the
+            Last-Event-ID header of a reconnect takes precedence
+    """
+    last_event_id = request.headers.get("last-event-id", "")
+    last_generation = int(last_event_id) if last_event_id.isdigit() else since
+    return StreamingResponse(
+        stream_broadcaster.events(key, last_generation),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # stop nginx from buffering the stream
+        },
     )
 
 
+@app.get("/metrics/prom", include_in_schema=False)
+async def get_prometheus_metrics():
+    """Prometheus exposition of this process's request, refresh and snapshot metrics"""
+    return Response(content=generate_latest(), headers={"Content-Type": CONTENT_TYPE_LATEST})
+
+
 @app.get("/importance", response_model=List[FeatureImportance])
-async def get_feature_importance():
+async def get_feature_importance(
+    importance_type: Literal[IMPORTANCE_TYPES] = Query("weight", alias="type"),
+    key: SeriesKey = Depends(selected_series)
+):
     """
-    Get XGBoost feature importance scores
+    Get XGBoost feature importance scores for a product/area series model
+    
+    Scores for every type are computed once when the model is loaded.
+    
+    Args:
+        type: weight, gain, cover, total_gain or total_cover
     
     Returns:
         List of features with their importance scores
     """
+    models = await run_in_threadpool(model_registry.get, key)
+    return _importance_payload(models, importance_type)
+
+
+def _importance_payload(models, importance_type: str) -> List[dict]:
     # Try to get real feature importance from model
-    features = model_service.get_feature_importance()
+    features = models.get_feature_importance(importance_type)
     
     # Fallback to synthetic data if extraction fails
     if features is None:
-        features = model_service.get_fallback_importance()
+        features = models.get_fallback_importance()
     
     return features
 
 
+DASHBOARD_FIELDS = ("forecast", "metrics", "importance")
+
+
+@app.get("/dashboard", response_model=DashboardResponse)
+async def get_dashboard(
+    request: Request,
+    fields: str = Query(",".join(DASHBOARD_FIELDS), description="Comma-separated subset of forecast, metrics, importance"),
+    time_range: Literal["all", "last-year", "forecast"] = Query("all", alias="range"),
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    max_points: Optional[int] = Query(None, ge=4),
+    downsample: Literal["lttb", "minmax"] = "lttb",
+    importance_type: Literal[IMPORTANCE_TYPES] = Query("weight", alias="type"),
+    snapshot: Snapshot = Depends(current_snapshot),
+    key: SeriesKey = Depends(selected_series)
+):
+    """
+    Get everything the dashboard shows in one round trip
+    
+    Combines the /forecast columns, /metrics and /importance payloads for
+    a series. Each combination of fields and parameters is built once per
+    data generation (and model version) from values precomputed with the
+    snapshot, then served compressed from the response cache with ETag
+    revalidation like /forecast.
+    
+    Args:
+        fields: Comma-separated parts to include (default all)
+        range, start, end, max_points, downsample: Forecast window, as for /forecast
+        type: Feature importance type, as for /importance
+        product: Product key (regular, midgrade, premium, diesel)
+        area: Area key (US, PADD1..PADD5)
+    
+    Returns:
+        Snapshot generation plus the requested parts
+    """
+    selected = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = sorted(set(selected) - set(DASHBOARD_FIELDS))
+    if unknown or not selected:
+        raise HTTPException(
+            status_code=422,
+            detail=f"fields must be a comma-separated subset of {', '.join(DASHBOARD_FIELDS)}"
+                   + (f" (unknown: {', '.join(unknown)})" if unknown else "")
+        )
+    parts = [f for f in DASHBOARD_FIELDS if f in selected]
+
+    frames = snapshot.series[key]
+    lo, hi = _forecast_window(frames, time_range, start, end)
+    if max_points is None or hi - lo <= max_points:
+        max_points, downsample = None, ""
+    models = await run_in_threadpool(model_registry.get, key) if "importance" in parts else None
+
+    def build(shape: str) -> dict:
+        payload = {"generation": snapshot.generation}
+        if "forecast" in parts:
+            payload["forecast"] = _build_forecast_payload(frames, shape, lo, hi, max_points, downsample)
+        if "metrics" in parts:
+            payload["metrics"] = frames.metrics.summary
+        if "importance" in parts:
+            payload["importance"] = _importance_payload(models, importance_type)
+        return payload
+
+    cache_key = (
+        f"dashboard:{key[0]}:{key[1]}:{','.join(parts)}:{lo}:{hi}:{max_points}:{downsample}"
+        f":{importance_type}:{models.version if models else ''}"
+    )
+    return cached_response(request, snapshot, cache_key, lambda: build("columnar"), lambda: build("arrays"))
+
+
+@app.get("/backtest", response_model=BacktestResponse)
+async def get_backtest(
+    weeks: int = Query(BACKTEST_WEEKS, ge=BACKTEST_MIN_TRAIN_WEEKS + 1, le=30 * 52),
+    step: int = Query(BACKTEST_STEP_WEEKS, ge=1),
+    key: SeriesKey = Depends(selected_series)
+):
+    """
+    Get walk-forward backtest scores for a product/area series
+    
+    Forecasts are made from every `step`-th week of the last `weeks` weeks
+    of EIA history using only the BACKTEST_MIN_TRAIN_WEEKS weeks up to that
+    week, then scored against realized prices. Per-origin forecasts are
+    cached by model version and input window, so as the window slides
+    forward repeat calls only compute origins added since the last run.
+    
+    Args:
+        weeks: Weeks of history to evaluate over
+        step: Weeks between forecast origins
+        product: Product key (regular, midgrade, premium, diesel)
+        area: Area key (US, PADD1..PADD5)
+    
+    Returns:
+        MAE, RMSE and MAPE per forecast horizon for each model and a naive
+        last-price baseline
+    """
+    try:
+        return await backtest_engine.run_async(key, weeks=weeks, step=step)
+    except ValueError as e:
+        # Parameters are validated above, so too little history means EIA returned less than asked for
+        raise HTTPException(status_code=503, detail=f"Not enough EIA history to backtest: {e}")
+
+
+
+def _require_history():
+    if forecast_history is None:
+        raise HTTPException(status_code=503, detail="Forecast history is disabled (FORECAST_HISTORY_PATH is empty)")
+    return forecast_history
+
+
+def _unix_time(value: Union[datetime, date, None], end_of_day: bool = False) -> Optional[float]:
+    """Unix time of a query date or datetime, reading naive values as UTC"""
+    if value is None:
+        return None
+    if not isinstance(value, datetime):
+        value = datetime.combine(value + timedelta(days=1) if end_of_day else value, datetime.min.time())
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+@app.get("/forecast/history", response_model=ForecastHistoryResponse)
+async def get_forecast_history(
+    as_of: Union[datetime, date, None] = Query(
+        None, description="ISO datetime (UTC if no offset) or date (end of that day); latest if omitted"
+    ),
+    key: SeriesKey = Depends(selected_series)
+):
+    """
+    Get the forecast a product/area series had at a point in time
+    
+    Returns the recorded snapshot that was current at `as_of`: the
+    historical predictions and forecast exactly as published then.
+    
+    Args:
+        as_of: Point in time to look up
+        product: Product key (regular, midgrade, premium, diesel)
+        area: Area key (US, PADD1..PADD5)
+    
+    Returns:
+        Snapshot metadata (time, model version, input digest) and its data
+        in the /forecast columns shape
+    """
+    history = _require_history()
+    snapshot = await run_in_threadpool(history.as_of, key, _unix_time(as_of, end_of_day=True))
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail=f"No forecast recorded as of {as_of or 'now'}")
+    points = snapshot.pop('points')
+    return {**snapshot, 'product': key[0], 'area': key[1], 'data': dataframe_to_forecast_columns(points)}
+
+
+@app.get("/forecast/history/snapshots", response_model=List[HistorySnapshot])
+async def get_forecast_history_snapshots(
+    limit: int = Query(100, ge=1, le=10000),
+    key: SeriesKey = Depends(selected_series)
+):
+    """List a series' recorded forecast snapshots, newest first"""
+    history = _require_history()
+    return await run_in_threadpool(history.snapshots, key, limit)
+
+
+@app.get("/forecast/errors", response_model=ForecastErrorsResponse)
+async def get_forecast_errors(
+    since: Union[datetime, date, None] = Query(None, description="Only snapshots recorded at or after this time"),
+    key: SeriesKey = Depends(selected_series)
+):
+    """
+    Score published forecasts against the prices that were later realized
+    
+    Every recorded forecast week that EIA has since reported is joined with
+    its realized price; nothing is re-predicted. Unlike /backtest this
+    measures the forecasts users actually saw, with the models of the time.
+    
+    Args:
+        since: Only snapshots recorded at or after this time
+        product: Product key (regular, midgrade, premium, diesel)
+        area: Area key (US, PADD1..PADD5)
+    
+    Returns:
+        MAE, RMSE and MAPE per forecast horizon for each model and a naive
+        last-price baseline
+    """
+    history = _require_history()
+    errors = await run_in_threadpool(history.realized_errors, key, _unix_time(since))
+    if errors is None:
+        raise HTTPException(status_code=404, detail="No recorded forecast week has been realized yet")
+    return {**errors, 'product': key[0], 'area': key[1]}
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,71 @@
+"""
+Multi-worker production server
+
+One leader process loads the models, fetches EIA data and builds every
+snapshot on the refresh schedule, writing it to SNAPSHOT_SHM_DIR. The
+uvicorn workers start in follower mode: they never fetch or predict, they
+memory-map the leader's snapshot and switch over when its generation
+changes, so all workers serve identical data from shared pages.
+
+Usage (from the server directory):
+    python serve.py [--workers 4] [--host 0.0.0.0] [--port 8000]
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+
+import uvicorn
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import LEADER_METRICS_PORT, SERVE_WORKERS, SNAPSHOT_SHM_DIR
+
+
+async def _lead() -> None:
+    from app.services.model_service import model_service
+    from app.services.refresh import refresh_scheduler
+    from app.services.shared_snapshot import SnapshotPublisher
+    from app.services.snapshot import snapshot_store
+
+    if LEADER_METRICS_PORT:
+        from prometheus_client import start_http_server
+        start_http_server(LEADER_METRICS_PORT)
+        print(f"✓ Leader metrics on port {LEADER_METRICS_PORT}")
+
+    publisher = SnapshotPublisher(SNAPSHOT_SHM_DIR)
+    snapshot_store.resume(publisher.latest_generation)
+    snapshot_store.subscribe(publisher.publish)
+    await refresh_scheduler.first_refresh(
+        lambda: run_in_threadpool(model_service.load_xgboost_model),
+        lambda: run_in_threadpool(model_service.load_sarimax_model)
+    )
+    refresh_scheduler.start()
+    await asyncio.Event().wait()
+
+
+def run_leader() -> None:
+    """Leader process entry point: build and share snapshots until terminated"""
+    asyncio.run(_lead())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=SERVE_WORKERS)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    leader = multiprocessing.get_context("spawn").Process(target=run_leader, name="snapshot-leader", daemon=True)
+    leader.start()
+    print(f"✓ Snapshot leader started (pid {leader.pid}), serving with {args.workers} workers")
+
+    os.environ["SNAPSHOT_ROLE"] = "follower"
+    try:
+        uvicorn.run("main:app", host=args.host, port=args.port, workers=args.workers)
+    finally:
+        leader.terminate()
+        leader.join()
+
+
+if __name__ == "__main__":
+    main()
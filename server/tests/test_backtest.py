@@ -0,0 +1,84 @@
+"""Rolling-origin backtest and its per-origin forecast cache"""
+import pandas as pd
+import pytest
+
+from app.services import backtest
+from app.services.backtest import BacktestCache, BacktestEngine
+from app.services.model_service import ModelService
+from benchmarks._models import fit_synthetic_models
+
+KEY = ("regular", "US")
+MIN_TRAIN = 52
+HORIZON = 4
+
+
+class _Registry:
+    def __init__(self, models: ModelService):
+        self.models = models
+
+    def get(self, key):
+        return self.models
+
+
+@pytest.fixture(scope="module")
+def history():
+    dates, gas, crude, xgb_model, sarimax_model = fit_synthetic_models(weeks=160)
+    models = ModelService()
+    models.xgboost_model = xgb_model
+    models.sarimax_model = sarimax_model
+    models.versions = {'xgboost': 'test', 'sarimax': 'test'}
+    gas_df = pd.DataFrame({'date': dates, 'gas_price': gas})
+    crude_df = pd.DataFrame({'date': dates, 'close': crude})
+    return models, gas_df, crude_df
+
+
+@pytest.fixture
+def engine(history, tmp_path, monkeypatch):
+    monkeypatch.setattr(backtest, "model_registry", _Registry(history[0]))
+    return BacktestEngine(cache=BacktestCache(str(tmp_path / "backtest.sqlite3")))
+
+
+def run(engine, gas_df, crude_df, start, stop, step=1):
+    window = slice(start, stop)
+    return engine.run(
+        KEY,
+        gas_df.iloc[window].reset_index(drop=True),
+        crude_df.iloc[window].reset_index(drop=True),
+        horizon=HORIZON, min_train=MIN_TRAIN, step=step, workers=0,
+    )
+
+
+def test_repeat_run_is_fully_cached(engine, history):
+    _, gas_df, crude_df = history
+    first = run(engine, gas_df, crude_df, 0, 120)
+    second = run(engine, gas_df, crude_df, 0, 120)
+
+    assert first['computed_origins'] == first['origins']
+    assert second['computed_origins'] == 0
+    assert second['cached_origins'] == first['origins']
+    assert second['metrics'] == first['metrics']
+
+
+def test_shifted_window_reuses_cached_origins(engine, history, tmp_path):
+    _, gas_df, crude_df = history
+    run(engine, gas_df, crude_df, 0, 120)
+
+    # One week later: the window drops its oldest week and gains a new one
+    shifted = run(engine, gas_df, crude_df, 1, 121)
+
+    assert shifted['computed_origins'] == 1
+    assert shifted['cached_origins'] == shifted['origins'] - 1
+
+    fresh = BacktestEngine(cache=BacktestCache(str(tmp_path / "fresh.sqlite3")))
+    assert run(fresh, gas_df, crude_df, 1, 121)['metrics'] == shifted['metrics']
+
+
+def test_shifted_window_keeps_the_origin_grid(engine, history):
+    _, gas_df, crude_df = history
+    first = run(engine, gas_df, crude_df, 0, 120, step=4)
+
+    shifted = run(engine, gas_df, crude_df, 1, 121, step=4)
+
+    assert first['computed_origins'] == first['origins']
+    assert shifted['computed_origins'] <= 1
+    assert shifted['cached_origins'] >= first['origins'] - 1
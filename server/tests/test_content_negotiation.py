@@ -0,0 +1,72 @@
+"""Content-coding negotiation and the GZip middleware that has to agree with it"""
+import asyncio
+import gzip
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+
+from app.services.content_negotiation import NegotiatedGZipMiddleware, accepts_coding, negotiate_encoding
+from benchmarks._asgi import asgi_request
+
+BODY = b'{"price":3.25}' * 200
+
+
+async def plain(request):
+    return Response(BODY, media_type="application/json", headers={"ETag": '"7-abc"'})
+
+
+async def stream(request):
+    async def events():
+        for i in range(3):
+            yield b"data: %d\n\n" % i
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+app = Starlette(routes=[Route("/plain", plain), Route("/stream", stream)])
+app.add_middleware(NegotiatedGZipMiddleware, minimum_size=500, exclude_paths=("/stream",))
+
+
+def get(path: str, accept_encoding: str):
+    return asyncio.run(asgi_request(app, path, headers={"Accept-Encoding": accept_encoding}))
+
+
+@pytest.mark.parametrize("header, coding, gzip_ok", [
+    ("gzip", "gzip", True),
+    ("br, gzip", "br", True),
+    ("gzip;q=0, br", "br", False),
+    ("gzip;q=0", None, False),
+    ("*", "br", True),
+    ("*;q=0", None, False),
+    ("identity", None, False),
+    ("", None, False),
+])
+def test_negotiation_and_middleware_agree(header, coding, gzip_ok):
+    assert negotiate_encoding(header, len(BODY)) == coding
+    assert accepts_coding(header, "gzip") == gzip_ok
+
+
+def test_middleware_gzips_and_retags_when_gzip_is_accepted():
+    status, headers, body = get("/plain", "gzip")
+
+    assert status == 200
+    assert headers["content-encoding"] == "gzip"
+    assert headers["etag"] == '"7-abc-gzip"'
+    assert gzip.decompress(body) == BODY
+
+
+@pytest.mark.parametrize("header", ["gzip;q=0", "gzip;q=0, br", "identity"])
+def test_middleware_leaves_refused_gzip_alone(header):
+    status, headers, body = get("/plain", header)
+
+    assert "content-encoding" not in headers
+    assert headers["etag"] == '"7-abc"'
+    assert body == BODY
+
+
+def test_excluded_path_is_not_compressed():
+    status, headers, body = get("/stream", "gzip")
+
+    assert "content-encoding" not in headers
+    assert body == b"data: 0\n\ndata: 1\n\ndata: 2\n\n"
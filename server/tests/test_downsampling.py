@@ -0,0 +1,55 @@
+"""Server-side slicing and downsampling of /forecast"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.config import FORECAST_WEEKS
+from app.services.downsampling import DOWNSAMPLERS
+from app.services.snapshot import SeriesFrames
+from main import _build_forecast_payload, _forecast_window
+
+HISTORY_WEEKS = 520
+
+
+@pytest.fixture(scope="module")
+def frames():
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("2015-01-05", periods=HISTORY_WEEKS + FORECAST_WEEKS, freq="W-MON").strftime('%Y-%m-%d')
+    actual = 3.0 + rng.normal(0, 0.05, HISTORY_WEEKS).cumsum()
+    historical = pd.DataFrame({
+        'date': dates[:HISTORY_WEEKS],
+        'actual': actual,
+        'sarima': actual + rng.normal(0, 0.02, HISTORY_WEEKS),
+        'xgboost': actual + rng.normal(0, 0.02, HISTORY_WEEKS),
+    })
+    forecast = pd.DataFrame({
+        'date': dates[HISTORY_WEEKS:],
+        'actual': np.nan,
+        'sarima': actual[-1] + 0.01 * np.arange(1, FORECAST_WEEKS + 1),
+        'xgboost': actual[-1] - 0.01 * np.arange(1, FORECAST_WEEKS + 1),
+    })
+    return SeriesFrames(historical, forecast, metrics=None)
+
+
+@pytest.mark.parametrize("method", sorted(DOWNSAMPLERS))
+@pytest.mark.parametrize("time_range", ["all", "last-year", "forecast"])
+@pytest.mark.parametrize("max_points", [4, 5, FORECAST_WEEKS, FORECAST_WEEKS + 1, FORECAST_WEEKS + 2, 13, 50, 500])
+def test_downsampled_window_respects_max_points(frames, method, time_range, max_points):
+    lo, hi = _forecast_window(frames, time_range, None, None)
+
+    dates = _build_forecast_payload(frames, "columnar", lo, hi, max_points, method)['date']
+
+    assert 0 < len(dates) <= max_points
+    assert dates == sorted(set(dates))
+    assert dates[-1] == frames.combined['date'].iloc[hi - 1]
+    if max_points - FORECAST_WEEKS >= 3 and hi - lo > max_points:
+        # History is thinned, the forecast kept whole
+        assert dates[-FORECAST_WEEKS:] == list(frames.forecast['date'])
+
+
+def test_window_within_budget_is_not_downsampled(frames):
+    lo, hi = _forecast_window(frames, "last-year", None, None)
+
+    dates = _build_forecast_payload(frames, "columnar", lo, hi, hi - lo, "lttb")['date']
+
+    assert dates == list(frames.combined['date'].iloc[lo:hi])
@@ -0,0 +1,87 @@
+"""EIADataLoader against a local stub of the EIA API, with and without the disk cache"""
+from datetime import date, timedelta
+
+import pytest
+
+from app.services.eia_cache import EIACache
+from app.services.eia_data_loader import EIADataLoader
+from benchmarks._fake_eia import FakeEIAServer
+
+END = date(2024, 12, 30)
+
+
+@pytest.fixture
+def eia():
+    with FakeEIAServer(years=25, end=END) as server:
+        yield server
+
+
+def make_loader(server: FakeEIAServer, cache: EIACache = None, **kwargs) -> EIADataLoader:
+    loader = EIADataLoader(cache=cache, **kwargs)
+    loader.GAS_PRICE_URL = f"{server.api_url}/petroleum/pri/gnd/data/"
+    loader.CRUDE_PRICE_URL = f"{server.api_url}/petroleum/pri/spt/data/"
+    return loader
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return EIACache(str(tmp_path / "eia_cache.sqlite3"))
+
+
+def test_fresh_cache_skips_the_network(eia, cache):
+    loader = make_loader(eia, cache, cache_ttl_hours=6)
+    first = loader.fetch_gas_prices(weeks=52)
+    requests = eia.requests
+
+    second = loader.fetch_gas_prices(weeks=52)
+
+    assert len(first) == 104
+    assert eia.requests == requests
+    assert second.equals(first)
+
+
+def test_fresh_cache_shorter_than_the_window_is_refetched(eia, cache):
+    loader = make_loader(eia, cache, cache_ttl_hours=6)
+    loader.fetch_gas_prices(weeks=52)
+    requests = eia.requests
+
+    prices = loader.fetch_gas_prices(weeks=520)
+
+    assert eia.requests > requests
+    assert len(prices) == 1040
+    assert prices.equals(make_loader(eia).fetch_gas_prices(weeks=520))
+
+
+def test_stale_cache_fetches_only_new_periods(cache):
+    with FakeEIAServer(years=25, end=END) as eia:
+        make_loader(eia, cache).fetch_gas_prices(weeks=52)
+
+    # Two weeks later the API has two more observations
+    with FakeEIAServer(years=25, end=END + timedelta(weeks=2)) as eia:
+        prices = make_loader(eia, cache, cache_ttl_hours=0).fetch_gas_prices(weeks=52)
+        expected = make_loader(eia).fetch_gas_prices(weeks=52)
+
+    assert prices['date'].iloc[-1] == expected['date'].iloc[-1]
+    assert len(prices) == 104
+    assert prices.equals(expected)
+
+
+def test_offline_serves_whatever_is_cached(eia, cache):
+    make_loader(eia, cache).fetch_gas_prices(weeks=52)
+    requests = eia.requests
+
+    prices = make_loader(eia, cache, offline=True).fetch_gas_prices(weeks=520)
+
+    assert eia.requests == requests
+    assert len(prices) == 104
+
+
+def test_api_failure_serves_cached_data(cache):
+    with FakeEIAServer(years=25, end=END) as eia:
+        loader = make_loader(eia, cache)
+        expected = loader.fetch_gas_prices(weeks=52)
+
+    # The stub is shut down, so every request fails
+    prices = loader.fetch_gas_prices(weeks=52)
+
+    assert prices.equals(expected)
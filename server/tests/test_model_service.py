@@ -0,0 +1,80 @@
+"""Incremental SARIMAX filtering in ModelService against filtering from scratch"""
+import numpy as np
+import pytest
+
+from app.services.model_service import ModelService
+from benchmarks._models import fit_synthetic_models
+
+STEPS = 4
+
+
+@pytest.fixture(scope="module")
+def fitted():
+    dates, gas, crude, _, sarimax_model = fit_synthetic_models(weeks=160)
+    return dates, gas, crude, sarimax_model
+
+
+def make_service(sarimax_model) -> ModelService:
+    models = ModelService()
+    models.sarimax_model = sarimax_model
+    return models
+
+
+def forecast(models: ModelService, dates, gas, crude) -> np.ndarray:
+    state = models.sarimax_state(dates, gas, crude)
+    return np.asarray(state.forecast(steps=STEPS, exog=np.full((STEPS, 1), crude[-1])))
+
+
+def assert_matches_fresh(models: ModelService, sarimax_model, window: slice, dates, gas, crude):
+    fresh = make_service(sarimax_model)
+    args = (dates[window], gas[window], crude[window])
+    np.testing.assert_allclose(models.sarimax_history(*args), fresh.sarimax_history(*args))
+    np.testing.assert_allclose(forecast(models, *args), forecast(fresh, *args))
+
+
+def test_extending_matches_a_full_apply(fitted, monkeypatch):
+    dates, gas, crude, sarimax_model = fitted
+    models = make_service(sarimax_model)
+    models.sarimax_history(dates[:120], gas[:120], crude[:120])
+
+    applies = []
+    apply = sarimax_model.apply
+    monkeypatch.setattr(sarimax_model, "apply", lambda *a, **kw: applies.append(1) or apply(*a, **kw))
+    extended = models.sarimax_history(dates[:140], gas[:140], crude[:140])
+    assert not applies  # extended by the new weeks, not refiltered
+    monkeypatch.undo()
+
+    np.testing.assert_allclose(extended, make_service(sarimax_model).sarimax_history(dates[:140], gas[:140], crude[:140]))
+    assert_matches_fresh(models, sarimax_model, slice(0, 140), dates, gas, crude)
+
+
+def test_rolling_window_forecasts_from_the_extended_state(fitted):
+    dates, gas, crude, sarimax_model = fitted
+    models = make_service(sarimax_model)
+    models.sarimax_history(dates[:120], gas[:120], crude[:120])
+
+    # The window drops 10 weeks at the start and gains 10 at the end; the
+    # state continues the earlier one, so it matches a full apply from week 0
+    np.testing.assert_allclose(
+        forecast(models, dates[10:130], gas[10:130], crude[10:130]),
+        forecast(make_service(sarimax_model), dates[:130], gas[:130], crude[:130]),
+    )
+
+
+def test_history_ending_before_the_kept_state_is_refiltered(fitted):
+    dates, gas, crude, sarimax_model = fitted
+    models = make_service(sarimax_model)
+    models.sarimax_history(dates[:140], gas[:140], crude[:140])
+
+    assert_matches_fresh(models, sarimax_model, slice(0, 120), dates, gas, crude)
+    assert len(models._sarimax_history.dates) == 120
+
+
+def test_revised_history_is_refiltered(fitted):
+    dates, gas, crude, sarimax_model = fitted
+    models = make_service(sarimax_model)
+    models.sarimax_history(dates[:120], gas[:120], crude[:120])
+
+    revised = gas.copy()
+    revised[50] += 0.1
+    assert_matches_fresh(models, sarimax_model, slice(0, 130), dates, revised, crude)
@@ -0,0 +1,104 @@
+"""Build coalescing and failure handling in ResponseCache"""
+import threading
+import time
+
+import pytest
+
+from app.services.response_cache import ResponseCache
+
+CLIENTS = 8
+
+
+def get_concurrently(cache: ResponseCache, key: str, builder):
+    """Call cache.get from CLIENTS threads at once; (entries, errors) in thread order"""
+    results = [None] * CLIENTS
+    start = threading.Barrier(CLIENTS)
+
+    def client(i):
+        start.wait()
+        try:
+            results[i] = cache.get(key, builder)
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(CLIENTS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    errors = [r for r in results if isinstance(r, Exception)]
+    return [r for r in results if not isinstance(r, Exception)], errors
+
+
+def test_concurrent_misses_build_once():
+    cache = ResponseCache()
+    calls = []
+
+    def builder():
+        calls.append(1)
+        time.sleep(0.2)  # long enough for every client to find the build in flight
+        return {"value": 1}
+
+    entries, errors = get_concurrently(cache, "key", builder)
+
+    assert not errors
+    assert len(calls) == 1
+    assert len({id(entry) for entry in entries}) == 1
+    assert cache.get("key", builder) is entries[0]
+    assert len(calls) == 1
+
+
+def test_failed_build_is_retried_not_cached():
+    cache = ResponseCache()
+    calls = []
+
+    def builder():
+        calls.append(1)
+        time.sleep(0.2)
+        if len(calls) == 1:
+            raise RuntimeError("snapshot went away")
+        return {"value": len(calls)}
+
+    entries, errors = get_concurrently(cache, "key", builder)
+
+    # Only the client whose build failed sees the error; the others waited and retried it
+    assert len(errors) == 1
+    assert len(entries) == CLIENTS - 1
+    assert len(calls) == 2
+    assert len({id(entry) for entry in entries}) == 1
+    assert cache.get("key", builder) is entries[0]
+
+
+def test_failed_build_leaves_nothing_cached():
+    cache = ResponseCache()
+
+    def failing():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        cache.get("key", failing)
+
+    entry = cache.get("key", lambda: {"value": 2})
+    assert entry.body == b'{"value":2}'
+
+
+def test_slow_build_does_not_block_other_keys():
+    cache = ResponseCache()
+    started, release = threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(timeout=10)
+        return {"value": "slow"}
+
+    thread = threading.Thread(target=cache.get, args=("slow", slow))
+    thread.start()
+    try:
+        started.wait(timeout=10)
+        begin = time.perf_counter()
+        cache.get("fast", lambda: {"value": "fast"})
+        cache.invalidate()
+        assert time.perf_counter() - begin < 1
+    finally:
+        release.set()
+        thread.join(timeout=10)